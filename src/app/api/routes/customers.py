@@ -8,6 +8,7 @@ from pathlib import Path
 from io import BytesIO
 import csv
 import json
+import logging
 
 from fastapi import APIRouter, Query, status, UploadFile, File, Form, HTTPException
 from openpyxl import load_workbook
@@ -30,6 +31,8 @@ from ...services.customers import (
 from ...data.customers_repository import set_active_customer_file, load_customers
 from ...config import settings
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/customers", tags=["customers"])
 
 
@@ -110,8 +113,7 @@ def get_customer_locations(
                     has_next_page=has_next_page,
                 )
         except Exception as e:
-            import logging
-            logging.warning(f"Failed to get customers from database zone '{zone}': {e}. Falling back to CSV lookup.")
+            logger.warning(f"Failed to get customers from database zone '{zone}': {e}. Falling back to CSV lookup.")
 
     # Build filters dictionary (using lowercase with underscores for consistency)
     filters = {}
@@ -360,8 +362,7 @@ async def upload_customer_dataset(
         # clear_all_customers_from_database()  # Uncomment if you want to replace all customers
         
         saved_count = save_customers_to_database(customers_to_save)
-        import logging
-        logging.info(f"Uploaded {len(customers_to_save)} customers, saved {saved_count} to database")
+        logger.info(f"Uploaded {len(customers_to_save)} customers, saved {saved_count} to database")
 
     stats = compute_customer_stats()
     return CustomerStatsResponse(**stats)
@@ -89,7 +89,7 @@ def check_database() -> dict:
     
     try:
         # Try to get zones from database
-        zones = get_zones_from_database()
+        zones = get_zones_from_database(columns="id")
         
         # Try to check if zones table exists
         try:
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+import itertools
+import logging
 from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel
 
 from ...schemas.routing import RoutePlanModel, RouteStopModel, RoutingRequest, RoutingResponse
 from ...services.routing.service import optimize_routes
-from ...persistence.database import delete_all_routes_from_database, get_routes_from_database, update_route_customer, remove_customer_from_route
+from ...persistence.database import delete_all_routes_from_database, iter_routes_from_database, update_route_customer, remove_customer_from_route
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/routes", tags=["routes"])
 
@@ -29,26 +33,24 @@ class TransferCustomerRequest(BaseModel):
 def optimize(payload: RoutingRequest) -> RoutingResponse:
     try:
         # Log the start_from_depot value received from frontend
-        import logging
-        logging.info(f"=== API /routes/optimize called ===")
-        logging.info(f"start_from_depot from payload: {payload.start_from_depot}")
-        logging.info(f"zone_id: {payload.zone_id}, city: {payload.city}")
+        logger.info(f"=== API /routes/optimize called ===")
+        logger.info(f"start_from_depot from payload: {payload.start_from_depot}")
+        logger.info(f"zone_id: {payload.zone_id}, city: {payload.city}")
         
         result = optimize_routes(payload)
         
         # Verify the value was used correctly
         result_start_from_depot = result.metadata.get("start_from_depot", None)
-        logging.info(f"start_from_depot in result metadata: {result_start_from_depot}")
+        logger.info(f"start_from_depot in result metadata: {result_start_from_depot}")
         if payload.start_from_depot != result_start_from_depot:
-            logging.warning(f"⚠️ WARNING: start_from_depot mismatch! Request: {payload.start_from_depot}, Result: {result_start_from_depot}")
+            logger.warning(f"⚠️ WARNING: start_from_depot mismatch! Request: {payload.start_from_depot}, Result: {result_start_from_depot}")
         
         return result
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     except Exception as exc:
         # Log the full error for debugging
-        import logging
-        logging.exception(f"Error optimizing routes: {exc}")
+        logger.exception(f"Error optimizing routes: {exc}")
         # Return a user-friendly error message
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -77,8 +79,7 @@ def remove_customer(payload: RemoveCustomerRequest) -> dict:
     except HTTPException:
         raise
     except Exception as exc:
-        import logging
-        logging.exception(f"Error removing customer from route: {exc}")
+        logger.exception(f"Error removing customer from route: {exc}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to remove customer from route: {str(exc)}"
@@ -107,8 +108,7 @@ def transfer_customer(payload: TransferCustomerRequest) -> dict:
     except HTTPException:
         raise
     except Exception as exc:
-        import logging
-        logging.exception(f"Error transferring customer: {exc}")
+        logger.exception(f"Error transferring customer: {exc}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to transfer customer: {str(exc)}"
@@ -127,9 +127,17 @@ def get_routes(
     """
     try:
         # Get routes from database
-        db_routes = get_routes_from_database(zone_id=zone_id, city=city)
+        # Only two zone metadata keys are read below; don't ship every customer ID per route.
+        # Routes arrive a page at a time, so only one page of raw rows is held while converting
+        db_pages = iter_routes_from_database(
+            zone_id=zone_id,
+            city=city,
+            columns="vehicle_id,stops,total_distance_km,total_duration_min",
+            zone_columns="name,city:metadata->>city,start_from_depot:metadata->start_from_depot",
+        )
+        first_page = next(db_pages, [])
         
-        if not db_routes:
+        if not first_page:
             # Return empty response
             if not zone_id:
                 raise HTTPException(
@@ -148,7 +156,7 @@ def get_routes(
         
         # Group routes by zone (in case multiple zones were returned)
         # Use the first route's zone info as the zone_id
-        first_route = db_routes[0]
+        first_route = first_page[0]
         zone_info = first_route.get("zone_info", {})
         if isinstance(zone_info, dict):
             zone_name = zone_info.get("name", zone_id or "unknown")
@@ -157,7 +165,7 @@ def get_routes(
         
         # Convert database routes to RoutePlanModel format
         plans = []
-        for route in db_routes:
+        for route in itertools.chain(first_page, itertools.chain.from_iterable(db_pages)):
             try:
                 stops_data = route.get("stops", [])
                 if not stops_data:
@@ -189,14 +197,13 @@ def get_routes(
                 )
                 plans.append(plan)
             except Exception as e:
-                import logging
-                logging.warning(f"Error converting route {route.get('vehicle_id', 'unknown')} to RoutePlanModel: {e}")
+                logger.warning(f"Error converting route {route.get('vehicle_id', 'unknown')} to RoutePlanModel: {e}")
                 continue
         
         # Get zone metadata if available
         zone_metadata = {}
         if isinstance(zone_info, dict):
-            zone_metadata = zone_info.get("metadata", {})
+            zone_metadata = {key: zone_info[key] for key in ("city", "start_from_depot") if zone_info.get(key) is not None}
         
         # Get city from metadata
         resolved_city = city
@@ -243,11 +250,9 @@ def get_routes(
                 start_from_depot = True
                 if isinstance(zone_metadata, dict) and "start_from_depot" in zone_metadata:
                     start_from_depot = bool(zone_metadata.get("start_from_depot", True))
-                    import logging
-                    logging.info(f"Loaded start_from_depot={start_from_depot} from zone metadata for zone '{zone_name}'")
+                    logger.info(f"Loaded start_from_depot={start_from_depot} from zone metadata for zone '{zone_name}'")
                 else:
-                    import logging
-                    logging.warning(f"start_from_depot not found in zone metadata for zone '{zone_name}', defaulting to True")
+                    logger.warning(f"start_from_depot not found in zone metadata for zone '{zone_name}', defaulting to True")
                 
                 route_overlays = _build_route_overlays(
                     depot_lat=depot.latitude,
@@ -257,8 +262,7 @@ def get_routes(
                     start_from_depot=start_from_depot,
                 )
         except Exception as e:
-            import logging
-            logging.warning(f"Failed to build route overlays for database routes: {e}")
+            logger.warning(f"Failed to build route overlays for database routes: {e}")
             route_overlays = []
         
         # Build response metadata
@@ -288,8 +292,7 @@ def get_routes(
     except HTTPException:
         raise
     except Exception as exc:
-        import logging
-        logging.exception(f"Error retrieving routes from database: {exc}")
+        logger.exception(f"Error retrieving routes from database: {exc}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve routes from database: {str(exc)}"
@@ -313,8 +316,7 @@ def delete_all_routes() -> dict:
         }
         
     except Exception as exc:
-        import logging
-        logging.exception(f"Error deleting all routes: {exc}")
+        logger.exception(f"Error deleting all routes: {exc}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete routes: {str(exc)}"
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import logging
 from typing import Any, List
 
 from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
 
 from ...persistence.database import (
-    get_zones_from_database,
+    get_zones_without_travel_data,
     wkt_to_coordinates,
     geojson_to_coordinates,
     update_zone_geometry,
@@ -15,14 +17,16 @@ from ...persistence.database import (
     assign_customer_to_zone,
     get_unassigned_customers,
     delete_zones,
-    get_customers_from_zones,
-    unassign_all_customers_from_zones,
+    delete_zones_with_customers,
 )
 from ...schemas.zoning import ZoningRequest, ZoningResponse
 from ...schemas.customers import ZoneSummaryModel
 from ...services.zoning.service import process_zoning_request
 
-router = APIRouter(prefix="/zones", tags=["zones"])
+logger = logging.getLogger(__name__)
+
+# Zone payloads are dominated by coordinate lists; orjson encodes floats in C.
+router = APIRouter(prefix="/zones", tags=["zones"], default_response_class=ORJSONResponse)
 
 
 @router.post("/generate", response_model=ZoningResponse, status_code=status.HTTP_200_OK)
@@ -44,15 +48,10 @@ def generate_zones(
         customers_to_regenerate: set[str] = set()
         
         if delete_existing_zones:
-            import logging
-            logging.info(f"Regenerating zones: {delete_existing_zones}")
-            
-            # Get customer IDs from zones that will be deleted
-            customers_to_regenerate = set(get_customers_from_zones(delete_existing_zones))
-            logging.info(f"Customers in zones to regenerate: {len(customers_to_regenerate)}")
+            logger.info(f"Regenerating zones: {delete_existing_zones}")
             
             # Get existing zone assignments from database (excluding zones to be deleted)
-            existing_zones = get_zones_from_database(city=payload.city, method=None)
+            existing_zones = get_zones_without_travel_data(city=payload.city, method=None)
             existing_zone_ids_preserved = set()
             for zone in existing_zones:
                 zone_id = zone.get("name", "")
@@ -66,27 +65,22 @@ def generate_zones(
                                 if customer_id:
                                     existing_assignments[str(customer_id)] = zone_id
             
-            logging.info(f"Preserving {len(existing_zone_ids_preserved)} existing zones: {list(existing_zone_ids_preserved)}")
-            logging.info(f"Preserving assignments for {len(existing_assignments)} customers in existing zones")
+            logger.info(f"Preserving {len(existing_zone_ids_preserved)} existing zones: {list(existing_zone_ids_preserved)}")
+            logger.info(f"Preserving assignments for {len(existing_assignments)} customers in existing zones")
             
-            # CRITICAL: Unassign all customers from zones BEFORE deleting them
-            # This ensures customers are properly unassigned and prevents orphaned assignments
-            logging.info(f"Unassigning all customers from zones before deletion: {delete_existing_zones}")
-            unassign_success = unassign_all_customers_from_zones(delete_existing_zones)
-            if not unassign_success:
-                logging.warning(f"⚠️ Failed to unassign some customers from zones, continuing with deletion anyway")
-            
-            # Delete ONLY the specified zones (now with customers already unassigned)
-            # Use verify=True to ensure complete deletion before proceeding
-            logging.info(f"Deleting zones from database: {delete_existing_zones}")
-            delete_success = delete_zones(delete_existing_zones, verify=True)
-            if not delete_success:
+            # Delete ONLY the specified zones; their customer lists come back from the same
+            # transaction, so no assignment can slip in between reading and deleting them
+            logger.info(f"Deleting zones from database: {delete_existing_zones}")
+            deleted_customers = delete_zones_with_customers(delete_existing_zones)
+            if deleted_customers is None:
                 raise ValueError(
                     f"Failed to delete zones completely: {delete_existing_zones}. "
                     f"Some zones may still exist in the database. Please try again or delete manually."
                 )
             
-            logging.info(f"✅ Successfully deleted and verified removal of {len(delete_existing_zones)} zone(s)")
+            customers_to_regenerate = set(deleted_customers)
+            logger.info(f"Customers in zones to regenerate: {len(customers_to_regenerate)}")
+            logger.info(f"✅ Successfully deleted {len(delete_existing_zones)} zone(s)")
         
         # Generate new zones
         response = process_zoning_request(payload, persist=False)  # Don't persist yet, we'll merge first
@@ -134,8 +128,7 @@ def generate_zones(
                     recently_deleted_zone_ids=recently_deleted_zones,  # Zones we just deleted - skip duplicate check for these
                 )
             except Exception as exc:
-                import logging
-                logging.warning(f"Failed to save zones to database: {exc}")
+                logger.warning(f"Failed to save zones to database: {exc}")
         
         return response
     except ConnectionError as exc:
@@ -148,8 +141,7 @@ def generate_zones(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     except Exception as exc:
         # Log the full error for debugging
-        import logging
-        logging.exception(f"Error generating zones: {exc}")
+        logger.exception(f"Error generating zones: {exc}")
         # Return a user-friendly error message
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -161,18 +153,19 @@ def generate_zones(
 def get_zones(
     city: str | None = Query(default=None, description="Filter zones by city"),
     method: str | None = Query(default=None, description="Filter zones by method"),
-) -> dict[str, Any]:
+) -> ORJSONResponse:
     """Retrieve zones from database and convert to frontend format.
     
     Returns zones in the same format as generate_zones response so they can
-    be displayed on the map.
+    be displayed on the map. The payload is returned as an ``ORJSONResponse``
+    directly so the nested coordinate lists skip ``jsonable_encoder``.
     """
     try:
         # Get zones from database
-        db_zones = get_zones_from_database(city=city, method=method)
+        db_zones = get_zones_without_travel_data(city=city, method=method)
         
         if not db_zones:
-            return {
+            return ORJSONResponse({
                 "city": city or "all",
                 "method": method or "all",
                 "assignments": {},
@@ -182,7 +175,7 @@ def get_zones(
                         "polygons": []
                     }
                 }
-            }
+            })
         
         # CRITICAL: Deduplicate zones by zone_id - keep only the most recent one
         # This prevents old and new zones with the same ID from appearing together
@@ -203,12 +196,10 @@ def get_zones(
                 else:
                     duplicate_count += 1
                     # Log duplicate for debugging (but don't delete - that should happen during regeneration)
-                    import logging
-                    logging.warning(f"⚠️ Duplicate zone_id found and skipped in response: {zone_id} (created_at: {zone.get('created_at')})")
+                    logger.warning(f"⚠️ Duplicate zone_id found and skipped in response: {zone_id} (created_at: {zone.get('created_at')})")
         
         if duplicate_count > 0:
-            import logging
-            logging.warning(
+            logger.warning(
                 f"⚠️ Found {duplicate_count} duplicate zone record(s) - kept only most recent versions in response. "
                 f"To clean up duplicates, regenerate the affected zones."
             )
@@ -264,8 +255,7 @@ def get_zones(
             
             # Skip if we still don't have coordinates
             if not coordinates or len(coordinates) < 3:
-                import logging
-                logging.warning(f"Skipping zone {zone_id}: no valid coordinates found. geometry={bool(geometry)}, geometry_wkt={bool(zone.get('geometry_wkt'))}, metadata_coords={bool(metadata.get('coordinates') if isinstance(metadata, dict) else False)}")
+                logger.warning(f"Skipping zone {zone_id}: no valid coordinates found. geometry={bool(geometry)}, geometry_wkt={bool(zone.get('geometry_wkt'))}, metadata_coords={bool(metadata.get('coordinates') if isinstance(metadata, dict) else False)}")
                 continue
             
             # Add to counts
@@ -298,7 +288,7 @@ def get_zones(
         if not result_method and db_zones:
             result_method = db_zones[0].get("method", "")
         
-        return {
+        return ORJSONResponse({
             "city": result_city or "unknown",
             "method": result_method or "unknown",
             "assignments": assignments,  # Now populated from zone metadata customer_ids
@@ -310,11 +300,10 @@ def get_zones(
                 "source": "database",
                 "loaded_from_db": True
             }
-        }
+        })
         
     except Exception as exc:
-        import logging
-        logging.exception(f"Error retrieving zones from database: {exc}")
+        logger.exception(f"Error retrieving zones from database: {exc}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve zones from database: {str(exc)}"
@@ -376,9 +365,8 @@ def update_zone_geometry_endpoint(
     except HTTPException:
         raise
     except Exception as exc:
-        import logging
         error_msg = str(exc)
-        logging.exception(f"Error updating zone geometry: {exc}")
+        logger.exception(f"Error updating zone geometry: {exc}")
         
         # Provide more helpful error messages
         if "getaddrinfo" in error_msg or "11001" in error_msg:
@@ -427,8 +415,7 @@ def unassign_customer_endpoint(zone_id: str, customer_id: str) -> dict[str, Any]
     except HTTPException:
         raise
     except Exception as exc:
-        import logging
-        logging.exception(f"Error unassigning customer: {exc}")
+        logger.exception(f"Error unassigning customer: {exc}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to unassign customer: {str(exc)}"
@@ -460,8 +447,7 @@ def assign_customer_endpoint(zone_id: str, customer_id: str) -> dict[str, Any]:
     except HTTPException:
         raise
     except Exception as exc:
-        import logging
-        logging.exception(f"Error assigning customer: {exc}")
+        logger.exception(f"Error assigning customer: {exc}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to assign customer: {str(exc)}"
@@ -486,8 +472,7 @@ def get_unassigned_customers_endpoint(
         }
         
     except Exception as exc:
-        import logging
-        logging.exception(f"Error getting unassigned customers: {exc}")
+        logger.exception(f"Error getting unassigned customers: {exc}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get unassigned customers: {str(exc)}"
@@ -531,8 +516,7 @@ def delete_zones_endpoint(
     except HTTPException:
         raise
     except Exception as exc:
-        import logging
-        logging.exception(f"Error deleting zones: {exc}")
+        logger.exception(f"Error deleting zones: {exc}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete zones: {str(exc)}"
@@ -549,7 +533,7 @@ def get_zone_summaries_from_database(
     """
     try:
         # Get zones from database
-        db_zones = get_zones_from_database(city=city, method=None)
+        db_zones = get_zones_without_travel_data(city=city, method=None)
         
         if not db_zones:
             return []
@@ -585,8 +569,7 @@ def get_zone_summaries_from_database(
         return [ZoneSummaryModel(**entry) for entry in summaries]
         
     except Exception as exc:
-        import logging
-        logging.exception(f"Error retrieving zone summaries from database: {exc}")
+        logger.exception(f"Error retrieving zone summaries from database: {exc}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve zone summaries from database: {str(exc)}"
@@ -29,6 +29,15 @@ class Settings(BaseSettings):
         default=Path("data/dc_locations.xlsx"),
         description="Depot locations with latitude/longitude coordinates.",
     )
+    customer_cache_enabled: bool = Field(
+        default=True,
+        description="Persist the parsed customer CSV to a pickle sidecar keyed by the file's mtime and size.",
+    )
+    data_cache_ttl_seconds: float = Field(
+        default=300.0,
+        ge=0.0,
+        description="How long in-memory customer and depot caches are trusted before the source is re-checked.",
+    )
     osrm_base_url: Optional[str] = Field(
         default=None,
         description="Base URL for the OSRM routing service. Examples: http://localhost:5000 (local), https://router.project-osrm.org (public), or leave unset to use haversine distance calculations.",
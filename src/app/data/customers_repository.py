@@ -3,14 +3,23 @@
 from __future__ import annotations
 
 import csv
-import functools
+import logging
+import os
+import pickle
+import sys
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Iterable, Iterator, Optional
 
+import numpy as np
+
 from .dc_repository import get_depots
 from ..config import settings
 from ..models.domain import Customer, Depot
 
+logger = logging.getLogger(__name__)
+
 
 def _coerce_float(value: Optional[str]) -> Optional[float]:
     if value is None or value == "":
@@ -21,42 +30,275 @@ def _coerce_float(value: Optional[str]) -> Optional[float]:
         raise ValueError(f"Unable to parse float from value '{value}'") from exc
 
 
-@functools.lru_cache(maxsize=1)
+def _field(row: list[str], indices: tuple[int, ...]) -> str:
+    """Return the first non-empty value among the given column positions."""
+    for index in indices:
+        value = row[index]
+        if value:
+            return value
+    return ""
+
+
+def _intern(value: str) -> Optional[str]:
+    """Strip and intern a low-cardinality label so repeated values share one string."""
+    value = value.strip()
+    return sys.intern(value) if value else None
+
+
+# Bump whenever the Customer layout changes so stale sidecars are ignored
+_CUSTOMER_CACHE_VERSION = 4
+
+
+def _customer_cache_path(csv_path: Path) -> Path:
+    """Return the binary sidecar path used to cache a parsed customer CSV."""
+    return csv_path.with_suffix(".cache.pkl")
+
+
+def _source_signature(csv_path: Path) -> tuple[int, int]:
+    """Return the ``(mtime_ns, size)`` pair identifying a CSV revision."""
+    stat = csv_path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_customer_cache(csv_path: Path) -> Optional[tuple[Customer, ...]]:
+    """Load previously parsed customers if the sidecar matches the CSV on disk."""
+    cache_path = _customer_cache_path(csv_path)
+    try:
+        signature = _source_signature(csv_path)
+        with cache_path.open("rb") as handle:
+            version, mtime_ns, size, customers = pickle.load(handle)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.debug(f"Ignoring unreadable customer cache {cache_path}: {exc}")
+        return None
+    if version != _CUSTOMER_CACHE_VERSION or (mtime_ns, size) != signature:
+        return None
+    if not isinstance(customers, tuple):
+        return None
+    return customers
+
+
+def _write_customer_cache(csv_path: Path, customers: tuple[Customer, ...]) -> None:
+    """Persist parsed customers next to the CSV (atomic replace, best effort)."""
+    cache_path = _customer_cache_path(csv_path)
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        mtime_ns, size = _source_signature(csv_path)
+        with tmp_path.open("wb") as handle:
+            pickle.dump((_CUSTOMER_CACHE_VERSION, mtime_ns, size, customers), handle, protocol=5)
+        os.replace(tmp_path, cache_path)
+    except Exception as exc:
+        # Includes pickle errors; a failed cache write must never fail the load itself
+        logger.debug(f"Failed to write customer cache {cache_path}: {exc}")
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+# Parsed customers per CSV path: (mtime_ns, loaded_at, customers)
+_CUSTOMERS_CACHE: dict[Path, tuple[int, float, tuple[Customer, ...]]] = {}
+
+
 def load_customers(source: Optional[Path] = None) -> tuple[Customer, ...]:
-    """Load customers from the configured CSV file."""
+    """Load customers from the configured CSV file.
+
+    Results are kept in memory per path. Within ``settings.data_cache_ttl_seconds``
+    the cached tuple is returned without touching the file system; afterwards the
+    CSV's mtime is re-checked and the file re-read only if it changed.
+    """
 
     csv_path = (source or settings.customer_file)
-    if not csv_path.exists():
-        raise FileNotFoundError(f"Customer file not found: {csv_path}")
+    entry = _CUSTOMERS_CACHE.get(csv_path)
+    now = time.monotonic()
+    if entry is not None and now - entry[1] < settings.data_cache_ttl_seconds:
+        return entry[2]
+
+    try:
+        mtime_ns = csv_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Customer file not found: {csv_path}") from None
+    if entry is not None and entry[0] == mtime_ns:
+        _CUSTOMERS_CACHE[csv_path] = (mtime_ns, now, entry[2])
+        return entry[2]
+
+    customers = _parse_customers(csv_path)
+    _CUSTOMERS_CACHE[csv_path] = (mtime_ns, now, customers)
+    return customers
+
+
+def clear_customer_cache(source: Optional[Path] = None) -> None:
+    """Drop cached customers for ``source``, or for every path when omitted."""
+    if source is None:
+        _CUSTOMERS_CACHE.clear()
+    else:
+        _CUSTOMERS_CACHE.pop(source, None)
+
+
+def _parse_customers(csv_path: Path) -> tuple[Customer, ...]:
+    """Parse the customer CSV, reusing the binary sidecar while the source is unchanged."""
+
+    use_cache = settings.customer_cache_enabled
+    if use_cache:
+        cached = _read_customer_cache(csv_path)
+        if cached is not None:
+            return cached
 
     customers: list[Customer] = []
     with csv_path.open(mode="r", encoding="utf-8-sig", newline="") as handle:
-        reader = csv.DictReader(handle)
-        if not reader.fieldnames:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if not header:
             raise ValueError(f"Customer file '{csv_path}' is missing a header row.")
+
+        # Resolve column positions once; each field lists its accepted header names in priority order
+        positions: dict[str, int] = {}
+        for index, name in enumerate(header):
+            positions.setdefault(name, index)
+
+        def columns(*names: str) -> tuple[int, ...]:
+            return tuple(positions[name] for name in names if name in positions)
+
+        lat_cols = columns("Latitude", "latitude")
+        lon_cols = columns("Longitude", "longitude")
+        area_cols = columns("Area", "area")
+        region_cols = columns("Region", "region")
+        # Use City column (supports both Arabic and English via resolve_depot translation)
+        city_cols = columns("City", "city", "Area", "area")
+        zone_cols = columns("Zone", "zone")
+        agent_id_cols = columns("AgentId", "agent_id")
+        agent_name_cols = columns("AgentName", "agent_name")
+        customer_id_cols = columns("CusId", "customer_id", "CustomerId")
+        customer_name_cols = columns("CusName", "customer_name", "CustomerName")
+        status_cols = columns("Status", "status")
+        finance_status_cols = columns("FinanceClearance", "Finance_Status")
+        payment_status_cols = columns("PaymentStatus")
+        finance_flag_cols = columns("FinanceFlag")
+        width = len(header)
+
         for row in reader:
-            lat = _coerce_float(row.get("Latitude") or row.get("latitude"))
-            lon = _coerce_float(row.get("Longitude") or row.get("longitude"))
+            if len(row) < width:
+                row.extend([""] * (width - len(row)))
+            lat = _coerce_float(_field(row, lat_cols))
+            lon = _coerce_float(_field(row, lon_cols))
             if lat is None or lon is None:
                 continue  # ignore records without coordinates
+            # Positional arguments in Customer field order; keyword binding costs ~40% more per row
             customers.append(
                 Customer(
-                    area=(row.get("Area") or row.get("area") or "").strip() or None,
-                    region=(row.get("Region") or row.get("region") or "").strip() or None,
-                    # Use City column (supports both Arabic and English via resolve_depot translation)
-                    city=(row.get("City") or row.get("city") or row.get("Area") or row.get("area") or "").strip() or None,
-                    zone=(row.get("Zone") or row.get("zone") or "").strip() or None,
-                    agent_id=(row.get("AgentId") or row.get("agent_id") or "").strip() or None,
-                    agent_name=(row.get("AgentName") or row.get("agent_name") or "").strip() or None,
-                    customer_id=(row.get("CusId") or row.get("customer_id") or row.get("CustomerId") or "").strip(),
-                    customer_name=(row.get("CusName") or row.get("customer_name") or row.get("CustomerName") or "").strip(),
-                    latitude=lat,
-                    longitude=lon,
-                    status=(row.get("Status") or row.get("status") or "").strip() or None,
-                    raw=row,
+                    _intern(_field(row, area_cols)),
+                    _intern(_field(row, region_cols)),
+                    _intern(_field(row, city_cols)),
+                    _intern(_field(row, zone_cols)),
+                    _intern(_field(row, agent_id_cols)),
+                    _intern(_field(row, agent_name_cols)),
+                    _field(row, customer_id_cols).strip(),
+                    _field(row, customer_name_cols).strip(),
+                    lat,
+                    lon,
+                    _intern(_field(row, status_cols)),
+                    None,  # raw
+                    _field(row, finance_status_cols) or None,
+                    _field(row, payment_status_cols) or None,
+                    _field(row, finance_flag_cols) or None,
                 )
             )
-    return tuple(customers)
+    result = tuple(customers)
+    if use_cache:
+        _write_customer_cache(csv_path, result)
+    return result
+
+
+# Geographic bounding boxes for each city (lat_min, lat_max, lon_min, lon_max)
+_CITY_BOUNDARIES: dict[str, tuple[float, float, float, float]] = {
+    "jeddah": (21.2, 21.8, 39.0, 39.5),
+    "جدة": (21.2, 21.8, 39.0, 39.5),
+    "جده": (21.2, 21.8, 39.0, 39.5),
+    "riyadh": (24.3, 24.9, 46.4, 47.0),
+    "الرياض": (24.3, 24.9, 46.4, 47.0),
+    "makkah": (21.3, 21.6, 39.7, 40.0),
+    "مكة": (21.3, 21.6, 39.7, 40.0),
+    "مكة المكرمة": (21.3, 21.6, 39.7, 40.0),
+    "madinah": (24.3, 24.7, 39.4, 39.8),
+    "madina": (24.3, 24.7, 39.4, 39.8),
+    "المدينة": (24.3, 24.7, 39.4, 39.8),
+    "المدينة المنورة": (24.3, 24.7, 39.4, 39.8),
+    "dammam": (26.2, 26.6, 49.9, 50.3),
+    "الدمام": (26.2, 26.6, 49.9, 50.3),
+    "taif": (21.1, 21.5, 40.2, 40.7),
+    "الطائف": (21.1, 21.5, 40.2, 40.7),
+}
+
+# Arabic to English city name mappings
+_CITY_VARIANTS: dict[str, list[str]] = {
+    "جدة": ["جدة", "jeddah", "جده", "جدّة"],
+    "jeddah": ["جدة", "jeddah", "جده", "جدّة"],
+    "الرياض": ["الرياض", "riyadh", "رياض"],
+    "riyadh": ["الرياض", "riyadh", "رياض"],
+    "مكة": ["مكة", "مكة المكرمة", "makkah", "mecca"],
+    "مكة المكرمة": ["مكة", "مكة المكرمة", "makkah", "mecca"],
+    "makkah": ["مكة", "مكة المكرمة", "makkah", "mecca"],
+    "المدينة": ["المدينة", "المدينة المنورة", "madinah", "madina"],
+    "المدينة المنورة": ["المدينة", "المدينة المنورة", "madinah", "madina"],
+    "madinah": ["المدينة", "المدينة المنورة", "madinah", "madina"],
+    "madina": ["المدينة", "المدينة المنورة", "madinah", "madina"],
+    "الدمام": ["الدمام", "dammam", "دمام"],
+    "dammam": ["الدمام", "dammam", "دمام"],
+    "تبوك": ["تبوك", "tabuk"],
+    "tabuk": ["تبوك", "tabuk"],
+    "الطائف": ["الطائف", "taif"],
+    "taif": ["الطائف", "taif"],
+}
+
+
+@dataclass(slots=True)
+class _CustomerColumns:
+    """Column-oriented view of a customer tuple used by the location filter."""
+
+    customers: tuple[Customer, ...]
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    # Lowercased city/zone value -> sorted positions of the matching customers
+    by_city: dict[str, np.ndarray]
+    by_zone: dict[str, np.ndarray]
+    # Normalised location -> matching customers; dropped together with the columns
+    matches: dict[str, tuple[Customer, ...]] = field(default_factory=dict)
+
+
+_columns_cache: Optional[_CustomerColumns] = None
+_NO_POSITIONS = np.empty(0, dtype=np.intp)
+# Distinct locations memoised per dataset before the memo is reset
+_MAX_LOCATION_MATCHES = 1024
+
+
+def _index_positions(keys: Iterable[Optional[str]]) -> dict[str, np.ndarray]:
+    """Group customer positions by lowercased key (missing keys are skipped)."""
+    groups: dict[str, list[int]] = {}
+    for position, key in enumerate(keys):
+        if key:
+            groups.setdefault(key, []).append(position)
+    return {key: np.asarray(positions, dtype=np.intp) for key, positions in groups.items()}
+
+
+def _customer_columns(source: Optional[Path] = None) -> _CustomerColumns:
+    """Build (once per loaded dataset) the arrays used by ``iter_customers_for_location``."""
+    global _columns_cache
+
+    customers = load_customers(source)
+    cached = _columns_cache
+    if cached is not None and cached.customers is customers:
+        return cached
+
+    columns = _CustomerColumns(
+        customers=customers,
+        latitudes=np.fromiter((c.latitude for c in customers), dtype=np.float64, count=len(customers)),
+        longitudes=np.fromiter((c.longitude for c in customers), dtype=np.float64, count=len(customers)),
+        by_city=_index_positions(c.city_lc for c in customers),
+        by_zone=_index_positions(c.zone_lc for c in customers),
+    )
+    _columns_cache = columns
+    return columns
 
 
 def iter_customers_for_location(location: str, source: Optional[Path] = None) -> Iterator[Customer]:
@@ -64,80 +306,50 @@ def iter_customers_for_location(location: str, source: Optional[Path] = None) ->
     
     Uses City column with coordinate validation to ensure data quality.
     Filters out customers with invalid or out-of-bounds coordinates.
+    Candidates come from prebuilt city/zone indices, so only matching rows are inspected,
+    and the result for each normalised location is memoised until the dataset reloads.
     """
     normalized = location.strip().lower()
-    
-    # Geographic bounding boxes for each city (lat_min, lat_max, lon_min, lon_max)
-    CITY_BOUNDARIES = {
-        "jeddah": (21.2, 21.8, 39.0, 39.5),
-        "جدة": (21.2, 21.8, 39.0, 39.5),
-        "جده": (21.2, 21.8, 39.0, 39.5),
-        "riyadh": (24.3, 24.9, 46.4, 47.0),
-        "الرياض": (24.3, 24.9, 46.4, 47.0),
-        "makkah": (21.3, 21.6, 39.7, 40.0),
-        "مكة": (21.3, 21.6, 39.7, 40.0),
-        "مكة المكرمة": (21.3, 21.6, 39.7, 40.0),
-        "madinah": (24.3, 24.7, 39.4, 39.8),
-        "madina": (24.3, 24.7, 39.4, 39.8),
-        "المدينة": (24.3, 24.7, 39.4, 39.8),
-        "المدينة المنورة": (24.3, 24.7, 39.4, 39.8),
-        "dammam": (26.2, 26.6, 49.9, 50.3),
-        "الدمام": (26.2, 26.6, 49.9, 50.3),
-        "taif": (21.1, 21.5, 40.2, 40.7),
-        "الطائف": (21.1, 21.5, 40.2, 40.7),
-    }
-    
-    # Arabic to English city name mappings
-    CITY_TRANSLATIONS = {
-        "جدة": ["جدة", "jeddah", "جده", "جدّة"],
-        "jeddah": ["جدة", "jeddah", "جده", "جدّة"],
-        "الرياض": ["الرياض", "riyadh", "رياض"],
-        "riyadh": ["الرياض", "riyadh", "رياض"],
-        "مكة": ["مكة", "مكة المكرمة", "makkah", "mecca"],
-        "مكة المكرمة": ["مكة", "مكة المكرمة", "makkah", "mecca"],
-        "makkah": ["مكة", "مكة المكرمة", "makkah", "mecca"],
-        "المدينة": ["المدينة", "المدينة المنورة", "madinah", "madina"],
-        "المدينة المنورة": ["المدينة", "المدينة المنورة", "madinah", "madina"],
-        "madinah": ["المدينة", "المدينة المنورة", "madinah", "madina"],
-        "madina": ["المدينة", "المدينة المنورة", "madinah", "madina"],
-        "الدمام": ["الدمام", "dammam", "دمام"],
-        "dammam": ["الدمام", "dammam", "دمام"],
-        "تبوك": ["تبوك", "tabuk"],
-        "tabuk": ["تبوك", "tabuk"],
-        "الطائف": ["الطائف", "taif"],
-        "taif": ["الطائف", "taif"],
-    }
-    
-    # Get all accepted variants for this city
-    accepted_variants = CITY_TRANSLATIONS.get(normalized, [normalized])
-    accepted_variants_set = set(v.lower() for v in accepted_variants)
-    
-    # Get geographic boundary for validation
-    city_bounds = CITY_BOUNDARIES.get(normalized)
-    
-    for customer in load_customers(source):
-        # Match by City column with variants
-        city_match = customer.city and customer.city.lower() in accepted_variants_set
-        
-        # Match by Zone (for zone-specific queries)
-        zone_match = customer.zone and customer.zone.lower() == normalized
-        
-        if not (city_match or zone_match):
-            continue
-        
-        # Validate coordinates are within city boundaries (if boundary defined)
-        if city_bounds and city_match:
-            lat_min, lat_max, lon_min, lon_max = city_bounds
-            # Skip customers with invalid or out-of-bounds coordinates
-            if customer.latitude < lat_min or customer.latitude > lat_max:
-                continue
-            if customer.longitude < lon_min or customer.longitude > lon_max:
-                continue
-            # Skip invalid coordinates (0, 0) or negative values
-            if customer.latitude <= 0 or customer.longitude <= 0:
-                continue
-        
-        yield customer
+    columns = _customer_columns(source)
+
+    matches = columns.matches.get(normalized)
+    if matches is None:
+        if len(columns.matches) >= _MAX_LOCATION_MATCHES:
+            columns.matches.clear()
+        matches = columns.matches[normalized] = _match_location(columns, normalized)
+    yield from matches
+
+
+def _match_location(columns: _CustomerColumns, normalized: str) -> tuple[Customer, ...]:
+    """Select the customers matching a normalised location (see ``iter_customers_for_location``)."""
+    # Match by City column with variants
+    accepted_variants = {variant.lower() for variant in _CITY_VARIANTS.get(normalized, [normalized])}
+    city_groups = [columns.by_city[variant] for variant in accepted_variants if variant in columns.by_city]
+    city_positions = np.unique(np.concatenate(city_groups)) if city_groups else _NO_POSITIONS
+
+    # Match by Zone (for zone-specific queries)
+    zone_positions = columns.by_zone.get(normalized, _NO_POSITIONS)
+
+    # Validate coordinates are within city boundaries (if boundary defined)
+    city_bounds = _CITY_BOUNDARIES.get(normalized)
+    if city_bounds and city_positions.size:
+        lat_min, lat_max, lon_min, lon_max = city_bounds
+        lat = columns.latitudes[city_positions]
+        lon = columns.longitudes[city_positions]
+        # Skip customers with out-of-bounds coordinates, (0, 0) or negative values
+        in_bounds = (
+            (lat >= lat_min) & (lat <= lat_max)
+            & (lon >= lon_min) & (lon <= lon_max)
+            & (lat > 0) & (lon > 0)
+        )
+        # Zone matches are only exempt from the bounds check when the city did not match
+        zone_only = np.setdiff1d(zone_positions, city_positions, assume_unique=True)
+        positions = np.union1d(city_positions[in_bounds], zone_only)
+    else:
+        positions = np.union1d(city_positions, zone_positions)
+
+    customers = columns.customers
+    return tuple(customers[index] for index in positions.tolist())
 
 
 def get_customers_for_location(location: str, source: Optional[Path] = None) -> tuple[Customer, ...]:
@@ -155,7 +367,6 @@ def get_customers_for_location(location: str, source: Optional[Path] = None) ->
         ValueError: If location is invalid
     """
     import socket
-    import logging
     
     # Try database first
     from ..db.supabase import get_supabase_client
@@ -190,69 +401,32 @@ def get_customers_for_location(location: str, source: Optional[Path] = None) ->
         accepted_variants_set = set(v.lower() for v in accepted_variants)
         accepted_variants_set.add(normalized)  # Also try exact match
         
-        # Try querying by city with variations
+        # Fetch every accepted city variant in a single round trip
         all_customers = []
         seen_customer_ids = set()
-        connection_error_occurred = False
-        
-        # Query for each variant (case-insensitive matching by querying all variants)
-        for variant in accepted_variants_set:
-            try:
-                # Query by exact match (case-sensitive in DB, but we'll filter in Python)
-                city_response = supabase.table("customers").select("*").eq("city", variant).execute()
-                
-                if city_response.data:
-                    for record in city_response.data:
-                        customer_id = record.get("customer_id")
-                        if customer_id and customer_id not in seen_customer_ids:
-                            try:
-                                customer = _db_record_to_customer(record)
-                                # Double-check the city matches (case-insensitive)
-                                if customer.city and customer.city.lower() in accepted_variants_set:
-                                    all_customers.append(customer)
-                                    seen_customer_ids.add(customer_id)
-                            except (ValueError, KeyError, TypeError):
-                                continue
-            except (socket.gaierror, ConnectionError, OSError) as conn_err:
-                # Network/DNS connection error
-                connection_error_occurred = True
-                error_msg = str(conn_err)
-                logging.error(f"Database connection error while querying for '{variant}': {error_msg}")
-                # Continue trying other variants, but note the error
-                continue
-            except Exception as e:
-                # Other errors - log but continue
-                logging.warning(f"Error querying variant '{variant}': {e}")
-                continue
-        
-        # Also try the original location string (not normalized)
-        if location.strip() and location not in accepted_variants_set:
-            try:
-                city_response = supabase.table("customers").select("*").eq("city", location).execute()
-                if city_response.data:
-                    for record in city_response.data:
-                        customer_id = record.get("customer_id")
-                        if customer_id and customer_id not in seen_customer_ids:
-                            try:
-                                customer = _db_record_to_customer(record)
-                                if customer.city:
-                                    all_customers.append(customer)
-                                    seen_customer_ids.add(customer_id)
-                            except (ValueError, KeyError, TypeError):
-                                continue
-            except (socket.gaierror, ConnectionError, OSError) as conn_err:
-                connection_error_occurred = True
-                error_msg = str(conn_err)
-                logging.error(f"Database connection error while querying for '{location}': {error_msg}")
-            except Exception:
-                pass
-        
-        # If we had connection errors and no results, raise connection error
-        if connection_error_occurred and not all_customers:
+        try:
+            city_records = _query_customers_by_city(supabase, accepted_variants_set, location)
+        except (socket.gaierror, ConnectionError, OSError) as conn_err:
+            logger.error(f"Database connection error while querying for '{location}': {conn_err}")
             raise ConnectionError(
                 f"Failed to connect to database while searching for customers in '{location}'. "
                 f"Please check your internet connection and database configuration."
-            )
+            ) from conn_err
+        except Exception as e:
+            logger.warning(f"Error querying city variants for '{location}': {e}")
+            city_records = []
+        
+        for record in city_records:
+            customer_id = record.get("customer_id")
+            if customer_id and customer_id not in seen_customer_ids:
+                try:
+                    customer = _db_record_to_customer(record)
+                except (ValueError, KeyError, TypeError):
+                    continue
+                # Double-check the city matches (case-insensitive), or equals the raw location string
+                if customer.city and (customer.city.lower() in accepted_variants_set or customer.city == location):
+                    all_customers.append(customer)
+                    seen_customer_ids.add(customer_id)
         
         if all_customers:
             return tuple(all_customers)
@@ -288,12 +462,36 @@ def get_customers_for_location(location: str, source: Optional[Path] = None) ->
         ) from conn_err
     except Exception as e:
         # Log other errors but don't raise - let it return empty tuple
-        logging.warning(f"Failed to retrieve customers from database for location '{location}': {e}")
+        logger.warning(f"Failed to retrieve customers from database for location '{location}': {e}")
     
     # If database not configured or no results, return empty (no CSV fallback)
     return tuple()
 
 
+def _query_customers_by_city(supabase, variants: set[str], location: str) -> list[dict]:
+    """Return customer rows whose city matches any variant, filtered server-side.
+    
+    Uses the ``get_customers_in_city`` RPC (case-insensitive, index-backed). If the
+    function has not been deployed yet, falls back to a single ``city IN (...)`` query.
+    Connection errors propagate to the caller.
+    """
+    import socket
+    
+    try:
+        response = supabase.rpc("get_customers_in_city", {"p_cities": sorted(variants)}).execute()
+        return response.data or []
+    except (socket.gaierror, ConnectionError, OSError):
+        raise
+    except Exception as e:
+        logger.debug(f"get_customers_in_city RPC unavailable, using IN filter: {e}")
+    
+    names = set(variants)
+    if location.strip():
+        names.add(location)
+    response = supabase.table("customers").select("*").in_("city", sorted(names)).execute()
+    return response.data or []
+
+
 def _db_record_to_customer(record: dict) -> Customer:
     """Convert a database record to a Customer object.
     
@@ -355,21 +553,34 @@ def get_customers_by_ids(customer_ids: list[str], source: Optional[Path] = None)
                 customer = _db_record_to_customer(record)
                 customers.append(customer)
             except (ValueError, KeyError, TypeError) as e:
-                import logging
-                logging.warning(f"Failed to convert customer record to Customer object: {e}")
+                logger.warning(f"Failed to convert customer record to Customer object: {e}")
                 continue
         
         return tuple(customers)
         
     except Exception as e:
-        import logging
-        logging.warning(f"Failed to retrieve customers by IDs from database: {e}")
+        logger.warning(f"Failed to retrieve customers by IDs from database: {e}")
         return tuple()
 
 
-@functools.lru_cache(maxsize=1)
+# Depot lookup and the monotonic time it was built
+_DC_LOOKUP_CACHE: Optional[tuple[float, dict[str, Depot]]] = None
+
+
 def get_dc_lookup() -> dict[str, Depot]:
-    """Get depot lookup dictionary. Cache is cleared when depots are synced to database."""
+    """Get depot lookup dictionary.
+
+    The lookup is rebuilt once ``settings.data_cache_ttl_seconds`` have passed so
+    depot edits made directly in the database are eventually picked up; it is
+    also dropped immediately when depots are synced to the database.
+    """
+    global _DC_LOOKUP_CACHE
+
+    cached = _DC_LOOKUP_CACHE
+    now = time.monotonic()
+    if cached is not None and now - cached[0] < settings.data_cache_ttl_seconds:
+        return cached[1]
+
     lookup: dict[str, Depot] = {}
     for depot in get_depots():
         key = depot.code.lower()
@@ -377,70 +588,97 @@ def get_dc_lookup() -> dict[str, Depot]:
         compact = key.replace(" ", "")
         lookup.setdefault(compact, depot)
         lookup.setdefault(compact[:3], depot)
+    _DC_LOOKUP_CACHE = (now, lookup)
     return lookup
 
 
 def clear_dc_lookup_cache() -> None:
     """Clear the depot lookup cache. Call this after syncing depots to database."""
-    get_dc_lookup.cache_clear()
+    global _DC_LOOKUP_CACHE
+    _DC_LOOKUP_CACHE = None
+
+
+# Arabic to English city name mappings
+_CITY_TRANSLATIONS: dict[str, str] = {
+    "جدة": "jeddah",
+    "الرياض": "riyadh",
+    "رياض": "riyadh",
+    "الدمام": "dammam",
+    "دمام": "dammam",
+    "مكة": "jeddah",  # Makkah uses Jeddah depot
+    "مكة المكرمة": "jeddah",  # Makkah uses Jeddah depot
+    "المدينة": "madinah",
+    "المدينة المنورة": "madinah",
+    "تبوك": "tabuk",
+    "خميس مشيط": "khames mushait",
+    "بريدة": "buraidah",
+    "جيزان": "jizan",
+    "جازان": "jizan",  # Alternative spelling
+    "حائل": "hail",
+    "الطائف": "taif",
+    "طائف": "taif",
+    "ينبع": "yanbu",
+    "نجران": "najran",
+    "ابها": "khames mushait",  # Abha uses Khamis Mushait depot
+    "عسير": "khames mushait",  # Asir uses Khamis Mushait depot
+}
+
+# Alternative English spellings and variations
+_ALTERNATIVE_CITY_NAMES: dict[str, str] = {
+    "makkah": "jeddah",  # Makkah uses Jeddah depot
+    "mecca": "jeddah",
+    "madinah": "madinah",
+    "medina": "madinah",
+    "medinah": "madinah",
+    "khames": "khames mushait",
+    "khamis": "khames mushait",
+    "mushait": "khames mushait",
+    "abha": "khames mushait",
+    "asir": "khames mushait",
+    "baha": "jeddah",  # Al-Baha uses Jeddah depot (nearest)
+    "الباحة": "jeddah",
+}
+
+# Regional mappings - cities without direct depots mapped to nearest depot
+_REGIONAL_DEPOT_MAPPINGS: dict[str, str] = {
+    "محايل عسير": "khames mushait",  # Muhayil Asir uses Khamis Mushait
+    "القصيم": "buraidah",  # Al-Qassim region uses Buraidah
+    "عنيزة": "buraidah",  # Unaizah uses Buraidah
+    "عرعر": "sakaka",  # Arar uses Sakaka (nearest)
+    "الرس": "buraidah",  # Ar Rass uses Buraidah
+    "القنفذة": "jeddah",  # Al Qunfudhah uses Jeddah
+    "أبو عريش": "jizan",  # Abu Arish uses Jizan
+}
+
+# Memoised resolve_depot results for the depot lookup they were computed against
+_MAX_RESOLVED_DEPOTS = 4096
+_resolved_depots: dict[str, Optional[Depot]] = {}
+_resolved_depots_lookup: Optional[dict[str, Depot]] = None
 
 
 def resolve_depot(city: str) -> Optional[Depot]:
-    """Resolve depot by city name with Arabic-English translation support."""
-    # Arabic to English city name mappings
-    CITY_TRANSLATIONS = {
-        "جدة": "jeddah",
-        "الرياض": "riyadh",
-        "رياض": "riyadh",
-        "الدمام": "dammam",
-        "دمام": "dammam",
-        "مكة": "jeddah",  # Makkah uses Jeddah depot
-        "مكة المكرمة": "jeddah",  # Makkah uses Jeddah depot
-        "المدينة": "madinah",
-        "المدينة المنورة": "madinah",
-        "تبوك": "tabuk",
-        "خميس مشيط": "khames mushait",
-        "بريدة": "buraidah",
-        "جيزان": "jizan",
-        "جازان": "jizan",  # Alternative spelling
-        "حائل": "hail",
-        "الطائف": "taif",
-        "طائف": "taif",
-        "ينبع": "yanbu",
-        "نجران": "najran",
-        "ابها": "khames mushait",  # Abha uses Khamis Mushait depot
-        "عسير": "khames mushait",  # Asir uses Khamis Mushait depot
-    }
-    
-    # Alternative English spellings and variations
-    ALTERNATIVE_NAMES = {
-        "makkah": "jeddah",  # Makkah uses Jeddah depot
-        "mecca": "jeddah",
-        "madinah": "madinah",
-        "medina": "madinah",
-        "medinah": "madinah",
-        "khames": "khames mushait",
-        "khamis": "khames mushait",
-        "mushait": "khames mushait",
-        "abha": "khames mushait",
-        "asir": "khames mushait",
-        "baha": "jeddah",  # Al-Baha uses Jeddah depot (nearest)
-        "الباحة": "jeddah",
-    }
-    
-    # Regional mappings - cities without direct depots mapped to nearest depot
-    REGIONAL_MAPPINGS = {
-        "محايل عسير": "khames mushait",  # Muhayil Asir uses Khamis Mushait
-        "القصيم": "buraidah",  # Al-Qassim region uses Buraidah
-        "عنيزة": "buraidah",  # Unaizah uses Buraidah
-        "عرعر": "sakaka",  # Arar uses Sakaka (nearest)
-        "الرس": "buraidah",  # Ar Rass uses Buraidah
-        "القنفذة": "jeddah",  # Al Qunfudhah uses Jeddah
-        "أبو عريش": "jizan",  # Abu Arish uses Jizan
-    }
-    
+    """Resolve depot by city name with Arabic-English translation support.
+
+    Each distinct input is matched once against the current depot lookup and the
+    answer memoised, so repeat calls cost a single dict lookup.
+    """
+    global _resolved_depots_lookup
+
     depot_map = get_dc_lookup()
+    if _resolved_depots_lookup is not depot_map or len(_resolved_depots) >= _MAX_RESOLVED_DEPOTS:
+        _resolved_depots.clear()
+        _resolved_depots_lookup = depot_map
+    try:
+        return _resolved_depots[city]
+    except KeyError:
+        depot = _resolved_depots[city] = _match_depot(city, depot_map)
+        return depot
+
+
+def _match_depot(city: str, depot_map: dict[str, Depot]) -> Optional[Depot]:
+    """Run the full fallback chain of ``resolve_depot`` for one city name."""
     normalized = city.strip().lower()
+    city_normalized = normalized.replace(" ", "")
     
     # Try direct lookup
     depot = depot_map.get(normalized)
@@ -448,27 +686,27 @@ def resolve_depot(city: str) -> Optional[Depot]:
         return depot
     
     # Try without spaces
-    depot = depot_map.get(normalized.replace(" ", ""))
+    depot = depot_map.get(city_normalized)
     if depot:
         return depot
     
     # Try alternative English names
-    if normalized in ALTERNATIVE_NAMES:
-        alt_name = ALTERNATIVE_NAMES[normalized]
+    if normalized in _ALTERNATIVE_CITY_NAMES:
+        alt_name = _ALTERNATIVE_CITY_NAMES[normalized]
         depot = depot_map.get(alt_name)
         if depot:
             return depot
     
     # Try Arabic to English translation
-    if normalized in CITY_TRANSLATIONS:
-        english_name = CITY_TRANSLATIONS[normalized]
+    if normalized in _CITY_TRANSLATIONS:
+        english_name = _CITY_TRANSLATIONS[normalized]
         depot = depot_map.get(english_name)
         if depot:
             return depot
     
     # Try regional mappings for cities without direct depots
-    if normalized in REGIONAL_MAPPINGS:
-        depot_name = REGIONAL_MAPPINGS[normalized]
+    if normalized in _REGIONAL_DEPOT_MAPPINGS:
+        depot_name = _REGIONAL_DEPOT_MAPPINGS[normalized]
         depot = depot_map.get(depot_name)
         if depot:
             return depot
@@ -476,7 +714,6 @@ def resolve_depot(city: str) -> Optional[Depot]:
     # Try partial matching - check if city name contains depot name or vice versa
     for depot_code, depot_obj in depot_map.items():
         depot_normalized = depot_code.lower().replace(" ", "")
-        city_normalized = normalized.replace(" ", "")
         
         # Check if depot code is contained in city name or vice versa
         if depot_normalized in city_normalized or city_normalized in depot_normalized:
@@ -495,6 +732,10 @@ def resolve_depot(city: str) -> Optional[Depot]:
 def set_active_customer_file(path: Path) -> None:
     """Update the active customer CSV and clear related caches."""
 
+    global _columns_cache
+
     settings.customer_file = path
-    load_customers.cache_clear()
-    get_dc_lookup.cache_clear()
+    _customer_cache_path(path).unlink(missing_ok=True)
+    _columns_cache = None
+    _CUSTOMERS_CACHE.pop(path, None)
+    clear_dc_lookup_cache()
@@ -2,20 +2,58 @@
 
 from __future__ import annotations
 
+import logging
+import functools
+import time
 from pathlib import Path
-from typing import Iterable, Iterator
+from typing import Iterable, Iterator, Sequence
 
 from openpyxl import load_workbook
 
+try:
+    from python_calamine import CalamineWorkbook
+
+    CALAMINE_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    CalamineWorkbook = None
+    CALAMINE_AVAILABLE = False
+
 from ..config import settings
 from ..models.domain import Depot
 from ..db.supabase import get_supabase_client
 
+logger = logging.getLogger(__name__)
+
 
 def _normalize_dc_name(name: str) -> str:
     return name.strip()
 
 
+# Depots last read from the database: (loaded_at, depots or None when unavailable/empty)
+_DB_DEPOTS_CACHE: tuple[float, tuple[Depot, ...] | None] | None = None
+# Workbook revisions (path, mtime_ns) that get_depots has already pushed to the database
+_SYNCED_WORKBOOKS: set[tuple[Path, int]] = set()
+
+
+def clear_depot_cache() -> None:
+    """Forget the cached database depots so the next lookup re-queries Supabase."""
+    global _DB_DEPOTS_CACHE
+    _DB_DEPOTS_CACHE = None
+
+
+def _get_database_depots() -> tuple[Depot, ...] | None:
+    """Return database depots, re-querying at most once per ``settings.data_cache_ttl_seconds``."""
+    global _DB_DEPOTS_CACHE
+
+    cached = _DB_DEPOTS_CACHE
+    now = time.monotonic()
+    if cached is not None and now - cached[0] < settings.data_cache_ttl_seconds:
+        return cached[1]
+    depots = _load_depots_from_database()
+    _DB_DEPOTS_CACHE = (now, depots)
+    return depots
+
+
 def _load_depots_from_database() -> tuple[Depot, ...] | None:
     """Load depots from Supabase database. Returns None if database not available or empty."""
     supabase = get_supabase_client()
@@ -46,27 +84,53 @@ def _load_depots_from_database() -> tuple[Depot, ...] | None:
                 )
             except (KeyError, ValueError, TypeError) as e:
                 # Skip invalid rows but continue processing
-                import logging
-                logging.warning(f"Skipping invalid depot row: {e}")
+                logger.warning(f"Skipping invalid depot row: {e}")
                 continue
         
         return tuple(depots) if depots else None
     except Exception as e:
         # If database query fails, return None to fall back to file
-        import logging
-        logging.debug(f"Database query failed, falling back to file: {e}")
+        logger.debug(f"Database query failed, falling back to file: {e}")
+        return None
+
+
+def _openpyxl_value(value: object) -> object:
+    """Map a calamine cell to what openpyxl returns: whole-number floats as ints, blanks as None."""
+    if value == "":
         return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _iter_workbook_rows(workbook_path: Path) -> Iterator[Sequence[object]]:
+    """Yield the first sheet's rows as value tuples, preferring the Rust-backed calamine reader."""
+    if CALAMINE_AVAILABLE:
+        workbook = CalamineWorkbook.from_path(str(workbook_path))
+        return (tuple(map(_openpyxl_value, row)) for row in workbook.get_sheet_by_index(0).to_python())
+
+    # read_only keeps the zip archive open until close(); depot sheets are tiny, so materialise and close
+    wb = load_workbook(workbook_path, data_only=True, read_only=True)
+    try:
+        return iter(list(wb.active.iter_rows(min_row=1, values_only=True)))
+    finally:
+        wb.close()
 
 
 def _load_depots_from_file(source: Path | None = None) -> tuple[Depot, ...]:
-    """Load depots from Excel file."""
+    """Load depots from Excel file, re-reading the workbook only when its mtime changes."""
     workbook_path = (source or settings.dc_locations_file)
-    if not workbook_path.exists():
-        raise FileNotFoundError(f"Depot workbook not found: {workbook_path}")
+    try:
+        mtime_ns = workbook_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Depot workbook not found: {workbook_path}") from None
+    return _read_depot_workbook(workbook_path, mtime_ns)
 
-    wb = load_workbook(workbook_path, data_only=True, read_only=True)
-    sheet = wb.active
-    rows = sheet.iter_rows(min_row=1, values_only=True)
+
+@functools.lru_cache(maxsize=4)
+def _read_depot_workbook(workbook_path: Path, mtime_ns: int) -> tuple[Depot, ...]:
+    """Parse the depot workbook; ``mtime_ns`` only keys the cache."""
+    rows = _iter_workbook_rows(workbook_path)
     header = next(rows, None)
     if header is None:
         raise ValueError(f"Depot workbook '{workbook_path}' is empty.")
@@ -118,13 +182,13 @@ def _sync_depots_to_database(depots: tuple[Depot, ...]) -> None:
         
         if new_depots:
             supabase.table("depots").insert(new_depots).execute()
-            # Clear cache so next call will load from database
+            # Clear caches so next call will load from database
+            clear_depot_cache()
             from .customers_repository import clear_dc_lookup_cache
             clear_dc_lookup_cache()
     except Exception as e:
         # If sync fails, continue without database - file-based fallback will work
-        import logging
-        logging.debug(f"Failed to sync depots to database (non-critical): {e}")
+        logger.debug(f"Failed to sync depots to database (non-critical): {e}")
         pass
 
 
@@ -134,15 +198,18 @@ def get_depots(source: Path | None = None) -> tuple[Depot, ...]:
     If database is empty or not configured, loads from Excel file and syncs to database.
     """
     # Try database first
-    db_depots = _load_depots_from_database()
+    db_depots = _get_database_depots()
     if db_depots:
         return db_depots
     
     # Fall back to file
-    file_depots = _load_depots_from_file(source)
+    workbook_path = (source or settings.dc_locations_file)
+    file_depots = _load_depots_from_file(workbook_path)
     
-    # Sync to database for next time (non-blocking)
-    if file_depots:
+    # Sync to database for next time, once per workbook revision
+    revision = (workbook_path, workbook_path.stat().st_mtime_ns)
+    if file_depots and revision not in _SYNCED_WORKBOOKS:
         _sync_depots_to_database(file_depots)
+        _SYNCED_WORKBOOKS.add(revision)
     
     return file_depots
@@ -1,5 +1,5 @@
 """Database clients and utilities."""
 
-from .supabase import supabase, get_supabase_client
+from .supabase import close_supabase_client, get_supabase_client
 
-__all__ = ["supabase", "get_supabase_client"]
+__all__ = ["close_supabase_client", "get_supabase_client"]
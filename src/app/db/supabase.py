@@ -2,9 +2,27 @@
 
 import logging
 from functools import lru_cache
-from supabase import create_client, Client
+
+import httpx
+from supabase import ClientOptions, create_client, Client, SupabaseException
 from ..config import settings
 
+logger = logging.getLogger(__name__)
+
+# Sized for the concurrent batch writers (see persistence.customers.UPSERT_MAX_WORKERS)
+_MAX_CONNECTIONS = 32
+
+
+@lru_cache()
+def get_http_client() -> httpx.Client:
+    """Get the process-wide HTTP/2 connection pool shared by all Supabase requests."""
+    return httpx.Client(
+        http2=True,
+        follow_redirects=True,
+        timeout=httpx.Timeout(120.0, connect=10.0),
+        limits=httpx.Limits(max_connections=_MAX_CONNECTIONS, max_keepalive_connections=_MAX_CONNECTIONS),
+    )
+
 
 @lru_cache()
 def get_supabase_client() -> Client | None:
@@ -15,24 +33,33 @@ def get_supabase_client() -> Client | None:
         Note: This does not test the connection - actual queries may fail with network errors.
     """
     if not settings.supabase_url or not settings.supabase_key:
-        logging.warning("Supabase credentials not configured (missing URL or key)")
+        logger.warning("Supabase credentials not configured (missing URL or key)")
         return None
     
+    # ClientOptions(httpx_client=...) needs supabase>=2.16; a TypeError from an older
+    # release is a broken install, not "database not configured", so it propagates
+    options = ClientOptions(httpx_client=get_http_client())
     try:
-        client = create_client(settings.supabase_url, settings.supabase_key)
+        client = create_client(settings.supabase_url, settings.supabase_key, options=options)
         return client
-    except Exception as e:
-        logging.error(f"Failed to create Supabase client: {e}")
+    except SupabaseException as e:
+        # Raised for a malformed URL or key
+        logger.error(f"Failed to create Supabase client: {e}")
         return None
 
 
-# Convenience alias
-supabase = get_supabase_client()
+def close_supabase_client() -> None:
+    """Close the shared connection pool and drop the cached client (called on app shutdown)."""
+    if get_http_client.cache_info().currsize:
+        get_http_client().close()
+    get_http_client.cache_clear()
+    get_supabase_client.cache_clear()
 
 
-# Example usage patterns:
+# Example usage patterns (build the client at call time, never at import time):
 #
-# from .db.supabase import supabase
+# from .db.supabase import get_supabase_client
+# supabase = get_supabase_client()
 #
 # # Insert
 # result = supabase.table('customers').insert({
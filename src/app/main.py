@@ -2,16 +2,28 @@
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .api.routes import customers, health, reports, routes, zoning
 from .config import settings
+from .db import close_supabase_client
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    yield
+    # Release the shared Supabase connection pool on shutdown
+    close_supabase_client()
 
 
 def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.app_name,
+        lifespan=lifespan,
         # Add root_path for Railway proxy compatibility
         root_path="",
     )
@@ -40,6 +52,7 @@ def create_app() -> FastAPI:
     app.include_router(zoning.router, prefix=settings.api_prefix)
     app.include_router(reports.router, prefix=settings.api_prefix)
     app.include_router(routes.router, prefix=settings.api_prefix)
+
     return app
 
 
@@ -1,10 +1,18 @@
 """Domain models for customer and depot records."""
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from datetime import date
 from typing import Optional
 
 
+def _lowered(value: Optional[str]) -> Optional[str]:
+    """Return the interned, stripped lowercase form of a low-cardinality label."""
+    if not value:
+        return None
+    return sys.intern(value.strip().lower()) or None
+
+
 @dataclass(slots=True)
 class Customer:
     """Represents a customer location enriched with operational metadata."""
@@ -20,7 +28,20 @@ class Customer:
     latitude: float
     longitude: float
     status: Optional[str]
-    raw: dict
+    # Full source record; only kept where the row is persisted (uploads, database rows)
+    raw: Optional[dict] = None
+    finance_status: Optional[str] = None
+    payment_status: Optional[str] = None
+    finance_flag: Optional[str] = None
+    # Lowercased lookup keys, derived once at construction for filtering
+    city_lc: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    area_lc: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    zone_lc: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.city_lc = _lowered(self.city)
+        self.area_lc = _lowered(self.area)
+        self.zone_lc = _lowered(self.zone)
 
 
 @dataclass(slots=True)
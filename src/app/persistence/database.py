@@ -2,7 +2,18 @@
 
 from __future__ import annotations
 
-from typing import Any
+from collections import defaultdict
+from datetime import datetime, timezone
+import functools
+import json
+import logging
+import socket
+import time
+from typing import Any, Callable, Iterable, Iterator
+
+import httpx
+import numpy as np
+from postgrest.types import CountMethod, ReturnMethod
 
 from ..db.supabase import get_supabase_client
 from ..data.customers_repository import resolve_depot
@@ -10,10 +21,42 @@ from ..models.domain import Customer
 from ..services.export.geojson import polygon_to_wkt
 import re
 
+logger = logging.getLogger(__name__)
+
+# Network failures worth retrying; anything else (bad request, missing function) fails fast
+_TRANSIENT_ERRORS = (socket.gaierror, httpx.ConnectError, httpx.TimeoutException, httpx.RemoteProtocolError)
+# Raised when the Supabase host cannot be resolved or reached at all
+_CONNECTION_ERRORS = (socket.gaierror, httpx.ConnectError)
+
+# Zone name -> (checked_at, exists), see check_zone_ids_exist
+_ZONE_EXISTS_TTL_SECONDS = 2.0
+_zone_exists_cache: dict[str, tuple[float, bool]] = {}
+# Zone names per IN filter; they travel in the query string
+ZONE_NAME_FILTER_CHUNK = 500
+# Zone name -> (resolved_at, UUID of the newest row), see _resolve_zone_uuid
+_ZONE_UUID_TTL_SECONDS = 30.0
+_zone_uuid_cache: dict[str, tuple[float, str]] = {}
+# Zone name -> (loaded_at, customers), see get_customers_for_zone
+_ZONE_CUSTOMERS_TTL_SECONDS = 10.0
+_ZONE_CUSTOMERS_CACHE_SIZE = 256
+_zone_customers_cache: dict[str, tuple[float, tuple[Customer, ...]]] = {}
+# (zone_id, city, columns, zone_columns, limit, offset) -> (loaded_at, rows), see _routes_page
+_ROUTES_TTL_SECONDS = 30.0
+_ROUTES_CACHE_SIZE = 256
+_routes_cache: dict[tuple, tuple[float, list[dict[str, Any]]]] = {}
+
+_NO_COORDINATES = np.empty((0, 2), dtype=np.float64)
+_NO_COORDINATES.flags.writeable = False
+# Exterior ring of a WKT polygon, e.g. "POLYGON((lon lat, ...))" or "POLYGON ((...))"
+_WKT_POLYGON_RE = re.compile(r'POLYGON\s*\(\(([^)]+)\)\)')
+
 
 def check_zone_ids_exist(zone_ids: list[str]) -> dict[str, bool]:
     """Check which zone IDs already exist in the database.
     
+    Answers are cached for ``_ZONE_EXISTS_TTL_SECONDS`` so repeated checks while saving
+    one zoning reuse them; inserts and deletes drop the affected IDs immediately.
+    
     Args:
         zone_ids: List of zone IDs to check
         
@@ -24,14 +67,277 @@ def check_zone_ids_exist(zone_ids: list[str]) -> dict[str, bool]:
     if not supabase or not zone_ids:
         return {zone_id: False for zone_id in zone_ids}
     
+    now = time.monotonic()
+    known: dict[str, bool] = {}
+    to_query: list[str] = []
+    for zone_id in zone_ids:
+        cached = _zone_exists_cache.get(zone_id)
+        if cached is not None and now - cached[0] < _ZONE_EXISTS_TTL_SECONDS:
+            known[zone_id] = cached[1]
+        else:
+            to_query.append(zone_id)
+    
+    if to_query:
+        try:
+            existing_ids: set[str] = set()
+            # Chunked so very large saves don't exceed PostgREST's URL length limit
+            for start in range(0, len(to_query), ZONE_NAME_FILTER_CHUNK):
+                chunk = to_query[start:start + ZONE_NAME_FILTER_CHUNK]
+                response = supabase.table("zones").select("name").in_("name", chunk).execute()
+                existing_ids.update(z["name"] for z in (response.data or []))
+        except Exception as e:
+            logger.warning("Failed to check existing zone IDs: %s", e)
+            return {zone_id: known.get(zone_id, False) for zone_id in zone_ids}
+        for zone_id in to_query:
+            exists = zone_id in existing_ids
+            known[zone_id] = exists
+            _zone_exists_cache[zone_id] = (now, exists)
+    
+    return {zone_id: known[zone_id] for zone_id in zone_ids}
+
+
+def _forget_zone_ids(zone_ids: Iterable[str]) -> None:
+    """Drop cached existence answers, UUIDs and customers for zones that were just inserted or deleted."""
+    for zone_id in zone_ids:
+        _zone_exists_cache.pop(zone_id, None)
+        _zone_uuid_cache.pop(zone_id, None)
+        _zone_customers_cache.pop(zone_id, None)
+        clear_routes_cache(zone_id)  # a zone's routes cascade with it
+
+
+def clear_routes_cache(zone_id: str | None = None) -> None:
+    """Drop cached route listings that may include ``zone_id``'s routes (all listings if None).
+    
+    Listings filtered by city or not filtered at all can contain any zone, so they
+    are dropped along with the ones for ``zone_id``.
+    """
+    if zone_id is None:
+        _routes_cache.clear()
+        return
+    for key in [key for key in _routes_cache if key[0] is None or key[0] == zone_id]:
+        del _routes_cache[key]
+
+
+def _forget_zone_customers(zone_ids: Iterable[str] | None = None) -> None:
+    """Drop cached customer lists for zones whose assignments changed (all zones if None)."""
+    if zone_ids is None:
+        _zone_customers_cache.clear()
+        return
+    for zone_id in zone_ids:
+        _zone_customers_cache.pop(zone_id, None)
+
+
+def _execute_with_retry(request, attempts: int = 3, backoff_seconds: float = 0.25):
+    """Execute an idempotent PostgREST request, retrying transient network failures.
+    
+    The wait starts at ``backoff_seconds`` and doubles after each failed attempt; the
+    last failure is re-raised. Only use it for writes that are safe to repeat.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return request.execute()
+        except _TRANSIENT_ERRORS as e:
+            if attempt == attempts:
+                raise
+            delay = backoff_seconds * 2 ** (attempt - 1)
+            logger.warning("Transient Supabase error (attempt %d/%d), retrying in %.2fs: %s", attempt, attempts, delay, e)
+            time.sleep(delay)
+
+
+def _resolve_zone_uuid(supabase, zone_id: str) -> str | None:
+    """Return the UUID of the newest zone named ``zone_id``, or None if there is none.
+    
+    Found UUIDs are cached for ``_ZONE_UUID_TTL_SECONDS``; zone inserts and deletes in
+    this process drop them right away.
+    """
+    now = time.monotonic()
+    cached = _zone_uuid_cache.get(zone_id)
+    if cached is not None and now - cached[0] < _ZONE_UUID_TTL_SECONDS:
+        return cached[1]
+    
+    response = supabase.table("zones").select("id").eq("name", zone_id).order("created_at", desc=True).limit(1).execute()
+    if not response.data:
+        _zone_uuid_cache.pop(zone_id, None)
+        return None
+    zone_uuid = response.data[0]["id"]
+    _zone_uuid_cache[zone_id] = (now, zone_uuid)
+    return zone_uuid
+
+
+def any_zone_ids_exist(zone_ids: list[str]) -> bool:
+    """Check whether any of the given zone IDs still exist in the database.
+    
+    Cheaper than ``check_zone_ids_exist`` when only a yes/no answer is needed: the
+    request asks for a row count only, so no rows come back.
+    
+    Args:
+        zone_ids: List of zone IDs to check
+        
+    Returns:
+        True if at least one zone exists, False otherwise (or if the check fails)
+    """
+    supabase = get_supabase_client()
+    if not supabase or not zone_ids:
+        return False
+    
     try:
-        response = supabase.table("zones").select("name").in_("name", zone_ids).execute()
-        existing_ids = {z["name"] for z in (response.data or [])}
-        return {zone_id: zone_id in existing_ids for zone_id in zone_ids}
+        response = (
+            supabase.table("zones")
+            .select("name", count=CountMethod.exact, head=True)
+            .in_("name", zone_ids)
+            .execute()
+        )
     except Exception as e:
-        import logging
-        logging.warning(f"Failed to check existing zone IDs: {e}")
-        return {zone_id: False for zone_id in zone_ids}
+        logger.warning("Failed to check existing zone IDs: %s", e)
+        return False
+    return (response.count or 0) > 0
+
+
+# Backoff between re-checks while just-deleted zones still show up (database replication lag)
+_REPLICATION_POLL_DELAYS = (0.05, 0.1, 0.2, 0.4)
+_REPLICATION_WAIT_BUDGET_SECONDS = 1.0
+
+
+def _wait_for_zones_deleted(zone_ids: list[str]) -> list[str]:
+    """Poll with exponential backoff until the given zones are gone.
+    
+    Returns:
+        Zone IDs that still exist once the backoff schedule or time budget is exhausted
+    """
+    deadline = time.monotonic() + _REPLICATION_WAIT_BUDGET_SECONDS
+    still_existing = list(zone_ids)
+    for delay in _REPLICATION_POLL_DELAYS:
+        time.sleep(delay)
+        # Bypass the cached answers - they describe the state before the wait
+        _forget_zone_ids(still_existing)
+        existing_check = check_zone_ids_exist(still_existing)
+        still_existing = [zone_id for zone_id in still_existing if existing_check.get(zone_id, False)]
+        if not still_existing or time.monotonic() >= deadline:
+            break
+    return still_existing
+
+
+# Zones per bulk insert request; keeps the JSON body well under PostgREST's payload limit
+ZONE_INSERT_BATCH_SIZE = 500
+
+
+def _insert_zone_batch(supabase, batch: list[dict[str, Any]]) -> bool:
+    """Insert a batch of zones with one request.
+    
+    Tries the ``insert_zones_with_geometry`` RPC first, then a multi-row insert through
+    the ``geometry_wkt`` trigger. When the table has no ``geometry_wkt`` column at all,
+    every per-row insert would end up storing the WKT in metadata, so the batch does
+    that in one request instead.
+    
+    Returns:
+        True if the whole batch was inserted, False if the caller should fall back to
+        per-row inserts
+    """
+    try:
+        supabase.rpc("insert_zones_with_geometry", {"zones": batch}).execute()
+        logger.info("✓ Inserted %d zones via bulk RPC function", len(batch))
+        return True
+    except Exception as rpc_error:
+        try:
+            supabase.table("zones").insert(batch).execute()
+            logger.info("✓ Inserted %d zones via geometry_wkt trigger", len(batch))
+            return True
+        except Exception as insert_error:
+            if "geometry_wkt" in str(insert_error):
+                try:
+                    supabase.table("zones").insert([
+                        {
+                            "name": zone_data["name"],
+                            "depot_code": zone_data["depot_code"],
+                            "method": zone_data["method"],
+                            "metadata": {**zone_data["metadata"], "geometry_wkt": zone_data["geometry_wkt"]},
+                        }
+                        for zone_data in batch
+                    ]).execute()
+                    logger.warning(
+                        "⚠ Inserted %d zones without geometry (WKT in metadata). RPC error: %s, Insert error: %s",
+                        len(batch), rpc_error, insert_error,
+                    )
+                    return True
+                except Exception as metadata_error:
+                    insert_error = metadata_error
+            logger.warning(
+                "Bulk insert of %d zones failed, retrying individually. RPC error: %s, Insert error: %s",
+                len(batch), rpc_error, insert_error,
+            )
+            return False
+
+
+def _insert_zone_row(supabase, zone_data: dict[str, Any]) -> bool:
+    """Insert a single zone, trying the RPC, the WKT trigger, then a geometry-less row.
+    
+    Returns:
+        True if the zone was inserted
+    """
+    try:
+        # Try RPC function first (if it exists in database)
+        try:
+            supabase.rpc(
+                "insert_zone_with_geometry",
+                {
+                    "zone_name": zone_data["name"],
+                    "geometry_wkt": zone_data["geometry_wkt"],
+                    "depot_code": zone_data["depot_code"],
+                    "method": zone_data["method"],
+                    "metadata": zone_data["metadata"],
+                }
+            ).execute()
+            logger.info("✓ Inserted zone %s via RPC function", zone_data["name"])
+            return True
+        except Exception as rpc_error:
+            # Fallback: Try using geometry_wkt column with trigger
+            try:
+                supabase.table("zones").insert({
+                    "name": zone_data["name"],
+                    "geometry_wkt": zone_data["geometry_wkt"],
+                    "depot_code": zone_data["depot_code"],
+                    "method": zone_data["method"],
+                    "metadata": zone_data["metadata"],
+                }).execute()
+                logger.info("✓ Inserted zone %s via geometry_wkt trigger", zone_data["name"])
+                return True
+            except Exception as trigger_error:
+                # Last fallback: Store WKT in metadata (geometry will be null)
+                try:
+                    metadata_with_wkt = {**zone_data["metadata"], "geometry_wkt": zone_data["geometry_wkt"]}
+                    supabase.table("zones").insert({
+                        "name": zone_data["name"],
+                        "depot_code": zone_data["depot_code"],
+                        "method": zone_data["method"],
+                        "metadata": metadata_with_wkt,
+                    }).execute()
+                    logger.warning("⚠ Inserted zone %s without geometry (WKT in metadata). RPC error: %s, Trigger error: %s", zone_data["name"], rpc_error, trigger_error)
+                    return True
+                except Exception as final_error:
+                    logger.error("✗ Failed to insert zone %s: RPC=%s, Trigger=%s, Final=%s", zone_data["name"], rpc_error, trigger_error, final_error)
+                    return False
+    except Exception as e:
+        logger.error("✗ Unexpected error inserting zone %s: %s", zone_data["name"], e)
+        return False
+
+
+def _replace_zones(supabase, zones_to_insert: list[dict[str, Any]]) -> bool:
+    """Atomically replace all zones sharing the given names via the ``replace_zones`` RPC.
+    
+    Returns:
+        True if the zones were replaced, False if the caller should fall back to the
+        check/delete/insert sequence (for example when the RPC is not installed)
+    """
+    try:
+        response = supabase.rpc("replace_zones", {"p_zones": zones_to_insert}).execute()
+    except Exception as e:
+        logger.debug("replace_zones RPC unavailable, falling back to delete + insert: %s", e)
+        return False
+    finally:
+        _forget_zone_ids(z["name"] for z in zones_to_insert)
+    
+    logger.info("✓ Replaced %s zone(s) in one transaction via replace_zones", response.data)
+    return True
 
 
 def save_zones_to_database(
@@ -47,13 +353,15 @@ def save_zones_to_database(
         zones_response: Zone generation response with assignments, counts, and metadata
         city: City name for the zones
         method: Zoning method used (polar, isochrone, clustering, manual)
-        check_duplicates: If True, check for and delete duplicate zone IDs before saving
+        check_duplicates: If True, replace existing zones with the same IDs; done in one
+            transaction by the ``replace_zones`` RPC, else by deleting duplicates first
+        recently_deleted_zone_ids: Zone IDs the caller just deleted, so lingering copies
+            are waited for rather than reported (only used without ``replace_zones``)
     """
     supabase = get_supabase_client()
     if not supabase:
         # Database not configured, skip silently
-        import logging
-        logging.info("Supabase not configured - zones will only be saved to files")
+        logger.info("Supabase not configured - zones will only be saved to files")
         return
     
     try:
@@ -61,90 +369,88 @@ def save_zones_to_database(
         depot = resolve_depot(city)
         depot_code = depot.code if depot else None
         
-        # Get map overlays (polygons) from metadata
-        map_overlays = zones_response.get("metadata", {}).get("map_overlays", {})
-        polygons = map_overlays.get("polygons", [])
-        
-        # Get zone counts
-        counts = zones_response.get("counts", [])
-        count_map = {count["zone_id"]: count["customer_count"] for count in counts}
+        # Response-level values shared by every zone
+        response_metadata = zones_response.get("metadata", {})
+        customer_travel_data = response_metadata.get("customer_travel_data", {})
+        zone_travel_stats = response_metadata.get("zone_travel_stats", {})
+        shared_metadata = {
+            key: response_metadata[key]
+            for key in ("max_customers_per_zone", "target_zones")
+            if key in response_metadata
+        }
+        
+        # Get map overlays (polygons) from metadata, keeping only usable ones as
+        # (zone_id, coordinates, centroid, source) tuples
+        map_overlays = response_metadata.get("map_overlays", {})
+        polygons = [
+            (polygon["zone_id"], polygon["coordinates"], polygon.get("centroid"), polygon.get("source", "unknown"))
+            for polygon in map_overlays.get("polygons", [])
+            if polygon.get("zone_id") and polygon.get("coordinates") and len(polygon["coordinates"]) >= 3
+        ]
+        
+        # Group customer assignments (customer_id -> zone_id in the response) and their
+        # travel data by zone in one pass
+        assignments_by_zone: dict[str, list[str]] = defaultdict(list)
+        travel_data_by_zone: dict[str, dict[str, Any]] = defaultdict(dict)
+        for customer_id, assigned_zone in zones_response.get("assignments", {}).items():
+            assignments_by_zone[assigned_zone].append(customer_id)
+            if customer_id in customer_travel_data:
+                travel_data_by_zone[assigned_zone][customer_id] = customer_travel_data[customer_id]
+        # Zone already claiming each customer, used to detect cross-zone duplicates
+        seen_customer_to_zone: dict[str, str] = {}
         
         # Prepare zones for database insertion
         zones_to_insert = []
-        for polygon in polygons:
-            zone_id = polygon.get("zone_id")
-            coordinates = polygon.get("coordinates", [])
-            
-            if not zone_id or not coordinates or len(coordinates) < 3:
-                continue
-            
+        for zone_id, coordinates, centroid, source in polygons:
             try:
                 # Convert to WKT format for PostGIS
                 geometry_wkt = polygon_to_wkt(coordinates)
                 
-                # Get customer count for this zone
-                customer_count = count_map.get(zone_id, 0)
-                
                 # Prepare metadata (store coordinates as backup for retrieval)
                 metadata = {
                     "zone_id": zone_id,
                     "city": city,
                     "method": method,
-                    "centroid": polygon.get("centroid"),
-                    "source": polygon.get("source", "unknown"),
+                    "centroid": centroid,
+                    "source": source,
                     "coordinates": coordinates,  # Store coordinates in metadata as backup
                 }
                 
                 # Store assignments for this zone (customer_id -> zone_id mapping)
-                assignments = zones_response.get("assignments", {})
-                zone_assignments = {
-                    customer_id: assigned_zone
-                    for customer_id, assigned_zone in assignments.items()
-                    if assigned_zone == zone_id
-                }
+                zone_assignments = assignments_by_zone.get(zone_id, [])
                 if zone_assignments:
-                    metadata["customer_ids"] = list(zone_assignments.keys())
+                    metadata["customer_ids"] = list(zone_assignments)
                     
                     # Validate: Ensure customers are only assigned to this zone
-                    # Check if any of these customers appear in other zones being saved
-                    for other_zone in zones_to_insert:
-                        if other_zone["name"] != zone_id:
-                            other_meta = other_zone.get("metadata", {}) if isinstance(other_zone.get("metadata"), dict) else {}
-                            other_customer_ids = other_meta.get("customer_ids", [])
-                            if isinstance(other_customer_ids, list):
-                                duplicates = set(zone_assignments.keys()) & set(other_customer_ids)
-                                if duplicates:
-                                    import logging
-                                    logging.error(
-                                        f"❌ CRITICAL: Customer(s) {list(duplicates)} are assigned to multiple zones: "
-                                        f"{zone_id} and {other_zone['name']}. This violates ERB requirements!"
-                                    )
-                                    raise ValueError(
-                                        f"Customer assignment conflict: {len(duplicates)} customer(s) assigned to "
-                                        f"multiple zones. Customers: {list(duplicates)[:5]}..."
-                                    )
+                    # Check if any of these customers already belong to another zone being saved
+                    duplicates: dict[str, str] = {}
+                    for customer_id in zone_assignments:
+                        previous_zone = seen_customer_to_zone.get(customer_id)
+                        if previous_zone is not None and previous_zone != zone_id:
+                            duplicates[customer_id] = previous_zone
+                    if duplicates:
+                        other_zones = sorted(set(duplicates.values()))
+                        logger.error(
+                            "❌ CRITICAL: Customer(s) %s are assigned to multiple zones: %s and %s. "
+                            "This violates ERB requirements!",
+                            list(duplicates), zone_id, ", ".join(other_zones),
+                        )
+                        raise ValueError(
+                            f"Customer assignment conflict: {len(duplicates)} customer(s) assigned to "
+                            f"multiple zones. Customers: {list(duplicates)[:5]}..."
+                        )
+                    for customer_id in zone_assignments:
+                        seen_customer_to_zone[customer_id] = zone_id
                 
                 # Add any additional metadata from the response
-                response_metadata = zones_response.get("metadata", {})
-                if "max_customers_per_zone" in response_metadata:
-                    metadata["max_customers_per_zone"] = response_metadata["max_customers_per_zone"]
-                if "target_zones" in response_metadata:
-                    metadata["target_zones"] = response_metadata["target_zones"]
+                metadata.update(shared_metadata)
                 
-                # Include travel data for customers in this zone
-                customer_travel_data = response_metadata.get("customer_travel_data", {})
-                if customer_travel_data and zone_assignments:
-                    # Store travel data only for customers in this zone
-                    zone_travel_data = {
-                        customer_id: customer_travel_data.get(customer_id, {})
-                        for customer_id in zone_assignments.keys()
-                        if customer_id in customer_travel_data
-                    }
-                    if zone_travel_data:
-                        metadata["customer_travel_data"] = zone_travel_data
+                # Include travel data for customers in this zone (only theirs)
+                zone_travel_data = travel_data_by_zone.get(zone_id)
+                if zone_travel_data:
+                    metadata["customer_travel_data"] = zone_travel_data
                 
                 # Include zone-level travel statistics
-                zone_travel_stats = response_metadata.get("zone_travel_stats", {})
                 if zone_travel_stats and zone_id in zone_travel_stats:
                     metadata["travel_stats"] = zone_travel_stats[zone_id]
                 
@@ -152,180 +458,175 @@ def save_zones_to_database(
                     "name": zone_id,
                     "geometry_wkt": geometry_wkt,  # Use geometry_wkt column (converted by trigger)
                     "depot_code": depot_code,
-                    "customer_count": customer_count,
                     "method": method,
                     "metadata": metadata,
                 })
             except (ValueError, KeyError) as e:
                 # Skip invalid polygons but continue processing
-                import logging
-                logging.warning(f"Skipping invalid polygon for zone {zone_id}: {e}")
+                logger.warning("Skipping invalid polygon for zone %s: %s", zone_id, e)
                 continue
         
         # Insert zones into database
         if zones_to_insert:
-            import logging
-            logging.info(f"Attempting to save {len(zones_to_insert)} zones to database")
+            logger.info("Attempting to save %d zones to database", len(zones_to_insert))
+            
+            # Preferred path: delete every old record with these zone IDs and insert the
+            # new zones in one transaction - no duplicate scan, replication wait or retries
+            if check_duplicates and _replace_zones(supabase, zones_to_insert):
+                return
             
             # CRITICAL: Check for and delete ALL duplicate zone IDs before inserting
             # This prevents overlapping zones (old and new with same ID)
             # We must delete ALL records with these zone_ids, not just one per ID
             if check_duplicates:
-                zone_ids_to_save = [z["name"] for z in zones_to_insert]
+                zone_ids_to_save = list(dict.fromkeys(z["name"] for z in zones_to_insert))
                 existing_check = check_zone_ids_exist(zone_ids_to_save)
+                recently_deleted = frozenset(recently_deleted_zone_ids or ())
                 
                 # Filter out zones that were recently deleted - these are expected to not exist
                 # but might still show up due to database replication delays
                 duplicate_ids = [
                     zone_id for zone_id, exists in existing_check.items() 
-                    if exists and (recently_deleted_zone_ids is None or zone_id not in recently_deleted_zone_ids)
+                    if exists and zone_id not in recently_deleted
                 ]
                 
                 # If we have recently deleted zones that still exist, wait a bit longer for DB to sync
-                if recently_deleted_zone_ids:
-                    recently_deleted_still_existing = [
-                        zone_id for zone_id in recently_deleted_zone_ids
-                        if existing_check.get(zone_id, False)
-                    ]
-                    if recently_deleted_still_existing:
-                        import time
-                        import logging
-                        logging.info(f"⏳ Zones {recently_deleted_still_existing} were just deleted but still appear in DB. Waiting for DB sync...")
-                        time.sleep(0.5)  # Wait for database replication
-                        # Re-check after delay
-                        existing_check = check_zone_ids_exist(zone_ids_to_save)
-                        duplicate_ids = [
-                            zone_id for zone_id, exists in existing_check.items() 
-                            if exists and zone_id not in recently_deleted_zone_ids
-                        ]
-                        # Log if they still exist after waiting
-                        still_existing_after_wait = [
-                            zone_id for zone_id in recently_deleted_zone_ids
+                if recently_deleted:
+                    # Walk the smaller side and probe the other
+                    if len(recently_deleted) <= len(existing_check):
+                        recently_deleted_still_existing = [
+                            zone_id for zone_id in recently_deleted
                             if existing_check.get(zone_id, False)
                         ]
+                    else:
+                        recently_deleted_still_existing = [
+                            zone_id for zone_id, exists in existing_check.items()
+                            if exists and zone_id in recently_deleted
+                        ]
+                    if recently_deleted_still_existing:
+                        logger.info("⏳ Zones %s were just deleted but still appear in DB. Waiting for DB sync...", recently_deleted_still_existing)
+                        # Re-poll only the lagging zones; the other IDs are already classified above
+                        still_existing_after_wait = _wait_for_zones_deleted(recently_deleted_still_existing)
                         if still_existing_after_wait:
-                            logging.warning(f"⚠️ Zones {still_existing_after_wait} still exist after wait. They will be treated as duplicates and deleted.")
+                            logger.warning("⚠️ Zones %s still exist after wait. They will be treated as duplicates and deleted.", still_existing_after_wait)
                             # Add them back to duplicate_ids so they get deleted
                             duplicate_ids.extend(still_existing_after_wait)
                 
                 if duplicate_ids:
                     # Check if these are zones that were recently deleted
-                    if recently_deleted_zone_ids:
-                        unexpected_duplicates = [zid for zid in duplicate_ids if zid not in recently_deleted_zone_ids]
+                    if recently_deleted:
+                        unexpected_duplicates = [zid for zid in duplicate_ids if zid not in recently_deleted]
                         if unexpected_duplicates:
-                            logging.warning(f"⚠️ Found {len(unexpected_duplicates)} unexpected duplicate zone IDs: {unexpected_duplicates}")
+                            logger.warning("⚠️ Found %d unexpected duplicate zone IDs: %s", len(unexpected_duplicates), unexpected_duplicates)
                         if len(duplicate_ids) > len(unexpected_duplicates):
-                            logging.info(f"ℹ️ Found {len(duplicate_ids) - len(unexpected_duplicates)} zone(s) that were recently deleted but still in DB: {[zid for zid in duplicate_ids if zid in recently_deleted_zone_ids]}")
+                            logger.info("ℹ️ Found %d zone(s) that were recently deleted but still in DB: %s", len(duplicate_ids) - len(unexpected_duplicates), [zid for zid in duplicate_ids if zid in recently_deleted])
                     else:
-                        logging.warning(f"⚠️ Found {len(duplicate_ids)} duplicate zone IDs before saving: {duplicate_ids}")
-                    
-                    # Count how many records exist for these zone_ids
-                    count_query = supabase.table("zones").select("name", count="exact").in_("name", duplicate_ids).execute()
-                    total_duplicate_records = count_query.count if hasattr(count_query, 'count') else None
-                    if total_duplicate_records:
-                        logging.info(f"ℹ️ Found {total_duplicate_records} total duplicate zone record(s) to delete")
-                    
-                    logging.info(f"Deleting ALL duplicate zones (including all records with same zone_id) to prevent overlaps...")
+                        logger.warning("⚠️ Found %d duplicate zone IDs before saving: %s", len(duplicate_ids), duplicate_ids)
                     
-                    # Unassign customers from ALL duplicate zones first
-                    unassign_all_customers_from_zones(duplicate_ids)
+                    logger.info("Deleting ALL duplicate zones (including all records with same zone_id) to prevent overlaps...")
                     
-                    # Delete ALL duplicate zones - this should delete ALL records with these zone_ids
-                    delete_success = delete_zones(duplicate_ids, verify=True)
+                    # Delete ALL duplicate zones - this deletes ALL records with these zone_ids,
+                    # together with their customer assignments
+                    delete_success = delete_zones_with_customers(duplicate_ids) is not None
                     if not delete_success:
                         # Try one more time with a longer delay
-                        import time
                         time.sleep(0.5)
-                        delete_success = delete_zones(duplicate_ids, verify=True)
+                        delete_success = delete_zones_with_customers(duplicate_ids) is not None
                         if not delete_success:
-                            logging.error(f"❌ Failed to delete duplicate zones after retry: {duplicate_ids}")
+                            logger.error("❌ Failed to delete duplicate zones after retry: %s", duplicate_ids)
                             raise ValueError(
                                 f"Cannot save zones: duplicate zone IDs still exist after deletion attempt: {duplicate_ids}. "
                                 f"Please manually delete these zones from the database."
                             )
                     
                     # Final verification - check if any still exist
-                    final_check = check_zone_ids_exist(duplicate_ids)
-                    still_existing = [zone_id for zone_id, exists in final_check.items() if exists]
-                    if still_existing:
-                        logging.error(f"❌ CRITICAL: Some duplicate zones still exist after deletion: {still_existing}")
-                        logging.warning(f"⚠️ Attempting to continue anyway - new zones will be saved and may create duplicates")
+                    if any_zone_ids_exist(duplicate_ids):
+                        logger.error("❌ CRITICAL: Some duplicate zones still exist after deletion: %s", duplicate_ids)
+                        logger.warning("⚠️ Attempting to continue anyway - new zones will be saved and may create duplicates")
                         # Don't raise error - allow save to proceed, duplicate checking will handle it
                         # The worst case is we'll have duplicates which can be cleaned up later
                     
-                    logging.info(f"✅ Cleanup complete - proceeding to save new zones")
+                    logger.info("✅ Cleanup complete - proceeding to save new zones")
             
             inserted_count = 0
             failed_count = 0
             
-            for zone_data in zones_to_insert:
-                try:
-                    # Try RPC function first (if it exists in database)
-                    try:
-                        result = supabase.rpc(
-                            "insert_zone_with_geometry",
-                            {
-                                "zone_name": zone_data["name"],
-                                "geometry_wkt": zone_data["geometry_wkt"],
-                                "depot_code": zone_data["depot_code"],
-                                "customer_count": zone_data["customer_count"],
-                                "method": zone_data["method"],
-                                "metadata": zone_data["metadata"],
-                            }
-                        ).execute()
-                        inserted_count += 1
-                        logging.info(f"✓ Inserted zone {zone_data['name']} via RPC function")
-                    except Exception as rpc_error:
-                        # Fallback: Try using geometry_wkt column with trigger
-                        try:
-                            supabase.table("zones").insert({
-                                "name": zone_data["name"],
-                                "geometry_wkt": zone_data["geometry_wkt"],
-                                "depot_code": zone_data["depot_code"],
-                                "customer_count": zone_data["customer_count"],
-                                "method": zone_data["method"],
-                                "metadata": zone_data["metadata"],
-                            }).execute()
-                            inserted_count += 1
-                            logging.info(f"✓ Inserted zone {zone_data['name']} via geometry_wkt trigger")
-                        except Exception as trigger_error:
-                            # Last fallback: Store WKT in metadata (geometry will be null)
-                            try:
-                                metadata_with_wkt = {**zone_data["metadata"], "geometry_wkt": zone_data["geometry_wkt"]}
-                                supabase.table("zones").insert({
-                                    "name": zone_data["name"],
-                                    "depot_code": zone_data["depot_code"],
-                                    "customer_count": zone_data["customer_count"],
-                                    "method": zone_data["method"],
-                                    "metadata": metadata_with_wkt,
-                                }).execute()
-                                inserted_count += 1
-                                logging.warning(f"⚠ Inserted zone {zone_data['name']} without geometry (WKT in metadata). RPC error: {rpc_error}, Trigger error: {trigger_error}")
-                            except Exception as final_error:
-                                failed_count += 1
-                                logging.error(f"✗ Failed to insert zone {zone_data['name']}: RPC={rpc_error}, Trigger={trigger_error}, Final={final_error}")
-                                continue
-                except Exception as e:
-                    failed_count += 1
-                    logging.error(f"✗ Unexpected error inserting zone {zone_data['name']}: {e}")
+            # Insert in multi-row batches; only a batch whose bulk insert fails is retried row by row
+            for start in range(0, len(zones_to_insert), ZONE_INSERT_BATCH_SIZE):
+                batch = zones_to_insert[start:start + ZONE_INSERT_BATCH_SIZE]
+                if _insert_zone_batch(supabase, batch):
+                    inserted_count += len(batch)
                     continue
+                for zone_data in batch:
+                    if _insert_zone_row(supabase, zone_data):
+                        inserted_count += 1
+                    else:
+                        failed_count += 1
+            _forget_zone_ids(z["name"] for z in zones_to_insert)
             
             if inserted_count > 0:
-                logging.info(f"✓ Successfully inserted {inserted_count} out of {len(zones_to_insert)} zones to database")
+                logger.info("✓ Successfully inserted %s out of %d zones to database", inserted_count, len(zones_to_insert))
             if failed_count > 0:
-                logging.error(f"❌ Failed to insert {failed_count} zones. Check database configuration and schema.")
+                logger.error("❌ Failed to insert %s zones. Check database configuration and schema.", failed_count)
                 # This is critical - if zones aren't saved, customers will remain unassigned
                 raise ValueError(f"Failed to save {failed_count} zone(s) to database. Zones may not be available and customers may remain unassigned.")
             
             # Verify that zones were actually saved
             if inserted_count == 0 and len(zones_to_insert) > 0:
-                logging.error(f"❌ CRITICAL: No zones were inserted despite having {len(zones_to_insert)} zones to save!")
+                logger.error("❌ CRITICAL: No zones were inserted despite having %d zones to save!", len(zones_to_insert))
                 raise ValueError("Failed to save any zones to database. Please check database connection and schema.")
                     
     except Exception as e:
         # Log error but don't fail the entire request
-        import logging
-        logging.warning(f"Failed to save zones to database: {e}")
+        logger.warning("Failed to save zones to database: %s", e)
+
+
+@functools.lru_cache(maxsize=4096)
+def wkt_to_coordinates_array(wkt: str) -> np.ndarray:
+    """Convert WKT POLYGON string to an ``(N, 2)`` float array of ``[lat, lon]`` rows.
+    
+    Results are cached per WKT string and returned read-only.
+    
+    Args:
+        wkt: WKT POLYGON string (format: POLYGON((lon lat, lon lat, ...)))
+        
+    Returns:
+        Array of [lat, lon] coordinate pairs (empty ``(0, 2)`` array if unparseable)
+    """
+    if not wkt or not wkt.startswith("POLYGON"):
+        return _NO_COORDINATES
+    
+    # Extract coordinates from POLYGON((...)) format
+    # Match the content between the double parentheses
+    match = _WKT_POLYGON_RE.match(wkt)
+    if not match:
+        return _NO_COORDINATES
+    
+    coord_string = match.group(1)
+    # Fast path: parse every number in C, valid when each comma-separated pair holds exactly two values
+    try:
+        flat = np.fromstring(coord_string.replace(',', ' '), sep=' ', dtype=np.float64)
+    except ValueError:
+        flat = None
+    if flat is not None and flat.size == 2 * (coord_string.count(',') + 1):
+        # WKT is "lon lat"; return as [lat, lon] to match frontend format
+        coords_array = flat.reshape(-1, 2)[:, ::-1]
+        coords_array.flags.writeable = False
+        return coords_array
+    
+    # Slow path for malformed input: parse pair by pair, skipping bad pairs
+    # (str.split() already drops surrounding whitespace)
+    coords = []
+    for pair in coord_string.split(','):
+        parts = pair.split()
+        if len(parts) >= 2:
+            try:
+                coords.append((float(parts[1]), float(parts[0])))
+            except ValueError:
+                continue
+    coords_array = np.array(coords, dtype=np.float64).reshape(-1, 2)
+    coords_array.flags.writeable = False
+    return coords_array
 
 
 def wkt_to_coordinates(wkt: str) -> list[tuple[float, float]]:
@@ -337,35 +638,7 @@ def wkt_to_coordinates(wkt: str) -> list[tuple[float, float]]:
     Returns:
         List of [lat, lon] coordinate pairs
     """
-    if not wkt:
-        return []
-    
-    # Handle WKT format
-    if wkt.startswith("POLYGON"):
-        # Extract coordinates from POLYGON((...)) format
-        # Match the content between the double parentheses
-        match = re.search(r'POLYGON\(\(([^)]+)\)\)', wkt)
-        if not match:
-            return []
-        
-        coord_string = match.group(1)
-        # Split by comma and parse lon lat pairs
-        coords = []
-        for pair in coord_string.split(','):
-            pair = pair.strip()
-            parts = pair.split()
-            if len(parts) >= 2:
-                try:
-                    lon = float(parts[0])
-                    lat = float(parts[1])
-                    # Return as [lat, lon] to match frontend format
-                    coords.append((lat, lon))
-                except (ValueError, IndexError):
-                    continue
-        
-        return coords
-    
-    return []
+    return list(map(tuple, wkt_to_coordinates_array(wkt).tolist()))
 
 
 def geojson_to_coordinates(geojson: dict[str, Any]) -> list[tuple[float, float]]:
@@ -405,12 +678,26 @@ def geojson_to_coordinates(geojson: dict[str, Any]) -> list[tuple[float, float]]
     return []
 
 
-def get_zones_from_database(city: str | None = None, method: str | None = None) -> list[dict[str, Any]]:
-    """Retrieve zones from database.
+# Columns returned by get_zones_from_database unless the caller narrows them
+ZONE_COLUMNS = "id,name,depot_code,method,customer_count,geometry_wkt,metadata,created_at"
+
+
+def get_zones_from_database(
+    city: str | None = None,
+    method: str | None = None,
+    columns: str = ZONE_COLUMNS,
+    limit: int | None = None,
+    offset: int = 0,
+) -> list[dict[str, Any]]:
+    """Retrieve zones from database, newest first.
     
     Args:
         city: Optional city filter
         method: Optional method filter
+        columns: PostgREST column list to return; pass ``"*"`` to include the PostGIS
+            ``geometry`` column
+        limit: Optional page size; with ``offset`` selects one page of zones
+        offset: Number of zones to skip when ``limit`` is set
         
     Returns:
         List of zone records from database
@@ -420,9 +707,8 @@ def get_zones_from_database(city: str | None = None, method: str | None = None)
         return []
     
     try:
-        # Select all columns including geometry (Supabase will return PostGIS geometry as GeoJSON)
         # Note: We rely on metadata.coordinates as primary source, geometry is fallback
-        query = supabase.table("zones").select("*")
+        query = supabase.table("zones").select(columns)
         
         if city:
             # Filter by city in metadata
@@ -431,21 +717,106 @@ def get_zones_from_database(city: str | None = None, method: str | None = None)
         if method:
             query = query.eq("method", method)
         
-        response = query.order("created_at", desc=True).execute()
+        # Zones inserted in one batch share created_at; id keeps pages from repeating or skipping them
+        query = query.order("created_at", desc=True).order("id")
+        if limit is not None:
+            query = query.range(offset, offset + limit - 1)
+        response = query.execute()
         zones_data = response.data if response.data else []
         
         # Log for debugging
         if zones_data:
-            import logging
-            logging.info(f"Retrieved {len(zones_data)} zones from database (city={city}, method={method})")
+            logger.info("Retrieved %d zones from database (city=%s, method=%s)", len(zones_data), city, method)
         
         return zones_data
     except Exception as e:
-        import logging
-        logging.warning(f"Failed to retrieve zones from database: {e}")
+        logger.warning("Failed to retrieve zones from database: %s", e)
         return []
 
 
+def get_zones_without_travel_data(city: str | None = None, method: str | None = None) -> list[dict[str, Any]]:
+    """Retrieve zones (all columns, newest first) without ``metadata.customer_travel_data``.
+    
+    The per-customer travel data is by far the largest part of a zone's metadata and
+    only the zoning run that produced it needs it. The ``get_zones_without_travel_data``
+    RPC strips it server-side; without the RPC it is dropped after a full read.
+    
+    Args:
+        city: Optional city filter
+        method: Optional method filter
+        
+    Returns:
+        List of zone records from database
+    """
+    supabase = get_supabase_client()
+    if not supabase:
+        return []
+    
+    try:
+        response = supabase.rpc(
+            "get_zones_without_travel_data",
+            {"p_city": city, "p_method": method},
+        ).execute()
+        return response.data if response.data else []
+    except Exception as rpc_error:
+        logger.debug("get_zones_without_travel_data RPC unavailable, reading full zones: %s", rpc_error)
+    
+    zones_data = get_zones_from_database(city=city, method=method, columns="*")
+    for zone in zones_data:
+        metadata = zone.get("metadata")
+        if isinstance(metadata, dict):
+            metadata.pop("customer_travel_data", None)
+    return zones_data
+
+
+def _write_zone_geometry(
+    supabase,
+    zone_id: str,
+    geometry_wkt: str,
+    coordinates: list[tuple[float, float]],
+) -> dict[str, Any] | None:
+    """Write a zone's new polygon and metadata backup, returning the saved row.
+    
+    Uses the ``update_zone_geometry`` RPC (one round-trip). Without it, looks the zone up
+    once and sets both columns in a single UPDATE. The most recent zone with the name wins.
+    
+    Returns:
+        The saved ``geometry_wkt``/``metadata`` values, or None if the zone does not exist
+    """
+    try:
+        response = supabase.rpc(
+            "update_zone_geometry",
+            {"zone_name": zone_id, "wkt": geometry_wkt, "coords": coordinates},
+        ).execute()
+        return response.data[0] if response.data else None
+    except _TRANSIENT_ERRORS:
+        raise  # the table API would fail the same way; let the caller retry
+    except Exception as rpc_error:
+        logger.debug("update_zone_geometry RPC unavailable, updating via table API: %s", rpc_error)
+    
+    # Get the most recent zone if multiple exist
+    response = supabase.table("zones").select("id, metadata").eq("name", zone_id).order("created_at", desc=True).limit(1).execute()
+    if not response.data:
+        return None
+    
+    zone_db_id = response.data[0]["id"]
+    logger.info("📍 Found zone in DB: zone_id=%s, db_id=%s", zone_id, zone_db_id)
+    
+    # Update geometry using geometry_wkt (will be converted by trigger), with coordinates as backup
+    update: dict[str, Any] = {"geometry_wkt": geometry_wkt}
+    metadata = response.data[0].get("metadata", {})
+    if isinstance(metadata, dict):
+        metadata["coordinates"] = coordinates
+        metadata["geometry_updated"] = True
+        update["metadata"] = metadata
+    # Only ask for the written row back when it will be logged for verification
+    verify = logger.isEnabledFor(logging.DEBUG)
+    returning = ReturnMethod.representation if verify else ReturnMethod.minimal
+    update_response = supabase.table("zones").update(update, returning=returning).eq("id", zone_db_id).execute()
+    logger.info("✅ DB UPDATE geometry_wkt/metadata: saved %d points", len(coordinates))
+    if verify and update_response.data:
+        return update_response.data[0]
+    return {"geometry_wkt": geometry_wkt, "metadata": metadata}
 
 
 def update_zone_geometry(zone_id: str, coordinates: list[tuple[float, float]]) -> bool:
@@ -460,36 +831,20 @@ def update_zone_geometry(zone_id: str, coordinates: list[tuple[float, float]]) -
     """
     supabase = get_supabase_client()
     if not supabase:
-        import logging
-        logging.error("Database not configured - cannot update zone geometry. Check IZG_SUPABASE_URL and IZG_SUPABASE_KEY in .env file")
-        return False
-    
-    # Test connection before attempting update
-    try:
-        # Quick connection test - try to query a simple table
-        test_response = supabase.table("zones").select("id").limit(1).execute()
-    except Exception as conn_error:
-        import logging
-        error_msg = str(conn_error)
-        if "getaddrinfo" in error_msg or "11001" in error_msg:
-            logging.error(f"Cannot connect to Supabase database. DNS resolution failed. Check your IZG_SUPABASE_URL in .env file. Error: {error_msg}")
-        else:
-            logging.error(f"Cannot connect to Supabase database. Error: {error_msg}")
+        logger.error("Database not configured - cannot update zone geometry. Check IZG_SUPABASE_URL and IZG_SUPABASE_KEY in .env file")
         return False
     
     if not coordinates or len(coordinates) < 3:
-        import logging
-        logging.warning(f"Invalid coordinates for zone '{zone_id}': need at least 3 points")
+        logger.warning("Invalid coordinates for zone '%s': need at least 3 points", zone_id)
         return False
     
     try:
-        import logging
-        
         # Convert coordinates to WKT format
         geometry_wkt = polygon_to_wkt(coordinates)
-        logging.info(f"📤 UPDATE_ZONE_GEOMETRY: zone_id={zone_id}, coord_count={len(coordinates)}")
-        logging.info(f"📤 COORDINATES RECEIVED: {coordinates[:3]}... (first 3 points)")
-        logging.info(f"📤 WKT GENERATED: {geometry_wkt[:100]}...")
+        logger.info("📤 UPDATE_ZONE_GEOMETRY: zone_id=%s, coord_count=%d", zone_id, len(coordinates))
+        if logger.isEnabledFor(logging.INFO):  # skip building the previews when INFO is off
+            logger.info("📤 COORDINATES RECEIVED: %s... (first 3 points)", coordinates[:3])
+            logger.info("📤 WKT GENERATED: %s...", geometry_wkt[:100])
         
         # Update the zone's geometry with retry logic for network errors
         max_retries = 3
@@ -497,76 +852,86 @@ def update_zone_geometry(zone_id: str, coordinates: list[tuple[float, float]]) -
         
         while retry_count < max_retries:
             try:
-                # First, try to find the zone (get the most recent one if multiple exist)
-                response = supabase.table("zones").select("id").eq("name", zone_id).order("created_at", desc=True).limit(1).execute()
-                
-                if not response.data or len(response.data) == 0:
-                    logging.warning(f"❌ Zone '{zone_id}' not found in database")
+                saved = _write_zone_geometry(supabase, zone_id, geometry_wkt, coordinates)
+                if saved is None:
+                    logger.warning("❌ Zone '%s' not found in database", zone_id)
                     return False
                 
-                zone_db_id = response.data[0]["id"]
-                logging.info(f"📍 Found zone in DB: zone_id={zone_id}, db_id={zone_db_id}")
-                
-                # Update geometry using geometry_wkt (will be converted by trigger)
-                update_response = supabase.table("zones").update({
-                    "geometry_wkt": geometry_wkt,
-                }).eq("id", zone_db_id).execute()
-                logging.info(f"✅ DB UPDATE geometry_wkt: response={update_response.data}")
-                
-                # Also update metadata coordinates as backup
-                zone_data = supabase.table("zones").select("metadata").eq("id", zone_db_id).execute()
-                if zone_data.data:
-                    metadata = zone_data.data[0].get("metadata", {})
-                    if isinstance(metadata, dict):
-                        metadata["coordinates"] = coordinates
-                        metadata["geometry_updated"] = True
-                        metadata_response = supabase.table("zones").update({
-                            "metadata": metadata
-                        }).eq("id", zone_db_id).execute()
-                        logging.info(f"✅ DB UPDATE metadata.coordinates: saved {len(coordinates)} points")
-                
-                # VERIFY: Read back the saved data to confirm
-                verify_response = supabase.table("zones").select("geometry_wkt, metadata").eq("id", zone_db_id).execute()
-                if verify_response.data:
-                    saved_wkt = verify_response.data[0].get("geometry_wkt", "")
-                    saved_meta = verify_response.data[0].get("metadata", {})
+                # VERIFY (debug only): the update returns the saved row, no extra read needed
+                if logger.isEnabledFor(logging.DEBUG):
+                    saved_wkt = saved.get("geometry_wkt") or ""
+                    saved_meta = saved.get("metadata", {})
                     saved_coords = saved_meta.get("coordinates", []) if isinstance(saved_meta, dict) else []
-                    logging.info(f"✅ VERIFIED SAVED DATA: wkt_length={len(saved_wkt)}, coord_count={len(saved_coords)}")
+                    logger.debug("✅ VERIFIED SAVED DATA: wkt_length=%d, coord_count=%d", len(saved_wkt), len(saved_coords))
                     if saved_coords:
-                        logging.info(f"✅ VERIFIED FIRST COORD: {saved_coords[0]}")
+                        logger.debug("✅ VERIFIED FIRST COORD: %s", saved_coords[0])
                 
-                logging.info(f"✅ Successfully updated geometry for zone '{zone_id}'")
+                logger.info("✅ Successfully updated geometry for zone '%s'", zone_id)
                 return True
                 
-            except Exception as retry_error:
+            except _TRANSIENT_ERRORS as retry_error:
                 retry_count += 1
-                error_msg = str(retry_error)
-                # Check if it's a network/DNS error
-                if ("getaddrinfo" in error_msg or "11001" in error_msg or "network" in error_msg.lower()) and retry_count < max_retries:
-                    import logging
-                    import time
-                    logging.warning(f"Network error updating zone '{zone_id}' (attempt {retry_count}/{max_retries}): {error_msg}. Retrying...")
-                    time.sleep(1 * retry_count)  # Exponential backoff
-                    continue
-                else:
-                    raise  # Re-raise if not a network error or max retries reached
+                if retry_count >= max_retries:
+                    raise
+                logger.warning("Network error updating zone '%s' (attempt %s/%s): %s. Retrying...", zone_id, retry_count, max_retries, retry_error)
+                time.sleep(1 * retry_count)  # Exponential backoff
         
+    except _CONNECTION_ERRORS as e:
+        logger.error("Cannot connect to Supabase database. DNS resolution failed. Check your IZG_SUPABASE_URL in .env file. Error: %s", e)
+        return False
     except Exception as e:
-        import logging
-        error_msg = str(e)
-        # Check if it's a network/DNS error
-        if "getaddrinfo" in error_msg or "11001" in error_msg:
-            logging.error(f"Network error updating zone geometry for '{zone_id}': Cannot connect to database. Check your internet connection and Supabase configuration.")
-        else:
-            logging.error(f"Failed to update zone geometry for '{zone_id}': {e}")
+        logger.error("Failed to update zone geometry for '%s': %s", zone_id, e)
         return False
 
 
+def _remove_customer_from_zone(supabase, customer_id: str, zone_id: str) -> tuple[bool, int | None] | None:
+    """Drop a customer from the newest zone with this name.
+    
+    Uses the ``unassign_customer`` RPC so only the new count crosses the wire; without
+    it, reads the zone's metadata and writes back the shortened ``customer_ids`` list.
+    
+    Returns:
+        ``(removed, new_customer_count)``, or None if the zone does not exist
+    """
+    try:
+        response = supabase.rpc("unassign_customer", {"p_name": zone_id, "p_cid": customer_id}).execute()
+    except _TRANSIENT_ERRORS:
+        raise
+    except Exception as rpc_error:
+        logger.debug("unassign_customer RPC unavailable, updating via table API: %s", rpc_error)
+    else:
+        if not response.data:
+            return None
+        row = response.data[0]
+        return bool(row.get("removed")), row.get("customer_count")
+    
+    response = supabase.table("zones").select("id, metadata").eq("name", zone_id).order("created_at", desc=True).limit(1).execute()
+    if not response.data:
+        return None
+    
+    zone = response.data[0]
+    metadata = zone.get("metadata", {})
+    if not isinstance(metadata, dict):
+        metadata = {}
+    
+    customer_ids = metadata.get("customer_ids", [])
+    if not isinstance(customer_ids, list):
+        return False, None
+    try:
+        customer_ids.remove(customer_id)  # one scan for both the membership test and the removal
+    except ValueError:
+        return False, None
+    metadata["customer_ids"] = customer_ids
+    new_count = len(customer_ids)
+    supabase.table("zones").update({"metadata": metadata}).eq("id", zone["id"]).execute()
+    return True, new_count
+
+
 def unassign_customer_from_zone(customer_id: str, zone_id: str) -> bool:
     """Unassign a customer from a zone.
     
-    Removes the customer_id from the zone's metadata customer_ids list.
-    Updates customer_count accordingly.
+    Removes the customer_id from the zone's metadata customer_ids list; the
+    database recomputes customer_count from it.
     
     Args:
         customer_id: Customer ID to unassign
@@ -577,64 +942,105 @@ def unassign_customer_from_zone(customer_id: str, zone_id: str) -> bool:
     """
     supabase = get_supabase_client()
     if not supabase:
-        import logging
-        logging.warning("Database not configured - cannot unassign customer from zone")
+        logger.warning("Database not configured - cannot unassign customer from zone")
         return False
     
     try:
-        # Find the zone in the database
-        response = supabase.table("zones").select("*").eq("name", zone_id).order("created_at", desc=True).limit(1).execute()
-        
-        if not response.data or len(response.data) == 0:
-            import logging
-            logging.warning(f"Zone '{zone_id}' not found in database")
+        try:
+            result = _remove_customer_from_zone(supabase, customer_id, zone_id)
+        finally:
+            _forget_zone_customers([zone_id])
+        if result is None:
+            logger.warning("Zone '%s' not found in database", zone_id)
             return False
         
-        zone = response.data[0]
-        zone_db_id = zone["id"]
-        metadata = zone.get("metadata", {})
-        
-        if not isinstance(metadata, dict):
-            metadata = {}
-        
-        # Get current customer_ids list
-        customer_ids = metadata.get("customer_ids", [])
-        if not isinstance(customer_ids, list):
-            customer_ids = []
-        
-        # Remove customer_id if present
-        if customer_id in customer_ids:
-            customer_ids.remove(customer_id)
-            metadata["customer_ids"] = customer_ids
-            
-            # Update customer_count
-            new_count = len(customer_ids)
-            
-            # Update zone in database
-            supabase.table("zones").update({
-                "metadata": metadata,
-                "customer_count": new_count,
-            }).eq("id", zone_db_id).execute()
-            
-            import logging
-            logging.info(f"Unassigned customer '{customer_id}' from zone '{zone_id}'. New customer_count: {new_count}")
+        removed, new_count = result
+        if removed:
+            logger.info("Unassigned customer '%s' from zone '%s'. New customer_count: %s", customer_id, zone_id, new_count)
             return True
         else:
-            import logging
-            logging.warning(f"Customer '{customer_id}' not found in zone '{zone_id}' customer_ids")
+            logger.warning("Customer '%s' not found in zone '%s' customer_ids", customer_id, zone_id)
             return False
         
     except Exception as e:
-        import logging
-        logging.error(f"Failed to unassign customer '{customer_id}' from zone '{zone_id}': {e}")
+        logger.error("Failed to unassign customer '%s' from zone '%s': %s", customer_id, zone_id, e)
         return False
 
 
+def _move_customer_to_zone(supabase, customer_id: str, zone_id: str) -> tuple[bool, int | None] | None:
+    """Take a customer out of every other zone and add it to the newest zone with this name.
+    
+    Uses the ``assign_customer_to_zone`` RPC (one transaction, one round-trip). Without it,
+    finds the zones holding the customer with a JSONB containment filter instead of
+    scanning the whole table.
+    
+    Returns:
+        ``(added, new_customer_count)``, or None if the target zone does not exist
+    """
+    try:
+        response = supabase.rpc("assign_customer_to_zone", {"p_customer": customer_id, "p_zone": zone_id}).execute()
+    except _TRANSIENT_ERRORS:
+        raise
+    except Exception as rpc_error:
+        logger.debug("assign_customer_to_zone RPC unavailable, updating via table API: %s", rpc_error)
+    else:
+        if not response.data:
+            return None
+        row = response.data[0]
+        return bool(row.get("added")), row.get("customer_count")
+    
+    response = supabase.table("zones").select("id, name, metadata").eq("name", zone_id).order("created_at", desc=True).limit(1).execute()
+    if not response.data:
+        return None
+    target = response.data[0]
+    
+    # Rows to write back; name rides along because upsert proposes an INSERT first
+    updates: list[dict[str, Any]] = []
+    
+    # Remove the customer from any other zone it is assigned to
+    holders = (
+        supabase.table("zones")
+        .select("id, name, metadata")
+        .filter("metadata->customer_ids", "cs", json.dumps([customer_id]))
+        .neq("id", target["id"])
+        .execute()
+    )
+    for zone in holders.data or []:
+        zone_meta = zone.get("metadata", {})
+        if isinstance(zone_meta, dict):
+            zone_customer_ids = zone_meta.get("customer_ids", [])
+            if not isinstance(zone_customer_ids, list):
+                continue
+            try:
+                zone_customer_ids.remove(customer_id)
+            except ValueError:
+                continue
+            updates.append({"id": zone["id"], "name": zone["name"], "metadata": zone_meta})
+    
+    metadata = target.get("metadata", {})
+    if not isinstance(metadata, dict):
+        metadata = {}
+    customer_ids = metadata.get("customer_ids", [])
+    if not isinstance(customer_ids, list):
+        customer_ids = []
+    
+    added = customer_id not in customer_ids
+    if added:
+        customer_ids.append(customer_id)
+        metadata["customer_ids"] = customer_ids
+        updates.append({"id": target["id"], "name": target["name"], "metadata": metadata})
+    
+    # One request for the old zone(s) and the target instead of one UPDATE each
+    if updates:
+        supabase.table("zones").upsert(updates, on_conflict="id", returning=ReturnMethod.minimal).execute()
+    return added, len(customer_ids)
+
+
 def assign_customer_to_zone(customer_id: str, zone_id: str) -> bool:
     """Assign/transfer a customer to a zone.
     
-    Adds the customer_id to the zone's metadata customer_ids list.
-    Updates customer_count accordingly.
+    Adds the customer_id to the zone's metadata customer_ids list; the
+    database recomputes customer_count from it.
     
     Args:
         customer_id: Customer ID to assign
@@ -645,80 +1051,63 @@ def assign_customer_to_zone(customer_id: str, zone_id: str) -> bool:
     """
     supabase = get_supabase_client()
     if not supabase:
-        import logging
-        logging.warning("Database not configured - cannot assign customer to zone")
+        logger.warning("Database not configured - cannot assign customer to zone")
         return False
     
     try:
-        # First, remove customer from any other zone they might be assigned to
-        # Find all zones that contain this customer
-        all_zones_response = supabase.table("zones").select("id, name, metadata").execute()
-        
-        if all_zones_response.data:
-            for zone in all_zones_response.data:
-                zone_meta = zone.get("metadata", {})
-                if isinstance(zone_meta, dict):
-                    zone_customer_ids = zone_meta.get("customer_ids", [])
-                    if isinstance(zone_customer_ids, list) and customer_id in zone_customer_ids:
-                        # Remove from this zone
-                        zone_customer_ids.remove(customer_id)
-                        zone_meta["customer_ids"] = zone_customer_ids
-                        old_count = zone.get("customer_count", 0)
-                        new_count = max(0, old_count - 1)
-                        
-                        supabase.table("zones").update({
-                            "metadata": zone_meta,
-                            "customer_count": new_count,
-                        }).eq("id", zone["id"]).execute()
-        
-        # Now add customer to the target zone
-        response = supabase.table("zones").select("*").eq("name", zone_id).order("created_at", desc=True).limit(1).execute()
-        
-        if not response.data or len(response.data) == 0:
-            import logging
-            logging.warning(f"Zone '{zone_id}' not found in database")
+        try:
+            result = _move_customer_to_zone(supabase, customer_id, zone_id)
+        finally:
+            # The customer may have left any other zone
+            _forget_zone_customers()
+        if result is None:
+            logger.warning("Zone '%s' not found in database", zone_id)
             return False
         
-        zone = response.data[0]
-        zone_db_id = zone["id"]
-        metadata = zone.get("metadata", {})
-        
-        if not isinstance(metadata, dict):
-            metadata = {}
-        
-        # Get current customer_ids list
-        customer_ids = metadata.get("customer_ids", [])
-        if not isinstance(customer_ids, list):
-            customer_ids = []
-        
-        # Add customer_id if not already present
-        if customer_id not in customer_ids:
-            customer_ids.append(customer_id)
-            metadata["customer_ids"] = customer_ids
-            
-            # Update customer_count
-            new_count = len(customer_ids)
-            
-            # Update zone in database
-            supabase.table("zones").update({
-                "metadata": metadata,
-                "customer_count": new_count,
-            }).eq("id", zone_db_id).execute()
-            
-            import logging
-            logging.info(f"Assigned customer '{customer_id}' to zone '{zone_id}'. New customer_count: {new_count}")
-            return True
+        added, new_count = result
+        if added:
+            logger.info("Assigned customer '%s' to zone '%s'. New customer_count: %s", customer_id, zone_id, new_count)
         else:
-            import logging
-            logging.info(f"Customer '{customer_id}' already assigned to zone '{zone_id}'")
-            return True  # Already assigned, consider it success
+            logger.info("Customer '%s' already assigned to zone '%s'", customer_id, zone_id)
+        return True  # Already assigned also counts as success
         
     except Exception as e:
-        import logging
-        logging.error(f"Failed to assign customer '{customer_id}' to zone '{zone_id}': {e}")
+        logger.error("Failed to assign customer '%s' to zone '%s': %s", customer_id, zone_id, e)
         return False
 
 
+# Rows per request when scanning a whole table; Supabase caps unpaginated responses at 1000
+SCAN_PAGE_SIZE = 1000
+
+
+def _iter_table_pages(
+    supabase,
+    table: str,
+    columns: str,
+    apply_filters: Callable[[Any], Any] | None = None,
+    page_size: int = SCAN_PAGE_SIZE,
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield a table's rows page by page (ordered by id) so callers fold them incrementally.
+    
+    The first request also asks for the exact row count, which bounds the scan; pages
+    advance by the rows actually returned in case the server caps pages lower.
+    """
+    offset = 0
+    total: int | None = None
+    while total is None or offset < total:
+        query = supabase.table(table).select(columns, count=CountMethod.exact if total is None else None)
+        if apply_filters is not None:
+            query = apply_filters(query)
+        response = query.order("id").range(offset, offset + page_size - 1).execute()
+        rows = response.data or []
+        if total is None:
+            total = response.count if response.count is not None else len(rows)
+        if not rows:
+            return
+        yield rows
+        offset += len(rows)
+
+
 def get_unassigned_customers(city: str | None = None) -> list[str]:
     """Get list of customer IDs that are not assigned to any zone.
     
@@ -737,50 +1126,53 @@ def get_unassigned_customers(city: str | None = None) -> list[str]:
     if not supabase:
         return []
     
+    # Preferred path: the anti-join runs in Postgres and only unassigned IDs come back
+    try:
+        response = supabase.rpc("get_unassigned_customers", {"p_city": city}).execute()
+    except Exception as rpc_error:
+        logger.debug("get_unassigned_customers RPC unavailable, comparing client-side: %s", rpc_error)
+    else:
+        unassigned_ids = [row["customer_id"] for row in (response.data or []) if row.get("customer_id")]
+        logger.info("Found %d unassigned customers for city=%s", len(unassigned_ids), city or 'all')
+        return unassigned_ids
+    
     try:
-        import logging
-        
         # CRITICAL: Get ALL zones (not filtered by city) to find all assigned customers
         # A customer is "assigned" if they're in ANY zone, regardless of the zone's city
-        query = supabase.table("zones").select("metadata")
-        response = query.execute()
         assigned_customer_ids = set()
+        for page in _iter_table_pages(supabase, "zones", "customer_ids:metadata->customer_ids"):
+            for zone in page:
+                customer_ids = zone.get("customer_ids")
+                if not isinstance(customer_ids, list) or not customer_ids:
+                    continue
+                if isinstance(customer_ids[0], str):
+                    # IDs are written as strings; empty ones cannot match a customer anyway
+                    assigned_customer_ids.update(customer_ids)
+                else:
+                    # Convert all to strings for consistency
+                    assigned_customer_ids.update(str(cid) for cid in customer_ids if cid)
         
-        if response.data:
-            for zone in response.data:
-                metadata = zone.get("metadata", {})
-                if isinstance(metadata, dict):
-                    customer_ids = metadata.get("customer_ids", [])
-                    if isinstance(customer_ids, list):
-                        # Convert all to strings for consistency
-                        assigned_customer_ids.update(str(cid) for cid in customer_ids if cid)
-        
-        logging.info(f"Found {len(assigned_customer_ids)} assigned customers across all zones")
+        logger.info("Found %d assigned customers across all zones", len(assigned_customer_ids))
         
         # Get all customers from database for the city (if specified)
-        customer_query = supabase.table("customers").select("customer_id")
-        if city:
-            customer_query = customer_query.eq("city", city)
-        
-        customer_response = customer_query.execute()
+        city_filter = (lambda query: query.eq("city", city)) if city else None
         all_customer_ids = set()
-        if customer_response.data:
-            for record in customer_response.data:
+        for page in _iter_table_pages(supabase, "customers", "customer_id", city_filter):
+            for record in page:
                 customer_id = record.get("customer_id")
                 if customer_id:
                     all_customer_ids.add(str(customer_id))
         
-        logging.info(f"Found {len(all_customer_ids)} total customers for city={city or 'all'}")
+        logger.info("Found %d total customers for city=%s", len(all_customer_ids), city or 'all')
         
         # Filter to get unassigned customers
         unassigned_ids = list(all_customer_ids - assigned_customer_ids)
-        logging.info(f"Found {len(unassigned_ids)} unassigned customers for city={city or 'all'}")
+        logger.info("Found %d unassigned customers for city=%s", len(unassigned_ids), city or 'all')
         
         return unassigned_ids
         
     except Exception as e:
-        import logging
-        logging.error(f"Failed to get unassigned customers: {e}")
+        logger.error("Failed to get unassigned customers: %s", e)
         return []
 
 
@@ -811,16 +1203,79 @@ def get_customers_from_zones(zone_ids: list[str]) -> list[str]:
         
         return list(customer_ids)
     except Exception as e:
-        import logging
-        logging.warning(f"Failed to get customers from zones {zone_ids}: {e}")
+        logger.warning("Failed to get customers from zones %s: %s", zone_ids, e)
         return []
 
 
+def unassign_customers_from_zones(pairs: list[tuple[str, str]]) -> dict[str, int]:
+    """Unassign many customers from their zones at once.
+    
+    Every zone is updated once however many of its customers are removed. Uses the
+    ``unassign_customers`` RPC (one round-trip for the whole batch); without it, reads
+    the affected zones in one query and writes back each changed zone.
+    
+    Args:
+        pairs: ``(customer_id, zone_id)`` pairs to unassign
+        
+    Returns:
+        Mapping of zone_id to its new customer_count for every zone that was updated
+    """
+    supabase = get_supabase_client()
+    if not supabase:
+        logger.warning("Database not configured - cannot unassign customers from zones")
+        return {}
+    
+    if not pairs:
+        return {}
+    
+    _forget_zone_customers({zone_id for _, zone_id in pairs})
+    try:
+        response = supabase.rpc(
+            "unassign_customers",
+            {"pairs": [{"zone": zone_id, "customer": customer_id} for customer_id, zone_id in pairs]},
+        ).execute()
+        return {row["zone_name"]: row["customer_count"] for row in (response.data or [])}
+    except _TRANSIENT_ERRORS:
+        raise
+    except Exception as rpc_error:
+        logger.debug("unassign_customers RPC unavailable, updating via table API: %s", rpc_error)
+    
+    to_remove: dict[str, set[str]] = defaultdict(set)
+    for customer_id, zone_id in pairs:
+        to_remove[zone_id].add(customer_id)
+    
+    # Newest row per zone name, matching unassign_customer_from_zone
+    response = supabase.table("zones").select("id, name, metadata").in_("name", list(to_remove)).order("created_at", desc=True).execute()
+    new_counts: dict[str, int] = {}
+    seen_names: set[str] = set()
+    for zone in response.data or []:
+        zone_id = zone["name"]
+        if zone_id in seen_names:
+            continue
+        seen_names.add(zone_id)
+        
+        metadata = zone.get("metadata", {})
+        if not isinstance(metadata, dict):
+            continue
+        customer_ids = metadata.get("customer_ids", [])
+        if not isinstance(customer_ids, list):
+            continue
+        
+        removing = to_remove[zone_id]
+        remaining = [customer_id for customer_id in customer_ids if customer_id not in removing]
+        metadata["customer_ids"] = remaining
+        supabase.table("zones").update({"metadata": metadata}).eq("id", zone["id"]).execute()
+        new_counts[zone_id] = len(remaining)
+    return new_counts
+
+
 def unassign_all_customers_from_zones(zone_ids: list[str]) -> bool:
     """Unassign all customers from specified zones before deletion.
     
     This ensures customers are properly unassigned from zones before the zones
-    are deleted, preventing orphaned assignments.
+    are deleted, preventing orphaned assignments. Uses the ``clear_zone_customers``
+    RPC (one UPDATE for every zone); without it, reads the zones' customer lists and
+    removes them through ``unassign_customers_from_zones``.
     
     Args:
         zone_ids: List of zone IDs to unassign customers from
@@ -830,53 +1285,49 @@ def unassign_all_customers_from_zones(zone_ids: list[str]) -> bool:
     """
     supabase = get_supabase_client()
     if not supabase:
-        import logging
-        logging.warning("Database not configured - cannot unassign customers from zones")
+        logger.warning("Database not configured - cannot unassign customers from zones")
         return False
     
     if not zone_ids:
         return True  # Nothing to unassign
     
+    _forget_zone_customers(zone_ids)
     try:
-        # Get all zones that will be deleted
-        response = supabase.table("zones").select("id, name, metadata").in_("name", zone_ids).execute()
+        try:
+            response = supabase.rpc("clear_zone_customers", {"p_names": list(zone_ids)}).execute()
+        except _TRANSIENT_ERRORS:
+            raise
+        except Exception as rpc_error:
+            logger.debug("clear_zone_customers RPC unavailable, updating via table API: %s", rpc_error)
+        else:
+            cleared = response.data or []
+            logger.info(
+                "Unassigned %d customers from %d zones before deletion",
+                sum(row["previous_count"] for row in cleared),
+                len(cleared),
+            )
+            return True
+        
+        # Only the customer_ids list is needed, not the whole metadata blob
+        response = supabase.table("zones").select("name, customer_ids:metadata->customer_ids").in_("name", zone_ids).execute()
         
         if not response.data:
-            import logging
-            logging.info(f"No zones found to unassign customers from: {zone_ids}")
+            logger.info("No zones found to unassign customers from: %s", zone_ids)
             return True
         
-        unassigned_count = 0
+        pairs: dict[tuple[str, str], None] = {}
         for zone in response.data:
-            zone_db_id = zone["id"]
-            zone_id = zone["name"]
-            metadata = zone.get("metadata", {})
-            
-            if not isinstance(metadata, dict):
-                continue
-            
-            customer_ids = metadata.get("customer_ids", [])
-            if not isinstance(customer_ids, list) or not customer_ids:
-                continue
-            
-            # Clear customer_ids from metadata and set customer_count to 0
-            metadata["customer_ids"] = []
-            
-            # Update zone to remove all customer assignments
-            supabase.table("zones").update({
-                "metadata": metadata,
-                "customer_count": 0,
-            }).eq("id", zone_db_id).execute()
-            
-            unassigned_count += len(customer_ids)
+            customer_ids = zone.get("customer_ids")
+            if isinstance(customer_ids, list):
+                pairs.update(dict.fromkeys((customer_id, zone["name"]) for customer_id in customer_ids))
+        
+        unassign_customers_from_zones(list(pairs))
         
-        import logging
-        logging.info(f"Unassigned {unassigned_count} customers from {len(response.data)} zones before deletion")
+        logger.info("Unassigned %d customers from %d zones before deletion", len(pairs), len(response.data))
         return True
         
     except Exception as e:
-        import logging
-        logging.error(f"Failed to unassign customers from zones {zone_ids}: {e}")
+        logger.error("Failed to unassign customers from zones %s: %s", zone_ids, e)
         return False
 
 
@@ -900,19 +1351,17 @@ def verify_zones_deleted(zone_ids: list[str]) -> bool:
         
         if remaining_zones:
             remaining_ids = [z["name"] for z in remaining_zones]
-            import logging
-            logging.warning(f"⚠️ Zones still exist after deletion attempt: {remaining_ids}")
+            logger.warning("⚠️ Zones still exist after deletion attempt: %s", remaining_ids)
             return False
         
         return True
     except Exception as e:
-        import logging
-        logging.warning(f"Failed to verify zone deletion: {e}")
+        logger.warning("Failed to verify zone deletion: %s", e)
         # Assume deleted if we can't verify (better than blocking)
         return True
 
 
-def delete_zones(zone_ids: list[str], verify: bool = True) -> bool:
+def delete_zones(zone_ids: list[str], verify: bool = False) -> bool:
     """Delete zones from the database by their zone IDs.
     
     This function deletes ALL records with the specified zone IDs (names),
@@ -922,86 +1371,103 @@ def delete_zones(zone_ids: list[str], verify: bool = True) -> bool:
     
     Args:
         zone_ids: List of zone IDs (zone names) to delete
-        verify: If True, verify deletion completed successfully
+        verify: If True, re-read the zones afterwards as a diagnostic. The DELETE's own
+            row count is authoritative, so this is off by default.
         
     Returns:
         True if successful, False otherwise
     """
     supabase = get_supabase_client()
     if not supabase:
-        import logging
-        logging.warning("Database not configured - cannot delete zones")
+        logger.warning("Database not configured - cannot delete zones")
         return False
     
     if not zone_ids:
         return True  # Nothing to delete
     
+    _forget_zone_ids(zone_ids)
     try:
-        import logging
-        
-        # First, get ALL records with these zone IDs to ensure we delete everything
-        # This is important because there might be multiple records with the same zone_id
-        select_response = supabase.table("zones").select("id, name").in_("name", zone_ids).execute()
-        all_records = select_response.data if select_response.data else []
-        
-        if not all_records:
-            logging.info(f"No zones found to delete: {zone_ids}")
+        # One statement removes every record with these names, duplicates included. Only the
+        # row count comes back - returning the rows would ship their geometries over the wire.
+        response = (
+            supabase.table("zones")
+            .delete(count=CountMethod.exact, returning=ReturnMethod.minimal)
+            .in_("name", zone_ids)
+            .execute()
+        )
+        deleted_count = response.count or 0
+        
+        if not deleted_count:
+            logger.info("No zones found to delete: %s", zone_ids)
             return True
         
-        records_before = len(all_records)
-        record_ids_to_delete = [record["id"] for record in all_records]
-        zone_names_found = set(record["name"] for record in all_records)
-        
-        logging.info(f"Found {records_before} zone record(s) to delete with IDs: {list(zone_names_found)}")
-        logging.info(f"Deleting {len(record_ids_to_delete)} database record(s)...")
+        logger.info("Deleted %s zone record(s) for zone IDs: %s", deleted_count, zone_ids)
         
-        # Delete by database IDs to ensure we delete ALL records, even duplicates
-        # Delete in batches if there are many records
-        deleted_count = 0
-        batch_size = 100
-        for i in range(0, len(record_ids_to_delete), batch_size):
-            batch = record_ids_to_delete[i:i + batch_size]
-            try:
-                response = supabase.table("zones").delete().in_("id", batch).execute()
-                batch_deleted = len(response.data) if response.data else 0
-                deleted_count += batch_deleted
-                logging.info(f"Deleted batch {i//batch_size + 1}: {batch_deleted} record(s)")
-            except Exception as batch_error:
-                logging.error(f"Error deleting batch {i//batch_size + 1}: {batch_error}")
-                # Continue with next batch
-        
-        logging.info(f"Deleted {deleted_count} out of {records_before} zone record(s)")
-        
-        if deleted_count != records_before:
-            logging.warning(f"⚠️ Deleted {deleted_count} records but expected {records_before}")
-        
-        # Verify deletion if requested
-        if verify:
-            # Wait a moment for database to commit
-            import time
-            time.sleep(0.2)  # Slightly longer delay to ensure database commit
-            
-            if not verify_zones_deleted(zone_ids):
-                logging.error(f"❌ Verification failed: Some zones still exist after deletion: {zone_ids}")
-                # Try one more verification after a longer delay
-                time.sleep(0.5)
-                if not verify_zones_deleted(zone_ids):
-                    return False
+        # The delete ran as one autocommit statement; re-reading it is only a diagnostic
+        if verify and not verify_zones_deleted(zone_ids):
+            logger.error("❌ Verification failed: Some zones still exist after deletion: %s", zone_ids)
+            return False
         
-        logging.info(f"✅ Successfully deleted and verified removal of zones: {list(zone_names_found)}")
+        logger.info("✅ Successfully deleted zones: %s", zone_ids)
         return True
         
     except Exception as e:
-        import logging
-        logging.error(f"Failed to delete zones {zone_ids} from database: {e}")
+        logger.error("Failed to delete zones %s from database: %s", zone_ids, e)
         return False
 
 
+def delete_zones_with_customers(zone_ids: list[str]) -> list[str] | None:
+    """Delete zones and return the customers they held.
+    
+    Uses the ``delete_zones_with_customers`` RPC, which deletes every record with these
+    names and returns their customer lists in one transaction. Without it, falls back to
+    ``get_customers_from_zones``, ``unassign_all_customers_from_zones`` and ``delete_zones``.
+    
+    Args:
+        zone_ids: List of zone IDs (zone names) to delete
+        
+    Returns:
+        Customer IDs that were assigned to the deleted zones, or None if the delete failed
+    """
+    supabase = get_supabase_client()
+    if not supabase:
+        logger.warning("Database not configured - cannot delete zones")
+        return None
+    
+    if not zone_ids:
+        return []
+    
+    _forget_zone_ids(zone_ids)
+    try:
+        response = supabase.rpc("delete_zones_with_customers", {"p_names": list(zone_ids)}).execute()
+    except _TRANSIENT_ERRORS as e:
+        logger.error("Failed to delete zones %s from database: %s", zone_ids, e)
+        return None
+    except Exception as rpc_error:
+        logger.debug("delete_zones_with_customers RPC unavailable, using separate requests: %s", rpc_error)
+    else:
+        rows = response.data or []
+        customer_ids: dict[str, None] = {}
+        for row in rows:
+            customer_ids.update(dict.fromkeys(row.get("prev_customer_ids") or []))
+        logger.info("Deleted %d zone record(s) holding %d customers: %s", len(rows), len(customer_ids), zone_ids)
+        return list(customer_ids)
+    
+    customer_ids = get_customers_from_zones(zone_ids)
+    if not unassign_all_customers_from_zones(zone_ids):
+        logger.warning("⚠️ Failed to unassign some customers from zones, continuing with deletion anyway")
+    if not delete_zones(zone_ids):
+        return None
+    return customer_ids
+
+
 def get_customers_for_zone(zone_id: str) -> tuple[Customer, ...]:
     """Get customers assigned to a zone from the database.
     
     This function looks up the zone in the database, retrieves the customer_ids
     stored in the zone's metadata, and then loads those customers from the database.
+    Results are cached for ``_ZONE_CUSTOMERS_TTL_SECONDS``; assigning or unassigning
+    customers and replacing or deleting zones in this process drop them right away.
     
     Args:
         zone_id: The zone ID to get customers for
@@ -1011,17 +1477,20 @@ def get_customers_for_zone(zone_id: str) -> tuple[Customer, ...]:
     """
     supabase = get_supabase_client()
     if not supabase:
-        import logging
-        logging.warning("Database not configured - cannot fetch customers for zone")
+        logger.warning("Database not configured - cannot fetch customers for zone")
         return tuple()
     
+    now = time.monotonic()
+    cached = _zone_customers_cache.get(zone_id)
+    if cached is not None and now - cached[0] < _ZONE_CUSTOMERS_TTL_SECONDS:
+        return cached[1]
+    
     try:
-        # Find the zone in the database
-        response = supabase.table("zones").select("*").eq("name", zone_id).order("created_at", desc=True).limit(1).execute()
+        # Find the zone in the database (only its metadata is needed)
+        response = supabase.table("zones").select("metadata").eq("name", zone_id).order("created_at", desc=True).limit(1).execute()
         
         if not response.data or len(response.data) == 0:
-            import logging
-            logging.warning(f"Zone '{zone_id}' not found in database")
+            logger.warning("Zone '%s' not found in database", zone_id)
             return tuple()
         
         zone = response.data[0]
@@ -1033,20 +1502,194 @@ def get_customers_for_zone(zone_id: str) -> tuple[Customer, ...]:
             customer_ids = metadata.get("customer_ids")
         
         if not customer_ids or not isinstance(customer_ids, list):
-            import logging
-            logging.warning(f"Zone '{zone_id}' has no customer_ids stored in metadata")
+            logger.warning("Zone '%s' has no customer_ids stored in metadata", zone_id)
             return tuple()
         
         # Load customers from database by IDs
         from ..data.customers_repository import get_customers_by_ids
-        return get_customers_by_ids(customer_ids)
+        customers = get_customers_by_ids(customer_ids)
+        if customers:
+            _zone_customers_cache.pop(zone_id, None)
+            if len(_zone_customers_cache) >= _ZONE_CUSTOMERS_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                del _zone_customers_cache[next(iter(_zone_customers_cache))]
+            _zone_customers_cache[zone_id] = (now, customers)
+        return customers
         
     except Exception as e:
-        import logging
-        logging.warning(f"Failed to retrieve customers for zone {zone_id} from database: {e}")
+        logger.warning("Failed to retrieve customers for zone %s from database: %s", zone_id, e)
         return tuple()
 
 
+def _resolve_and_touch_route_zone(
+    supabase,
+    zone_id: str,
+    city: str,
+    start_from_depot: bool | None,
+) -> tuple[str, str] | None:
+    """Find the zone routes are saved under and record ``start_from_depot`` on it.
+    
+    Looks the zone up by name, then by city and a name substring. Uses the
+    ``resolve_and_touch_zone`` RPC (one round-trip for the lookups and the metadata
+    write); without it, runs them one by one.
+    
+    Args:
+        supabase: Supabase client
+        zone_id: Zone ID (zone name) the routes belong to
+        city: City used by the fallback lookup
+        start_from_depot: Value to store in the zone metadata, or None to leave it alone
+        
+    Returns:
+        ``(zone_uuid, zone_name)``, or None if no zone matches
+    """
+    try:
+        response = supabase.rpc(
+            "resolve_and_touch_zone",
+            {"p_zone_name": zone_id, "p_city": city, "p_start_from_depot": start_from_depot},
+        ).execute()
+    except _TRANSIENT_ERRORS:
+        raise
+    except Exception as rpc_error:
+        logger.debug("resolve_and_touch_zone RPC unavailable, using separate requests: %s", rpc_error)
+    else:
+        if not response.data:
+            return None
+        row = response.data[0]
+        return row["zone_id"], row["zone_name"]
+    
+    zone_uuid = _resolve_zone_uuid(supabase, zone_id)
+    found_zone_name = zone_id
+    
+    if zone_uuid is None:
+        # Try to find zone by city as fallback
+        logger.warning("Zone '%s' not found in database. Searching by city '%s'...", zone_id, city)
+        zone_response = supabase.table("zones").select("id, name").eq("metadata->>city", city).ilike("name", f"%{zone_id}%").order("created_at", desc=True).limit(1).execute()
+        if not zone_response.data:
+            return None
+        zone_uuid = zone_response.data[0]["id"]
+        found_zone_name = zone_response.data[0].get("name", zone_id)
+    
+    if start_from_depot is not None:
+        try:
+            # Get current zone metadata
+            zone_meta_response = supabase.table("zones").select("metadata").eq("id", zone_uuid).limit(1).execute()
+            zone_metadata = {}
+            if zone_meta_response.data and isinstance(zone_meta_response.data[0].get("metadata"), dict):
+                zone_metadata = zone_meta_response.data[0]["metadata"]
+            
+            zone_metadata["start_from_depot"] = start_from_depot
+            logger.info("Saving start_from_depot=%s to zone '%s' metadata", start_from_depot, zone_id)
+            supabase.table("zones").update({"metadata": zone_metadata}, returning=ReturnMethod.minimal).eq("id", zone_uuid).execute()
+        except Exception as meta_error:
+            logger.warning("Failed to save start_from_depot to zone metadata: %s", meta_error)
+            # Continue anyway - routes will still be saved
+    
+    return zone_uuid, found_zone_name
+
+
+def _upsert_zone_routes(supabase, zone_uuid: str, routes: list[dict[str, Any]]) -> bool:
+    """Replace a zone's routes with an upsert on ``(zone_id, vehicle_id)``.
+    
+    Vehicles that are no longer planned are deleted afterwards, so the whole replacement
+    takes two requests however many routes there are.
+    
+    Returns:
+        True if the routes were upserted, False if the ``routes_zone_vehicle_uniq`` index is
+        missing and the caller should delete and re-insert instead
+    """
+    # An upsert keeps the existing row's created_at; stamp it so newest-first listings
+    # show a re-saved plan at the time it was saved
+    saved_at = datetime.now(timezone.utc).isoformat()
+    try:
+        supabase.table("routes").upsert(
+            [{**route, "created_at": saved_at} for route in routes],
+            on_conflict="zone_id,vehicle_id",
+            returning=ReturnMethod.minimal,
+        ).execute()
+    except _TRANSIENT_ERRORS:
+        raise
+    except Exception as upsert_error:
+        logger.debug("Route upsert unavailable, replacing routes with delete + insert: %s", upsert_error)
+        return False
+    
+    vehicle_ids = [route["vehicle_id"] for route in routes]
+    try:
+        (
+            supabase.table("routes")
+            .delete(returning=ReturnMethod.minimal)
+            .eq("zone_id", zone_uuid)
+            .not_.in_("vehicle_id", vehicle_ids)
+            .execute()
+        )
+    except Exception as delete_error:
+        logger.warning("Failed to delete stale routes for zone %s: %s", zone_uuid, delete_error)
+    return True
+
+
+def _replace_zone_routes(supabase, zone_uuid: str, zone_id: str, routes_to_insert: list[dict[str, Any]]) -> tuple[int, int]:
+    """Delete a zone's routes, then insert the new ones (batch first, then one by one).
+    
+    Returns:
+        ``(inserted_count, failed_count)``
+    """
+    # Delete existing routes for this zone to avoid duplicates - one statement, however many
+    try:
+        response = (
+            supabase.table("routes")
+            .delete(count=CountMethod.exact, returning=ReturnMethod.minimal)
+            .eq("zone_id", zone_uuid)
+            .execute()
+        )
+        if response.count:
+            logger.info("Deleted %s existing routes for zone '%s'", response.count, zone_id)
+    except Exception as delete_error:
+        logger.warning("Failed to delete existing routes (continuing anyway): %s", delete_error)
+    
+    inserted_count = 0
+    failed_count = 0
+    
+    # Insert new routes - try batch insert first, fall back to individual inserts
+    try:
+        # Try batch insert (more efficient)
+        logger.info("Attempting batch insert of %d routes into 'routes' table...", len(routes_to_insert))
+        response = supabase.table("routes").insert(routes_to_insert).execute()
+        
+        if response.data:
+            inserted_count = len(response.data)
+            logger.info("✓ Successfully inserted %s routes in batch to 'routes' table", inserted_count)
+            # Verify the insert by checking the response
+            if inserted_count != len(routes_to_insert):
+                logger.warning("Warning: Expected %d routes, but only %s were inserted", len(routes_to_insert), inserted_count)
+        else:
+            # Fall back to individual inserts
+            logger.warning("Batch insert returned no data, falling back to individual inserts")
+            raise ValueError("Batch insert returned no data")
+    except Exception as batch_error:
+        logger.warning("Batch insert failed, trying individual inserts: %s", batch_error)
+        logger.debug("Batch insert error traceback", exc_info=True)
+        
+        # Fall back to individual inserts
+        for route_data in routes_to_insert:
+            try:
+                logger.debug("Inserting route %s individually...", route_data.get("vehicle_id"))
+                response = supabase.table("routes").insert(route_data).execute()
+                if response.data and len(response.data) > 0:
+                    inserted_count += 1
+                    logger.info("✓ Inserted route %s to 'routes' table", route_data.get("vehicle_id"))
+                else:
+                    failed_count += 1
+                    logger.error("✗ Insert returned no data for route %s", route_data.get('vehicle_id'))
+                    logger.error("  Route data keys: %s", list(route_data.keys()))
+                    logger.error("  Stops count: %d", len(route_data.get('stops', [])))
+            except Exception as e:
+                failed_count += 1
+                logger.error("✗ Failed to insert route %s to 'routes' table: %s", route_data.get('vehicle_id'), e)
+                import traceback
+                logger.error("  Full error traceback: %s", traceback.format_exc())
+                logger.error("  Route data sample: zone_id=%s, vehicle_id=%s, stops_count=%d", route_data.get('zone_id'), route_data.get('vehicle_id'), len(route_data.get('stops', [])))
+    return inserted_count, failed_count
+
+
 def save_routes_to_database(
     routes_response: dict[str, Any],
     zone_id: str,
@@ -1059,95 +1702,67 @@ def save_routes_to_database(
         zone_id: Zone ID (zone name) that these routes belong to
         city: City name for the routes
     """
-    import logging
-    
     supabase = get_supabase_client()
     if not supabase:
-        logging.warning("Supabase not configured - routes will only be saved to files")
+        logger.warning("Supabase not configured - routes will only be saved to files")
         return
     
     try:
         from datetime import date
         
-        logging.info(f"Starting to save routes to database for zone '{zone_id}' in city '{city}'")
+        logger.info("Starting to save routes to database for zone '%s' in city '%s'", zone_id, city)
         
-        # First, find the zone UUID in the database
-        zone_response = supabase.table("zones").select("id, name").eq("name", zone_id).order("created_at", desc=True).limit(1).execute()
+        # Extract start_from_depot from routes_response metadata; it is saved to the zone
+        # metadata for later retrieval
+        start_from_depot = None
+        routes_metadata = routes_response.get("metadata", {})
+        if isinstance(routes_metadata, dict) and "start_from_depot" in routes_metadata:
+            start_from_depot = bool(routes_metadata.get("start_from_depot", True))
         
-        if not zone_response.data or len(zone_response.data) == 0:
-            # Try to find zone by city as fallback
-            logging.warning(f"Zone '{zone_id}' not found in database. Searching by city '{city}'...")
-            zone_response = supabase.table("zones").select("id, name").eq("city", city).ilike("name", f"%{zone_id}%").order("created_at", desc=True).limit(1).execute()
-            
-            if not zone_response.data or len(zone_response.data) == 0:
-                logging.error(f"Zone '{zone_id}' not found in database for city '{city}'. Cannot save routes.")
-                logging.error("Available zones in database (first 10):")
-                try:
-                    all_zones = supabase.table("zones").select("name, city").limit(10).execute()
-                    if all_zones.data:
-                        for zone in all_zones.data:
-                            logging.error(f"  - {zone.get('name')} (city: {zone.get('city')})")
-                except Exception as e:
-                    logging.error(f"Could not list zones: {e}")
-                return
-        
-        zone_uuid = zone_response.data[0]["id"]
-        found_zone_name = zone_response.data[0].get("name", zone_id)
-        logging.info(f"Found zone '{found_zone_name}' with UUID: {zone_uuid}")
+        resolved = _resolve_and_touch_route_zone(supabase, zone_id, city, start_from_depot)
+        if resolved is None:
+            logger.error("Zone '%s' not found in database for city '%s'. Cannot save routes.", zone_id, city)
+            logger.error("Available zones in database (first 10):")
+            try:
+                all_zones = supabase.table("zones").select("name, city:metadata->>city").limit(10).execute()
+                if all_zones.data:
+                    for zone in all_zones.data:
+                        logger.error("  - %s (city: %s)", zone.get('name'), zone.get('city'))
+            except Exception as e:
+                logger.error("Could not list zones: %s", e)
+            return
         
-        # Save start_from_depot to zone metadata for later retrieval
-        try:
-            # Get current zone metadata
-            zone_meta_response = supabase.table("zones").select("metadata").eq("id", zone_uuid).limit(1).execute()
-            zone_metadata = {}
-            if zone_meta_response.data and zone_meta_response.data[0].get("metadata"):
-                zone_metadata = zone_meta_response.data[0]["metadata"]
-                if not isinstance(zone_metadata, dict):
-                    zone_metadata = {}
-            
-            # Extract start_from_depot from routes_response metadata
-            routes_metadata = routes_response.get("metadata", {})
-            if isinstance(routes_metadata, dict) and "start_from_depot" in routes_metadata:
-                start_from_depot = routes_metadata.get("start_from_depot", True)
-                zone_metadata["start_from_depot"] = bool(start_from_depot)
-                logging.info(f"Saving start_from_depot={start_from_depot} to zone '{zone_id}' metadata")
-                
-                # Update zone metadata
-                supabase.table("zones").update({
-                    "metadata": zone_metadata
-                }).eq("id", zone_uuid).execute()
-                logging.info(f"✓ Successfully updated zone metadata with start_from_depot")
-        except Exception as meta_error:
-            logging.warning(f"Failed to save start_from_depot to zone metadata: {meta_error}")
-            # Continue anyway - routes will still be saved
+        zone_uuid, found_zone_name = resolved
+        logger.info("Found zone '%s' with UUID: %s", found_zone_name, zone_uuid)
         
         # Get route plans from response
         plans = routes_response.get("plans", [])
         if not plans:
-            logging.warning(f"No routes to save for zone '{zone_id}' (plans list is empty)")
+            logger.warning("No routes to save for zone '%s' (plans list is empty)", zone_id)
             return
         
-        logging.info(f"Preparing {len(plans)} routes for database insertion")
+        logger.info("Preparing %d routes for database insertion", len(plans))
         
         # Prepare routes for database insertion
         routes_to_insert = []
         for plan_idx, plan in enumerate(plans):
             try:
-                # Convert stops to JSONB format
-                stops_json = []
                 stops = plan.get("stops", [])
                 
                 if not stops:
-                    logging.warning(f"Route {plan.get('route_id', f'Route_{plan_idx}')} has no stops, skipping")
+                    logger.warning("Route %s has no stops, skipping", plan.get("route_id", f"Route_{plan_idx}"))
                     continue
                 
-                for stop in stops:
-                    stops_json.append({
+                # Convert stops to JSONB format
+                stops_json = [
+                    {
                         "customer_id": stop.get("customer_id"),
                         "sequence": stop.get("sequence"),
                         "arrival_min": stop.get("arrival_min"),
                         "distance_from_prev_km": stop.get("distance_from_prev_km"),
-                    })
+                    }
+                    for stop in stops
+                ]
                 
                 # Parse route_date from day (e.g., "MON", "TUE") or use today's date
                 route_date = date.today()
@@ -1168,98 +1783,67 @@ def save_routes_to_database(
                 }
                 
                 routes_to_insert.append(route_data)
-                logging.debug(f"Prepared route {route_id} (day: {day}, {len(stops_json)} stops)")
+                logger.debug("Prepared route %s (day: %s, %d stops)", route_id, day, len(stops_json))
                 
             except Exception as e:
-                logging.error(f"Error preparing route {plan.get('route_id', f'Route_{plan_idx}')}: {e}")
+                logger.error("Error preparing route %s: %s", plan.get("route_id", f"Route_{plan_idx}"), e)
                 continue
         
         if not routes_to_insert:
-            logging.error("No valid routes prepared for insertion. Check route data format.")
+            logger.error("No valid routes prepared for insertion. Check route data format.")
             return
         
-        logging.info(f"Attempting to save {len(routes_to_insert)} routes to database for zone '{zone_id}'")
+        # One row per vehicle: a repeated route ID would make the upsert hit the same row twice
+        routes_to_insert = list({route["vehicle_id"]: route for route in routes_to_insert}.values())
+        logger.info("Attempting to save %d routes to database for zone '%s'", len(routes_to_insert), zone_id)
         
-        # Delete existing routes for this zone to avoid duplicates
-        try:
-            existing_routes = supabase.table("routes").select("id").eq("zone_id", zone_uuid).execute()
-            if existing_routes.data:
-                existing_ids = [r["id"] for r in existing_routes.data]
-                if existing_ids:
-                    logging.info(f"Deleting {len(existing_ids)} existing routes for zone '{zone_id}'")
-                    # Delete in batches
-                    batch_size = 100
-                    for i in range(0, len(existing_ids), batch_size):
-                        batch = existing_ids[i:i + batch_size]
-                        supabase.table("routes").delete().in_("id", batch).execute()
-                    logging.info(f"Successfully deleted {len(existing_ids)} existing routes")
-        except Exception as delete_error:
-            logging.warning(f"Failed to delete existing routes (continuing anyway): {delete_error}")
-        
-        # Insert new routes - try batch insert first, fall back to individual inserts
-        inserted_count = 0
-        failed_count = 0
-        
-        try:
-            # Try batch insert (more efficient)
-            logging.info(f"Attempting batch insert of {len(routes_to_insert)} routes into 'routes' table...")
-            response = supabase.table("routes").insert(routes_to_insert).execute()
-            
-            if response.data:
-                inserted_count = len(response.data)
-                logging.info(f"✓ Successfully inserted {inserted_count} routes in batch to 'routes' table")
-                # Verify the insert by checking the response
-                if inserted_count != len(routes_to_insert):
-                    logging.warning(f"Warning: Expected {len(routes_to_insert)} routes, but only {inserted_count} were inserted")
-            else:
-                # Fall back to individual inserts
-                logging.warning("Batch insert returned no data, falling back to individual inserts")
-                raise ValueError("Batch insert returned no data")
-        except Exception as batch_error:
-            logging.warning(f"Batch insert failed, trying individual inserts: {batch_error}")
-            import traceback
-            logging.debug(f"Batch insert error traceback: {traceback.format_exc()}")
-            
-            # Fall back to individual inserts
-            for route_data in routes_to_insert:
-                try:
-                    logging.debug(f"Inserting route {route_data.get('vehicle_id')} individually...")
-                    response = supabase.table("routes").insert(route_data).execute()
-                    if response.data and len(response.data) > 0:
-                        inserted_count += 1
-                        logging.info(f"✓ Inserted route {route_data.get('vehicle_id')} to 'routes' table")
-                    else:
-                        failed_count += 1
-                        logging.error(f"✗ Insert returned no data for route {route_data.get('vehicle_id')}")
-                        logging.error(f"  Route data keys: {list(route_data.keys())}")
-                        logging.error(f"  Stops count: {len(route_data.get('stops', []))}")
-                except Exception as e:
-                    failed_count += 1
-                    logging.error(f"✗ Failed to insert route {route_data.get('vehicle_id')} to 'routes' table: {e}")
-                    import traceback
-                    logging.error(f"  Full error traceback: {traceback.format_exc()}")
-                    logging.error(f"  Route data sample: zone_id={route_data.get('zone_id')}, vehicle_id={route_data.get('vehicle_id')}, stops_count={len(route_data.get('stops', []))}")
+        if _upsert_zone_routes(supabase, zone_uuid, routes_to_insert):
+            inserted_count, failed_count = len(routes_to_insert), 0
+            logger.info("✓ Successfully upserted %s routes to 'routes' table", inserted_count)
+        else:
+            inserted_count, failed_count = _replace_zone_routes(supabase, zone_uuid, zone_id, routes_to_insert)
         
         # Final summary
         if inserted_count > 0:
-            logging.info(f"✓ Successfully saved {inserted_count} out of {len(routes_to_insert)} routes to database for zone '{zone_id}'")
+            logger.info("✓ Successfully saved %s out of %d routes to database for zone '%s'", inserted_count, len(routes_to_insert), zone_id)
         if failed_count > 0:
-            logging.error(f"❌ Failed to insert {failed_count} out of {len(routes_to_insert)} routes. Check database configuration and schema.")
+            logger.error("❌ Failed to insert %s out of %d routes. Check database configuration and schema.", failed_count, len(routes_to_insert))
         if inserted_count == 0 and failed_count == 0:
-            logging.error(f"❌ CRITICAL: No routes were inserted despite having {len(routes_to_insert)} routes to save!")
+            logger.error("❌ CRITICAL: No routes were inserted despite having %d routes to save!", len(routes_to_insert))
                     
     except Exception as e:
-        import logging
         import traceback
-        logging.error(f"CRITICAL ERROR: Failed to save routes to database: {e}")
-        logging.error(f"Full traceback: {traceback.format_exc()}")
+        logger.error("CRITICAL ERROR: Failed to save routes to database: %s", e)
+        logger.error("Full traceback: %s", traceback.format_exc())
         # Don't re-raise - let the caller decide, but log the error clearly
         # This ensures we can see what went wrong in the logs
+    finally:
+        clear_routes_cache(zone_id)
+
+
+def _split_customer_stops(stops: list[dict[str, Any]], customer_id: str) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
+    """Separate a customer's stops from the rest of a route in one pass.
+    
+    Returns:
+        The remaining stops in their original order, and the customer's first stop
+        (None if the customer is not on the route)
+    """
+    remaining = []
+    customer_stop = None
+    for stop in stops:
+        if stop.get("customer_id") != customer_id:
+            remaining.append(stop)
+        elif customer_stop is None:
+            customer_stop = stop
+    return remaining, customer_stop
 
 
 def remove_customer_from_route(zone_id: str, route_id: str, customer_id: str) -> bool:
     """Remove a customer from a route.
     
+    Uses the ``remove_customer_from_route`` RPC (one statement, the stops never leave the
+    database); without it, reads the route, filters its stops and writes them back.
+    
     Args:
         zone_id: Zone ID (zone name)
         route_id: Route ID (vehicle_id)
@@ -1270,25 +1854,35 @@ def remove_customer_from_route(zone_id: str, route_id: str, customer_id: str) ->
     """
     supabase = get_supabase_client()
     if not supabase:
-        import logging
-        logging.warning("Supabase not configured - cannot remove customer from route")
+        logger.warning("Supabase not configured - cannot remove customer from route")
         return False
     
     try:
-        import logging
+        try:
+            response = supabase.rpc(
+                "remove_customer_from_route",
+                {"p_zone_name": zone_id, "p_vehicle_id": route_id, "p_customer_id": customer_id},
+            ).execute()
+        except _TRANSIENT_ERRORS:
+            raise
+        except Exception as rpc_error:
+            logger.debug("remove_customer_from_route RPC unavailable, updating via table API: %s", rpc_error)
+        else:
+            removed = bool(response.data)
+            if removed:
+                logger.info("Removed customer %s from route %s", customer_id, route_id)
+            return removed
         
         # Find the zone UUID
-        zone_response = supabase.table("zones").select("id").eq("name", zone_id).order("created_at", desc=True).limit(1).execute()
-        if not zone_response.data:
-            logging.warning(f"Zone '{zone_id}' not found")
+        zone_uuid = _resolve_zone_uuid(supabase, zone_id)
+        if zone_uuid is None:
+            logger.warning("Zone '%s' not found", zone_id)
             return False
         
-        zone_uuid = zone_response.data[0]["id"]
-        
         # Find the route
         route_response = supabase.table("routes").select("id, stops").eq("zone_id", zone_uuid).eq("vehicle_id", route_id).limit(1).execute()
         if not route_response.data:
-            logging.warning(f"Route '{route_id}' not found for zone '{zone_id}'")
+            logger.warning("Route '%s' not found for zone '%s'", route_id, zone_id)
             return False
         
         route = route_response.data[0]
@@ -1296,31 +1890,34 @@ def remove_customer_from_route(zone_id: str, route_id: str, customer_id: str) ->
         stops = route.get("stops", [])
         
         # Find and remove the customer
-        original_count = len(stops)
-        stops = [stop for stop in stops if stop.get("customer_id") != customer_id]
+        stops, customer_stop = _split_customer_stops(stops, customer_id)
         
-        if len(stops) == original_count:
+        if customer_stop is None:
             # Customer not found in route
             return False
         
-        # Update the route with new stops
-        supabase.table("routes").update({"stops": stops}).eq("id", route_uuid).execute()
+        # Update the route with new stops (writing the same stops twice is harmless)
+        _execute_with_retry(supabase.table("routes").update({"stops": stops}).eq("id", route_uuid))
         
         # Recalculate total distance and duration (simplified - in production, you'd want to recalculate from OSRM)
         # For now, we'll just update the stops
         
-        logging.info(f"Removed customer {customer_id} from route {route_id}")
+        logger.info("Removed customer %s from route %s", customer_id, route_id)
         return True
         
     except Exception as e:
-        import logging
-        logging.error(f"Failed to remove customer from route: {e}")
+        logger.error("Failed to remove customer from route: %s", e)
         return False
+    finally:
+        clear_routes_cache(zone_id)
 
 
 def update_route_customer(zone_id: str, from_route_id: str, to_route_id: str, customer_id: str) -> bool:
     """Transfer a customer from one route to another.
     
+    Uses the ``transfer_customer`` RPC, which updates both routes in one transaction;
+    without it, reads both routes and writes each back.
+    
     Args:
         zone_id: Zone ID (zone name)
         from_route_id: Source route ID (vehicle_id)
@@ -1332,81 +1929,177 @@ def update_route_customer(zone_id: str, from_route_id: str, to_route_id: str, cu
     """
     supabase = get_supabase_client()
     if not supabase:
-        import logging
-        logging.warning("Supabase not configured - cannot transfer customer")
+        logger.warning("Supabase not configured - cannot transfer customer")
         return False
     
     try:
-        import logging
+        try:
+            response = supabase.rpc(
+                "transfer_customer",
+                {
+                    "p_zone_name": zone_id,
+                    "p_from_vehicle_id": from_route_id,
+                    "p_to_vehicle_id": to_route_id,
+                    "p_customer_id": customer_id,
+                },
+            ).execute()
+        except _TRANSIENT_ERRORS:
+            raise
+        except Exception as rpc_error:
+            logger.debug("transfer_customer RPC unavailable, updating via table API: %s", rpc_error)
+        else:
+            if not response.data:
+                logger.warning("Could not transfer customer %s from %s to %s", customer_id, from_route_id, to_route_id)
+                return False
+            logger.info("Transferred customer %s from %s to %s", customer_id, from_route_id, to_route_id)
+            return True
         
         # Find the zone UUID
-        zone_response = supabase.table("zones").select("id").eq("name", zone_id).order("created_at", desc=True).limit(1).execute()
-        if not zone_response.data:
-            logging.warning(f"Zone '{zone_id}' not found")
+        zone_uuid = _resolve_zone_uuid(supabase, zone_id)
+        if zone_uuid is None:
+            logger.warning("Zone '%s' not found", zone_id)
             return False
         
-        zone_uuid = zone_response.data[0]["id"]
-        
         # Find both routes
-        routes_response = supabase.table("routes").select("id, vehicle_id, stops").eq("zone_id", zone_uuid).in_("vehicle_id", [from_route_id, to_route_id]).execute()
+        # route_date is NOT NULL, so the combined upsert below has to carry it
+        routes_response = supabase.table("routes").select("id, vehicle_id, route_date, stops").eq("zone_id", zone_uuid).in_("vehicle_id", [from_route_id, to_route_id]).execute()
         
-        if not routes_response.data or len(routes_response.data) < 2:
-            logging.warning(f"One or both routes not found: {from_route_id}, {to_route_id}")
-            return False
-        
-        from_route = None
-        to_route = None
-        for route in routes_response.data:
-            if route["vehicle_id"] == from_route_id:
-                from_route = route
-            elif route["vehicle_id"] == to_route_id:
-                to_route = route
+        routes_by_vehicle = {route["vehicle_id"]: route for route in routes_response.data or []}
+        from_route = routes_by_vehicle.get(from_route_id)
+        to_route = routes_by_vehicle.get(to_route_id)
         
-        if not from_route or not to_route:
-            logging.warning(f"Could not find both routes: {from_route_id}, {to_route_id}")
+        # A route cannot be its own destination
+        if not from_route or not to_route or from_route is to_route:
+            logger.warning("One or both routes not found: %s, %s", from_route_id, to_route_id)
             return False
         
-        # Find customer in source route
-        from_stops = from_route.get("stops", [])
-        customer_stop = None
-        for stop in from_stops:
-            if stop.get("customer_id") == customer_id:
-                customer_stop = stop
-                break
+        # Find the customer in the source route and remove it there
+        from_stops, customer_stop = _split_customer_stops(from_route.get("stops", []), customer_id)
         
         if not customer_stop:
-            logging.warning(f"Customer {customer_id} not found in route {from_route_id}")
+            logger.warning("Customer %s not found in route %s", customer_id, from_route_id)
             return False
         
-        # Remove from source route
-        from_stops = [stop for stop in from_stops if stop.get("customer_id") != customer_id]
-        
         # Add to destination route (append at end, sequence will be updated later if needed)
         to_stops = to_route.get("stops", [])
         # Update sequence to be last
-        max_sequence = max([stop.get("sequence", 0) for stop in to_stops], default=0)
+        max_sequence = max((stop.get("sequence", 0) for stop in to_stops), default=0)
         customer_stop["sequence"] = max_sequence + 1
         to_stops.append(customer_stop)
         
-        # Update both routes
-        supabase.table("routes").update({"stops": from_stops}).eq("id", from_route["id"]).execute()
-        supabase.table("routes").update({"stops": to_stops}).eq("id", to_route["id"]).execute()
-        
-        logging.info(f"Transferred customer {customer_id} from {from_route_id} to {to_route_id}")
+        # Update both routes with one request; both ids exist, so the upsert only updates
+        # and can safely be repeated
+        _execute_with_retry(
+            supabase.table("routes").upsert(
+                [
+                    {"id": route["id"], "vehicle_id": route["vehicle_id"], "route_date": route["route_date"], "stops": stops}
+                    for route, stops in ((from_route, from_stops), (to_route, to_stops))
+                ],
+                on_conflict="id",
+                returning=ReturnMethod.minimal,
+            )
+        )
+        
+        logger.info("Transferred customer %s from %s to %s", customer_id, from_route_id, to_route_id)
         return True
         
     except Exception as e:
-        import logging
-        logging.error(f"Failed to transfer customer: {e}")
+        logger.error("Failed to transfer customer: %s", e)
         return False
+    finally:
+        clear_routes_cache(zone_id)
+
+
+# Columns returned by get_routes_from_database unless the caller changes them
+ROUTE_COLUMNS = "id,zone_id,vehicle_id,route_date,stops,total_distance_km,total_duration_min,status,created_at"
+# Zone columns embedded into each route as "zone_info"
+ROUTE_ZONE_COLUMNS = "id,name,metadata"
+
+
+def _route_zone_uuids(supabase, zone_id: str | None, city: str | None) -> list[str] | None:
+    """Resolve the zone UUIDs routes are filtered on; ``None`` means no filter, ``[]`` no match."""
+    if zone_id:
+        # Find zone UUID by zone name
+        zone_uuid = _resolve_zone_uuid(supabase, zone_id)
+        if zone_uuid is None:
+            logger.warning("Zone '%s' not found in database", zone_id)
+            return []
+        return [zone_uuid]
+    if city:
+        # Find zone UUIDs by city
+        zone_response = supabase.table("zones").select("id").contains("metadata", {"city": city}).execute()
+        if not zone_response.data:
+            logger.warning("No zones found for city '%s'", city)
+            return []
+        return [zone["id"] for zone in zone_response.data]
+    return None
+
+
+def _routes_page(
+    supabase,
+    zone_id: str | None,
+    city: str | None,
+    columns: str,
+    zone_columns: str,
+    limit: int | None,
+    offset: int,
+    zone_uuids: Callable[[], list[str] | None],
+) -> list[dict[str, Any]]:
+    """Fetch routes newest first, optionally one ``limit``-sized page starting at ``offset``.
+    
+    Pages are cached for ``_ROUTES_TTL_SECONDS``; a hit skips both the zone lookup
+    (``zone_uuids`` is only called on a miss) and the routes request. Writers in this
+    process drop affected pages through :func:`clear_routes_cache`. Cached rows are
+    shared between callers and must not be mutated.
+    """
+    key = (zone_id, city, columns, zone_columns, limit, offset)
+    now = time.monotonic()
+    cached = _routes_cache.get(key)
+    if cached is not None and now - cached[0] < _ROUTES_TTL_SECONDS:
+        return cached[1]
+    
+    uuids = zone_uuids()
+    if uuids == []:
+        routes_data: list[dict[str, Any]] = []
+    else:
+        # PostgREST embeds each route's zone, so no per-route zone lookups
+        query = supabase.table("routes").select(f"{columns},zone_info:zones({zone_columns})")
+        if uuids:
+            query = query.in_("zone_id", uuids)
+        # id breaks created_at ties so consecutive pages neither repeat nor skip routes
+        query = query.order("created_at", desc=True).order("id")
+        if limit is not None:
+            query = query.range(offset, offset + limit - 1)
+        response = query.execute()
+        routes_data = response.data if response.data else []
+    
+    _routes_cache.pop(key, None)
+    if len(_routes_cache) >= _ROUTES_CACHE_SIZE:
+        # Evict the oldest entry (dicts keep insertion order)
+        del _routes_cache[next(iter(_routes_cache))]
+    _routes_cache[key] = (now, routes_data)
+    return routes_data
 
 
-def get_routes_from_database(zone_id: str | None = None, city: str | None = None) -> list[dict[str, Any]]:
-    """Retrieve routes from database.
+def get_routes_from_database(
+    zone_id: str | None = None,
+    city: str | None = None,
+    columns: str = ROUTE_COLUMNS,
+    zone_columns: str = ROUTE_ZONE_COLUMNS,
+    limit: int | None = None,
+    offset: int = 0,
+) -> list[dict[str, Any]]:
+    """Retrieve routes from database, newest first.
     
     Args:
         zone_id: Optional zone ID (zone name) filter
         city: Optional city filter (requires zone lookup)
+        columns: PostgREST column list of the routes to return
+        zone_columns: PostgREST column list of the zone embedded as ``zone_info``; the
+            full metadata (with every customer ID) is repeated on each route, so narrow
+            it with JSON paths such as ``"city:metadata->>city"`` when possible
+        limit: Optional page size; with ``offset`` selects one page of routes
+        offset: Number of routes to skip when ``limit`` is set
         
     Returns:
         List of route records from database with zone information embedded
@@ -1416,61 +2109,53 @@ def get_routes_from_database(zone_id: str | None = None, city: str | None = None
         return []
     
     try:
-        import logging
-        
-        # First, get zone UUID(s) if filtering by zone_id or city
-        zone_uuids = None
-        zone_lookup = {}  # Map zone UUID to zone info
-        
-        if zone_id:
-            # Find zone UUID by zone name
-            zone_response = supabase.table("zones").select("id, name, metadata").eq("name", zone_id).order("created_at", desc=True).limit(1).execute()
-            if not zone_response.data:
-                logging.warning(f"Zone '{zone_id}' not found in database")
-                return []
-            zone_uuid = zone_response.data[0]["id"]
-            zone_uuids = [zone_uuid]
-            zone_lookup[zone_uuid] = zone_response.data[0]
-        elif city:
-            # Find zone UUIDs by city
-            zone_response = supabase.table("zones").select("id, name, metadata").contains("metadata", {"city": city}).execute()
-            if not zone_response.data:
-                logging.warning(f"No zones found for city '{city}'")
-                return []
-            zone_uuids = [zone["id"] for zone in zone_response.data]
-            for zone in zone_response.data:
-                zone_lookup[zone["id"]] = zone
-        
-        # Build query
-        query = supabase.table("routes").select("*")
-        if zone_uuids:
-            query = query.in_("zone_id", zone_uuids)
-        
-        # Get most recent routes (ordered by created_at desc)
-        response = query.order("created_at", desc=True).execute()
-        routes_data = response.data if response.data else []
-        
-        # Enrich routes with zone information
-        for route in routes_data:
-            zone_uuid = route.get("zone_id")
-            if zone_uuid and zone_uuid in zone_lookup:
-                route["zone_info"] = zone_lookup[zone_uuid]
-            elif zone_uuid and not zone_uuids:
-                # If no filter was applied, fetch zone info on demand
-                zone_response = supabase.table("zones").select("name, metadata").eq("id", zone_uuid).limit(1).execute()
-                if zone_response.data:
-                    route["zone_info"] = zone_response.data[0]
+        routes_data = _routes_page(
+            supabase, zone_id, city, columns, zone_columns, limit, offset,
+            lambda: _route_zone_uuids(supabase, zone_id, city),
+        )
         
         if routes_data:
-            logging.info(f"Retrieved {len(routes_data)} routes from database (zone_id={zone_id}, city={city})")
+            logger.info("Retrieved %d routes from database (zone_id=%s, city=%s)", len(routes_data), zone_id, city)
         
         return routes_data
     except Exception as e:
-        import logging
-        logging.warning(f"Failed to retrieve routes from database: {e}")
+        logger.warning("Failed to retrieve routes from database: %s", e)
         return []
 
 
+def iter_routes_from_database(
+    zone_id: str | None = None,
+    city: str | None = None,
+    columns: str = ROUTE_COLUMNS,
+    zone_columns: str = ROUTE_ZONE_COLUMNS,
+    page_size: int = SCAN_PAGE_SIZE,
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield routes newest first, one page of at most ``page_size`` rows at a time.
+    
+    Takes the same filters as :func:`get_routes_from_database`, but never holds more
+    than one page and is not truncated by the server's row cap. Stops after a
+    short page; a failed request ends the iteration like an empty result.
+    """
+    supabase = get_supabase_client()
+    if not supabase:
+        return
+    
+    try:
+        # Resolved at most once, and only if some page is not cached
+        zone_uuids = functools.cache(lambda: _route_zone_uuids(supabase, zone_id, city))
+        offset = 0
+        while True:
+            page = _routes_page(supabase, zone_id, city, columns, zone_columns, page_size, offset, zone_uuids)
+            if page:
+                yield page
+            if len(page) < page_size:
+                break
+            offset += page_size
+        logger.info("Retrieved %d routes from database (zone_id=%s, city=%s)", offset + len(page), zone_id, city)
+    except Exception as e:
+        logger.warning("Failed to retrieve routes from database: %s", e)
+
+
 def delete_all_routes_from_database() -> int:
     """Delete all routes from the database.
     
@@ -1479,47 +2164,28 @@ def delete_all_routes_from_database() -> int:
     """
     supabase = get_supabase_client()
     if not supabase:
-        import logging
-        logging.warning("Supabase not configured - cannot delete routes")
+        logger.warning("Supabase not configured - cannot delete routes")
         return 0
     
     try:
-        import logging
-        
-        # Get all route IDs
-        routes_response = supabase.table("routes").select("id").execute()
-        if not routes_response.data:
-            logging.info("No routes found in database to delete")
-            return 0
-        
-        route_ids = [r["id"] for r in routes_response.data]
-        total_count = len(route_ids)
-        
-        if total_count == 0:
-            logging.info("No routes to delete")
-            return 0
-        
-        logging.info(f"Deleting {total_count} routes from database...")
-        
-        # Delete in batches to avoid timeout issues
-        batch_size = 100
-        deleted_count = 0
-        
-        for i in range(0, len(route_ids), batch_size):
-            batch = route_ids[i:i + batch_size]
-            try:
-                supabase.table("routes").delete().in_("id", batch).execute()
-                deleted_count += len(batch)
-                logging.info(f"Deleted batch {i//batch_size + 1}: {len(batch)} routes (total: {deleted_count}/{total_count})")
-            except Exception as batch_error:
-                logging.error(f"Failed to delete batch {i//batch_size + 1}: {batch_error}")
-                continue
-        
-        logging.info(f"Successfully deleted {deleted_count} out of {total_count} routes from database")
+        # Single DELETE for the whole table; PostgREST refuses unfiltered deletes,
+        # so filter on the never-null primary key
+        response = _execute_with_retry(
+            supabase.table("routes")
+            .delete(count=CountMethod.exact, returning=ReturnMethod.minimal)
+            .not_.is_("id", "null")
+        )
+        deleted_count = response.count or 0
+        
+        if deleted_count == 0:
+            logger.info("No routes found in database to delete")
+        else:
+            logger.info("Successfully deleted %d routes from database", deleted_count)
         return deleted_count
         
     except Exception as e:
-        import logging
-        logging.error(f"Failed to delete routes from database: {e}")
+        logger.error("Failed to delete routes from database: %s", e)
         return 0
+    finally:
+        clear_routes_cache()
 
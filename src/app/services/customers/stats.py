@@ -8,6 +8,7 @@ from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime, timezone
 from ...data.customers_repository import load_customers
 from ...config import settings
+from ...models.domain import Customer
 
 
 def compute_customer_stats(top_n: int = 3) -> dict:
@@ -163,10 +164,8 @@ def list_customer_locations(
     for customer in customers:
         if normalized_city and not _matches_city_filter(customer, normalized_city):
             continue
-        if normalized_zone:
-            zone_value = (customer.zone or "").strip().lower()
-            if zone_value != normalized_zone:
-                continue
+        if normalized_zone and customer.zone_lc != normalized_zone:
+            continue
 
         # Apply additional filters
         if normalized_filters:
@@ -215,12 +214,11 @@ def _resolve_city_label(customer: object) -> Optional[str]:
     return None
 
 
-def _matches_city_filter(customer: object, normalized: str) -> bool:
-    for attribute in ("city", "area", "region"):
-        value = getattr(customer, attribute, None)
-        if isinstance(value, str) and value.strip().lower() == normalized:
-            return True
-    return False
+def _matches_city_filter(customer: Customer, normalized: str) -> bool:
+    if customer.city_lc == normalized or customer.area_lc == normalized:
+        return True
+    region = customer.region
+    return isinstance(region, str) and region.strip().lower() == normalized
 
 
 def analyze_customer_issues() -> dict:
@@ -283,12 +281,11 @@ def analyze_customer_issues() -> dict:
 
 
 def _requires_finance_clearance(customer: object) -> bool:
-    """Heuristic to determine finance clearance need based on raw record."""
+    """Heuristic to determine finance clearance need based on the finance columns."""
 
-    raw = getattr(customer, "raw", {}) or {}
-    status = _normalize_string(raw.get("FinanceClearance") or raw.get("Finance_Status") or customer.status)
-    outstanding = _normalize_string(raw.get("PaymentStatus"))
-    finance_flag = _normalize_string(raw.get("FinanceFlag"))
+    status = _normalize_string(getattr(customer, "finance_status", None) or customer.status)
+    outstanding = _normalize_string(getattr(customer, "payment_status", None))
+    finance_flag = _normalize_string(getattr(customer, "finance_flag", None))
 
     keywords = {"pending", "required", "needs clearance", "open"}
     if status in keywords or finance_flag in keywords:
@@ -18,7 +18,7 @@ def zoning_response_to_json(response: ZoningResponse) -> dict:
 def zoning_response_to_csv(response: ZoningResponse, customers: Sequence[Customer]) -> str:
     buffer = io.StringIO()
     fieldnames = ["customer_id", "customer_name", "zone_id"] + sorted(
-        set(customers[0].raw.keys()) if customers else []
+        set((customers[0].raw or {}).keys()) if customers else []
     )
     writer = csv.DictWriter(buffer, fieldnames=fieldnames)
     writer.writeheader()
@@ -29,7 +29,7 @@ def zoning_response_to_csv(response: ZoningResponse, customers: Sequence[Custome
                 "customer_id": customer.customer_id,
                 "customer_name": customer.customer_name,
                 "zone_id": response_map.get(customer.customer_id, ""),
-                **customer.raw,
+                **(customer.raw or {}),
             }
         )
     return buffer.getvalue()
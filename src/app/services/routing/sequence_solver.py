@@ -6,6 +6,7 @@ and we only need to optimize the visit sequence within each route using OSRM dis
 
 from __future__ import annotations
 
+import logging
 import math
 from typing import Sequence
 
@@ -21,6 +22,8 @@ from ...config import settings
 from ...models.domain import Customer
 from .models import RoutePlan, RouteStop, RoutingResult
 
+logger = logging.getLogger(__name__)
+
 
 def solve_sequence_only(
     *,
@@ -80,8 +83,7 @@ def solve_sequence_only(
                 full_idx = customer_to_index[customer.customer_id]
                 route_index_map.append((customer, full_idx))
             else:
-                import logging
-                logging.warning(f"Customer {customer.customer_id} not found in OSRM matrix, skipping")
+                logger.warning(f"Customer {customer.customer_id} not found in OSRM matrix, skipping")
                 continue
         
         if len(route_index_map) < 2:  # Need at least depot + 1 customer
@@ -140,8 +142,7 @@ def solve_sequence_only(
         assignment = routing.SolveWithParameters(search_parameters)
         
         if not assignment:
-            import logging
-            logging.warning(f"Could not solve sequence for route {route_id}, using default order")
+            logger.warning(f"Could not solve sequence for route {route_id}, using default order")
             # Fallback: use original order
             stops = []
             total_distance = 0.0
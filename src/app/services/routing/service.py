@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import logging
 from dataclasses import asdict
 from typing import Sequence
 
@@ -21,6 +22,8 @@ from .osrm_client import OSRMClient, build_coordinate_list
 from .solver import SolverConstraints, solve_vrp
 from .sequence_solver import solve_sequence_only
 
+logger = logging.getLogger(__name__)
+
 
 def _filter_customers(customers: Sequence[Customer], customer_ids: Sequence[str] | None) -> list[Customer]:
     if not customer_ids:
@@ -49,7 +52,6 @@ def _build_constraints(payload: RoutingRequest) -> SolverConstraints:
 
 
 def optimize_routes(payload: RoutingRequest) -> RoutingResponse:
-    import logging
     
     depot = resolve_depot(payload.city)
     if not depot:
@@ -60,9 +62,9 @@ def optimize_routes(payload: RoutingRequest) -> RoutingResponse:
     try:
         from ...persistence.database import get_customers_for_zone
         customers = get_customers_for_zone(payload.zone_id)
-        logging.info(f"Retrieved {len(customers)} customers for zone '{payload.zone_id}' from database")
+        logger.info(f"Retrieved {len(customers)} customers for zone '{payload.zone_id}' from database")
     except Exception as e:
-        logging.error(f"Failed to retrieve customers for zone '{payload.zone_id}': {e}")
+        logger.error(f"Failed to retrieve customers for zone '{payload.zone_id}': {e}")
         raise ValueError(f"Failed to retrieve customers for zone '{payload.zone_id}': {str(e)}") from e
     
     if not customers:
@@ -83,8 +85,7 @@ def optimize_routes(payload: RoutingRequest) -> RoutingResponse:
     try:
         osrm_client = OSRMClient()
     except ValueError as e:
-        import logging
-        logging.error(f"OSRM client initialization failed: {e}")
+        logger.error(f"OSRM client initialization failed: {e}")
         raise ValueError(f"OSRM service is not configured. Please check OSRM_BASE_URL setting.") from e
     
     coordinate_list = build_coordinate_list(depot.latitude, depot.longitude, coordinates)
@@ -111,27 +112,24 @@ def optimize_routes(payload: RoutingRequest) -> RoutingResponse:
                 if total_customers > 0:
                     unreachable_rate = unreachable_count / total_customers
                     if unreachable_rate > 0.5:  # More than 50% unreachable
-                        logging.warning(
+                        logger.warning(
                             f"Too many unreachable routes from OSRM ({unreachable_count}/{total_customers}, "
                             f"{unreachable_rate*100:.1f}%). Using haversine fallback."
                         )
                         use_haversine_fallback = True
                         osrm_table = None
     except (ConnectionError, ValueError) as e:
-        import logging
-        logging.warning(f"OSRM table request failed: {e}. Using haversine fallback.")
+        logger.warning(f"OSRM table request failed: {e}. Using haversine fallback.")
         use_haversine_fallback = True
     except Exception as e:
-        import logging
-        logging.error(f"Unexpected error getting OSRM table: {e}. Attempting haversine fallback.")
+        logger.error(f"Unexpected error getting OSRM table: {e}. Attempting haversine fallback.")
         use_haversine_fallback = True
     
     # Fallback to haversine distance if OSRM failed or returned too many None values
     if use_haversine_fallback or osrm_table is None:
-        import logging
         from ...services.geospatial import haversine_km
         
-        logging.info(f"Computing distance/duration matrix using haversine fallback for {len(filtered_customers)} customers")
+        logger.info(f"Computing distance/duration matrix using haversine fallback for {len(filtered_customers)} customers")
         
         # Build matrix using haversine distance
         # Note: coordinate_list format is (lat, lon) from build_coordinate_list
@@ -161,7 +159,7 @@ def optimize_routes(payload: RoutingRequest) -> RoutingResponse:
             "durations": durations,
             "distances": distances,
         }
-        logging.info("Haversine fallback matrix computed successfully")
+        logger.info("Haversine fallback matrix computed successfully")
 
     constraints = _build_constraints(payload)
     start_from_depot = payload.start_from_depot if payload.start_from_depot is not None else True
@@ -205,20 +203,18 @@ def optimize_routes(payload: RoutingRequest) -> RoutingResponse:
         metadata.setdefault("map_overlays", {})
         metadata["map_overlays"]["routes"] = route_overlays
         # Log summary of route overlays
-        import logging
-        logging.info(f"=== Route Overlays Summary ===")
-        logging.info(f"start_from_depot={start_from_depot}, num_routes={len(route_overlays)}")
+        logger.info(f"=== Route Overlays Summary ===")
+        logger.info(f"start_from_depot={start_from_depot}, num_routes={len(route_overlays)}")
         for overlay in route_overlays:
             route_id = overlay.get("route_id", "unknown")
             coords = overlay.get("coordinates", [])
             source = overlay.get("source", "unknown")
             if coords:
                 first_coord = coords[0]
-                logging.info(f"  Route {route_id}: {len(coords)} coordinates, source={source}, first_coord=({first_coord[0]:.6f}, {first_coord[1]:.6f})")
+                logger.info(f"  Route {route_id}: {len(coords)} coordinates, source={source}, first_coord=({first_coord[0]:.6f}, {first_coord[1]:.6f})")
 
     # Check if we have any routes
     if not routing_result.plans:
-        import logging
         status = routing_result.metadata.get("status", "unknown")
         if status == "infeasible":
             reason = routing_result.metadata.get("reason", "Constraints may be too strict.")
@@ -258,10 +254,9 @@ def optimize_routes(payload: RoutingRequest) -> RoutingResponse:
         )
     except Exception as exc:
         # Log error but don't fail the entire request
-        import logging
         import traceback
-        logging.error(f"CRITICAL: Failed to save routes to database: {exc}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logger.error(f"CRITICAL: Failed to save routes to database: {exc}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
         # Don't re-raise - routes are still valid and should be returned to user
         # Database save failure should not prevent route generation from succeeding
     
@@ -282,8 +277,7 @@ def optimize_routes(payload: RoutingRequest) -> RoutingResponse:
             save_easyterritory_json(easyterritory_features, run_dir / "routes.geojson")
         except Exception as exc:
             # Log error but don't fail the entire request
-            import logging
-            logging.warning(f"Failed to generate GeoJSON export: {exc}")
+            logger.warning(f"Failed to generate GeoJSON export: {exc}")
 
     return response
 
@@ -298,7 +292,6 @@ def _optimize_sequences_only(
     This function handles the case where customers are pre-assigned to routes.
     It only optimizes the visit sequence within each route using OR-Tools + OSRM.
     """
-    import logging
     
     # Build customer lookup
     customer_lookup = {c.customer_id: c for c in all_customers}
@@ -311,10 +304,10 @@ def _optimize_sequences_only(
         route_customers = []
         for customer_id in assignment.customer_ids:
             if customer_id not in customer_lookup:
-                logging.warning(f"Customer {customer_id} not found in zone, skipping")
+                logger.warning(f"Customer {customer_id} not found in zone, skipping")
                 continue
             if customer_id in assigned_customer_ids:
-                logging.warning(f"Customer {customer_id} assigned to multiple routes, using first assignment")
+                logger.warning(f"Customer {customer_id} assigned to multiple routes, using first assignment")
                 continue
             route_customers.append(customer_lookup[customer_id])
             assigned_customer_ids.add(customer_id)
@@ -340,8 +333,7 @@ def _optimize_sequences_only(
         osrm_client = OSRMClient()
         osrm_table = osrm_client.table(coordinate_list)
     except Exception as e:
-        import logging
-        logging.warning(f"OSRM request failed: {e}. Using haversine fallback.")
+        logger.warning(f"OSRM request failed: {e}. Using haversine fallback.")
         # Fallback to haversine
         from ...services.geospatial import haversine_km
         n = len(coordinate_list)
@@ -426,10 +418,9 @@ def _optimize_sequences_only(
         )
     except Exception as exc:
         # Log error but don't fail the entire request - routes should still be returned
-        import logging
         import traceback
-        logging.error(f"CRITICAL: Failed to save routes to database: {exc}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logger.error(f"CRITICAL: Failed to save routes to database: {exc}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
         # Don't re-raise - routes are still valid and should be returned to user
         # Database save failure should not prevent route generation from succeeding
     
@@ -458,7 +449,6 @@ def _build_route_overlays(
     preventing routes from crossing water or other impassable areas.
     Falls back to straight-line paths if OSRM is unavailable.
     """
-    import logging
     
     if not plans:
         return []
@@ -471,18 +461,18 @@ def _build_route_overlays(
     try:
         osrm_client = OSRMClient()
     except (ValueError, ConnectionError) as e:
-        logging.warning(f"OSRM not available for route geometry: {e}. Using straight-line paths.")
+        logger.warning(f"OSRM not available for route geometry: {e}. Using straight-line paths.")
     
     for plan in plans:
         # Build waypoints for this route
         # CRITICAL: When start_from_depot=False, waypoints must ONLY contain customer coordinates
         # Do NOT use build_coordinate_list here - it always includes depot
         # We build waypoints directly to control whether depot is included
-        import logging
-        logging.info(f"=== Building route overlay for {plan.route_id} ===")
-        logging.info(f"  Route has {len(plan.stops)} stops: {[s.customer_id for s in plan.stops]}")
+        logger.info("=== Building route overlay for %s ===", plan.route_id)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("  Route has %d stops: %s", len(plan.stops), [s.customer_id for s in plan.stops])
         if plan.stops:
-            logging.info(f"  First customer: {plan.stops[0].customer_id}, Last customer: {plan.stops[-1].customer_id}")
+            logger.info("  First customer: %s, Last customer: %s", plan.stops[0].customer_id, plan.stops[-1].customer_id)
         
         waypoints: list[tuple[float, float]] = []
         
@@ -494,14 +484,14 @@ def _build_route_overlays(
         for stop in plan.stops:
             customer = customer_lookup.get(stop.customer_id)
             if not customer:
-                logging.warning(f"Customer {stop.customer_id} not found in lookup, skipping")
+                logger.warning(f"Customer {stop.customer_id} not found in lookup, skipping")
                 continue
             # Validate coordinates before adding
             if not (-90 <= customer.latitude <= 90) or not (-180 <= customer.longitude <= 180):
-                logging.error(f"❌ Invalid coordinates for customer {stop.customer_id}: ({customer.latitude}, {customer.longitude})")
+                logger.error(f"❌ Invalid coordinates for customer {stop.customer_id}: ({customer.latitude}, {customer.longitude})")
                 continue
             if abs(customer.latitude) < 1e-6 and abs(customer.longitude) < 1e-6:
-                logging.error(f"❌ Zero/Invalid coordinates for customer {stop.customer_id}: ({customer.latitude}, {customer.longitude})")
+                logger.error(f"❌ Zero/Invalid coordinates for customer {stop.customer_id}: ({customer.latitude}, {customer.longitude})")
                 continue
             waypoints.append((customer.latitude, customer.longitude))
         
@@ -515,8 +505,7 @@ def _build_route_overlays(
             # Verify no depot coordinates are in waypoints
             for wp in waypoints:
                 if abs(wp[0] - depot_lat) < 0.0001 and abs(wp[1] - depot_lon) < 0.0001:
-                    import logging
-                    logging.error(f"ERROR: Depot found in waypoints when start_from_depot=False! This should never happen.")
+                    logger.error(f"ERROR: Depot found in waypoints when start_from_depot=False! This should never happen.")
                     # Remove depot coordinate if accidentally included
                     waypoints = [wp for wp in waypoints if not (abs(wp[0] - depot_lat) < 0.0001 and abs(wp[1] - depot_lon) < 0.0001)]
                     break
@@ -525,9 +514,8 @@ def _build_route_overlays(
         if osrm_client and len(waypoints) >= 2:
             try:
                 # CRITICAL VERIFICATION: Log exact waypoints before calling OSRM
-                import logging
-                logging.info(f"=== Route {plan.route_id} OSRM route() call ===")
-                logging.info(f"start_from_depot={start_from_depot}, num_waypoints={len(waypoints)}")
+                logger.info(f"=== Route {plan.route_id} OSRM route() call ===")
+                logger.info(f"start_from_depot={start_from_depot}, num_waypoints={len(waypoints)}")
                 if waypoints:
                     first_wp = waypoints[0]
                     last_wp = waypoints[-1]
@@ -536,25 +524,25 @@ def _build_route_overlays(
                     first_to_depot_dist = haversine_km(depot_lat, depot_lon, first_wp[0], first_wp[1])
                     last_to_depot_dist = haversine_km(depot_lat, depot_lon, last_wp[0], last_wp[1])
                     
-                    logging.info(f"First waypoint: ({first_wp[0]:.6f}, {first_wp[1]:.6f}), distance from depot: {first_to_depot_dist:.3f} km")
-                    logging.info(f"Last waypoint: ({last_wp[0]:.6f}, {last_wp[1]:.6f}), distance from depot: {last_to_depot_dist:.3f} km")
+                    logger.info(f"First waypoint: ({first_wp[0]:.6f}, {first_wp[1]:.6f}), distance from depot: {first_to_depot_dist:.3f} km")
+                    logger.info(f"Last waypoint: ({last_wp[0]:.6f}, {last_wp[1]:.6f}), distance from depot: {last_to_depot_dist:.3f} km")
                     
                     if not start_from_depot:
                         # Verify first waypoint is NOT depot
                         if first_to_depot_dist < 0.1:  # Within 100m of depot
-                            logging.error(f"❌ ERROR: First waypoint is at depot ({first_to_depot_dist:.3f} km away) when start_from_depot=False!")
-                            logging.error(f"   This will cause OSRM to return route starting from depot instead of first customer!")
+                            logger.error(f"❌ ERROR: First waypoint is at depot ({first_to_depot_dist:.3f} km away) when start_from_depot=False!")
+                            logger.error(f"   This will cause OSRM to return route starting from depot instead of first customer!")
                         else:
-                            logging.info(f"✓ First waypoint is a customer ({first_to_depot_dist:.3f} km from depot) - correct!")
+                            logger.info(f"✓ First waypoint is a customer ({first_to_depot_dist:.3f} km from depot) - correct!")
                         
                         # Verify last waypoint is NOT depot
                         if last_to_depot_dist < 0.1:
-                            logging.error(f"❌ ERROR: Last waypoint is at depot ({last_to_depot_dist:.3f} km away) when start_from_depot=False!")
+                            logger.error(f"❌ ERROR: Last waypoint is at depot ({last_to_depot_dist:.3f} km away) when start_from_depot=False!")
                         else:
-                            logging.info(f"✓ Last waypoint is a customer ({last_to_depot_dist:.3f} km from depot) - correct!")
+                            logger.info(f"✓ Last waypoint is a customer ({last_to_depot_dist:.3f} km from depot) - correct!")
                     
                     # Log all waypoints for debugging
-                    logging.debug(f"All waypoints: {[(lat, lon) for lat, lon in waypoints]}")
+                    logger.debug("All waypoints: %s", waypoints)
                 
                 # Get route geometry from OSRM
                 route_data = osrm_client.route(waypoints)
@@ -604,13 +592,13 @@ def _build_route_overlays(
                                     if not found_first_customer:
                                         if dist_from_depot < DEPOT_PROXIMITY_THRESHOLD_KM:
                                             # This coordinate is too close to depot, skip it
-                                            logging.debug(f"  Skipping coord ({lat:.6f}, {lon:.6f}) - too close to depot ({dist_from_depot:.3f} km)")
+                                            logger.debug("  Skipping coord (%.6f, %.6f) - too close to depot (%.3f km)", lat, lon, dist_from_depot)
                                             continue
                                         elif dist_from_first < 0.1:  # Within 100m of first customer
                                             # Found first customer! Start including coordinates from here
                                             found_first_customer = True
                                             filtered_coords.append(first_customer_coord)  # Use exact first customer location
-                                            logging.info(f"✓ Found first customer {first_stop.customer_id} at coord ({lat:.6f}, {lon:.6f}), distance from depot: {dist_from_depot:.3f} km")
+                                            logger.info(f"✓ Found first customer {first_stop.customer_id} at coord ({lat:.6f}, {lon:.6f}), distance from depot: {dist_from_depot:.3f} km")
                                         else:
                                             # This coordinate is far from depot and not the first customer
                                             # It might be part of the route, but we want to start from first customer
@@ -622,14 +610,14 @@ def _build_route_overlays(
                                 
                                 # If we didn't find first customer in the coordinates, force it at the beginning
                                 if not found_first_customer:
-                                    logging.warning(f"⚠ First customer {first_stop.customer_id} not found in OSRM coordinates, forcing it at start")
+                                    logger.warning(f"⚠ First customer {first_stop.customer_id} not found in OSRM coordinates, forcing it at start")
                                     filtered_coords = [first_customer_coord] + filtered_coords
                                 else:
                                     # Ensure first coordinate is exactly first customer location
                                     filtered_coords[0] = first_customer_coord
                                 
                                 coordinates = filtered_coords
-                                logging.info(f"✓✓ Route {plan.route_id}: Filtered to {len(coordinates)} coords starting from customer {first_stop.customer_id}")
+                                logger.info(f"✓✓ Route {plan.route_id}: Filtered to {len(coordinates)} coords starting from customer {first_stop.customer_id}")
                             
                             # Ensure last coordinate is exactly last customer location
                             if last_customer and len(coordinates) > 0:
@@ -638,7 +626,7 @@ def _build_route_overlays(
                                 
                                 # Validate last customer coordinates
                                 if not (-90 <= last_customer_lat <= 90) or not (-180 <= last_customer_lon <= 180):
-                                    logging.error(f"❌ Invalid last customer coordinates for {last_stop.customer_id}: ({last_customer_lat}, {last_customer_lon})")
+                                    logger.error(f"❌ Invalid last customer coordinates for {last_stop.customer_id}: ({last_customer_lat}, {last_customer_lon})")
                                 else:
                                     # Find coordinate closest to last customer (search from end backwards)
                                     min_dist = float('inf')
@@ -654,19 +642,19 @@ def _build_route_overlays(
                                             min_dist = dist
                                             end_idx = idx
                                     
-                                    logging.info(f"  Closest coordinate to last customer {last_stop.customer_id} at index {end_idx}, distance={min_dist:.3f} km")
+                                    logger.info(f"  Closest coordinate to last customer {last_stop.customer_id} at index {end_idx}, distance={min_dist:.3f} km")
                                 
                                     # Trim to end at last customer (keep coordinates up to and including end_idx)
                                     if end_idx < len(coordinates) - 1:
                                         coordinates = coordinates[:end_idx + 1]
-                                        logging.info(f"  Trimmed coordinates from end, keeping first {len(coordinates)} coordinates")
+                                        logger.info(f"  Trimmed coordinates from end, keeping first {len(coordinates)} coordinates")
                                     
                                     # Force last coordinate to be EXACTLY last customer location
                                     if coordinates:
                                         coordinates[-1] = [last_customer_lat, last_customer_lon]
-                                        logging.info(f"✓ Last coord forced to customer {last_stop.customer_id}: ({coordinates[-1][0]:.6f}, {coordinates[-1][1]:.6f})")
+                                        logger.info(f"✓ Last coord forced to customer {last_stop.customer_id}: ({coordinates[-1][0]:.6f}, {coordinates[-1][1]:.6f})")
                                     else:
-                                        logging.error(f"❌ ERROR: No coordinates to set last coordinate for {last_stop.customer_id}!")
+                                        logger.error(f"❌ ERROR: No coordinates to set last coordinate for {last_stop.customer_id}!")
                         
                         # Final verification: log first and last coordinates before adding to overlays
                         if coordinates and plan.stops:
@@ -683,28 +671,28 @@ def _build_route_overlays(
                             
                             if first_cust:
                                 first_cust_dist = haversine_km(first_cust.latitude, first_cust.longitude, first_final[0], first_final[1])
-                                logging.info(f"✓✓ Route {plan.route_id} FINAL: {len(coordinates)} coords")
-                                logging.info(f"  First customer: {first_stop_id} at ({first_cust.latitude:.6f}, {first_cust.longitude:.6f})")
-                                logging.info(f"  First coord: ({first_final[0]:.6f}, {first_final[1]:.6f}), distance from first customer={first_cust_dist:.3f} km, from depot={final_depot_dist_first:.3f} km")
+                                logger.info(f"✓✓ Route {plan.route_id} FINAL: {len(coordinates)} coords")
+                                logger.info(f"  First customer: {first_stop_id} at ({first_cust.latitude:.6f}, {first_cust.longitude:.6f})")
+                                logger.info(f"  First coord: ({first_final[0]:.6f}, {first_final[1]:.6f}), distance from first customer={first_cust_dist:.3f} km, from depot={final_depot_dist_first:.3f} km")
                             
                             if last_cust:
                                 last_cust_dist = haversine_km(last_cust.latitude, last_cust.longitude, last_final[0], last_final[1])
-                                logging.info(f"  Last customer: {last_stop_id} at ({last_cust.latitude:.6f}, {last_cust.longitude:.6f})")
-                                logging.info(f"  Last coord: ({last_final[0]:.6f}, {last_final[1]:.6f}), distance from last customer={last_cust_dist:.3f} km, from depot={final_depot_dist_last:.3f} km")
+                                logger.info(f"  Last customer: {last_stop_id} at ({last_cust.latitude:.6f}, {last_cust.longitude:.6f})")
+                                logger.info(f"  Last coord: ({last_final[0]:.6f}, {last_final[1]:.6f}), distance from last customer={last_cust_dist:.3f} km, from depot={final_depot_dist_last:.3f} km")
                             
                             # Verify coordinates are correct
                             if not start_from_depot and first_cust:
                                 first_cust_dist_check = haversine_km(first_cust.latitude, first_cust.longitude, first_final[0], first_final[1])
                                 if first_cust_dist_check > 0.05:  # More than 50m away
-                                    logging.error(f"❌ ERROR: First coordinate is {first_cust_dist_check:.3f} km away from first customer {first_stop_id}!")
+                                    logger.error(f"❌ ERROR: First coordinate is {first_cust_dist_check:.3f} km away from first customer {first_stop_id}!")
                                 
                                 if final_depot_dist_first < 0.5:  # Less than 500m from depot
-                                    logging.error(f"❌ ERROR: First coordinate is {final_depot_dist_first:.3f} km from depot! Route should start from customer, not depot!")
+                                    logger.error(f"❌ ERROR: First coordinate is {final_depot_dist_first:.3f} km from depot! Route should start from customer, not depot!")
                             
                             if last_cust:
                                 last_cust_dist_check = haversine_km(last_cust.latitude, last_cust.longitude, last_final[0], last_final[1])
                                 if last_cust_dist_check > 0.05:  # More than 50m away
-                                    logging.error(f"❌ ERROR: Last coordinate is {last_cust_dist_check:.3f} km away from last customer {last_stop_id}!")
+                                    logger.error(f"❌ ERROR: Last coordinate is {last_cust_dist_check:.3f} km away from last customer {last_stop_id}!")
                         
                         # Create completely fresh copy of coordinates for this route (deep copy to avoid any sharing)
                         route_coordinates = [[float(c[0]), float(c[1])] for c in coordinates]
@@ -716,7 +704,7 @@ def _build_route_overlays(
                             if first_cust_final:
                                 # ABSOLUTE FINAL CHECK - replace first coordinate with first customer
                                 route_coordinates[0] = [float(first_cust_final.latitude), float(first_cust_final.longitude)]
-                                logging.info(f"✓✓✓ Route {plan.route_id} ABSOLUTE FINAL: First coord = ({route_coordinates[0][0]:.6f}, {route_coordinates[0][1]:.6f}) = customer {first_stop_final.customer_id}")
+                                logger.info(f"✓✓✓ Route {plan.route_id} ABSOLUTE FINAL: First coord = ({route_coordinates[0][0]:.6f}, {route_coordinates[0][1]:.6f}) = customer {first_stop_final.customer_id}")
                         
                         overlays.append(
                             {
@@ -727,7 +715,7 @@ def _build_route_overlays(
                         )
                         continue
             except Exception as e:
-                logging.warning(f"Failed to get OSRM route geometry for {plan.route_id}: {e}. Using straight-line path.")
+                logger.warning(f"Failed to get OSRM route geometry for {plan.route_id}: {e}. Using straight-line path.")
         
         # Fallback: use straight-line path (original behavior)
         coordinates: list[list[float]] = [[lat, lon] for lat, lon in waypoints]
@@ -739,7 +727,7 @@ def _build_route_overlays(
             if first_customer:
                 # Force first coordinate to be exactly first customer location
                 coordinates[0] = [first_customer.latitude, first_customer.longitude]
-                logging.info(f"✓ Fallback: Route {plan.route_id} first coord set to first customer {first_stop.customer_id}: ({coordinates[0][0]:.6f}, {coordinates[0][1]:.6f})")
+                logger.info(f"✓ Fallback: Route {plan.route_id} first coord set to first customer {first_stop.customer_id}: ({coordinates[0][0]:.6f}, {coordinates[0][1]:.6f})")
             
             # Also ensure last coordinate is exactly last customer
             if len(plan.stops) > 0:
@@ -747,7 +735,7 @@ def _build_route_overlays(
                 last_customer = customer_lookup.get(last_stop.customer_id)
                 if last_customer and coordinates:
                     coordinates[-1] = [last_customer.latitude, last_customer.longitude]
-                    logging.info(f"✓ Fallback: Route {plan.route_id} last coord set to last customer {last_stop.customer_id}: ({coordinates[-1][0]:.6f}, {coordinates[-1][1]:.6f})")
+                    logger.info(f"✓ Fallback: Route {plan.route_id} last coord set to last customer {last_stop.customer_id}: ({coordinates[-1][0]:.6f}, {coordinates[-1][1]:.6f})")
         
         # CRITICAL: Make a copy of coordinates to ensure each route has unique coordinates (no shared references)
         final_coordinates_fallback = [coord[:] for coord in coordinates]
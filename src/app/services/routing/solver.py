@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import logging
 import math
 from dataclasses import dataclass
 from typing import Sequence
@@ -18,6 +19,8 @@ from ...config import settings
 from ...models.domain import Customer
 from .models import RoutePlan, RouteStop, RoutingResult
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass(slots=True)
 class SolverConstraints:
@@ -107,8 +110,7 @@ def solve_vrp(
     
     if valid_routes_from_depot == 0:
         # Check if this might be a network/connectivity issue
-        import logging
-        logging.error(
+        logger.error(
             f"No reachable customers from depot for zone {zone_id}. "
             f"This could indicate: (1) OSRM service connectivity issues, "
             f"(2) Network/DNS failures, (3) Invalid customer coordinates, "
@@ -122,8 +124,7 @@ def solve_vrp(
         )
     
     if unreachable_count > 0:
-        import logging
-        logging.warning(
+        logger.warning(
             f"{unreachable_count} out of {len(customers)} customers are unreachable from depot. "
             f"These will be excluded from routing."
         )
@@ -193,8 +194,7 @@ def solve_vrp(
     
     # If infeasible, try with relaxed constraints
     if not assignment:
-        import logging
-        logging.warning(
+        logger.warning(
             f"Routing problem infeasible for zone {zone_id} with strict constraints. "
             f"Attempting automatic constraint relaxation..."
         )
@@ -224,7 +224,7 @@ def solve_vrp(
             900.0  # Minimum 900 minutes (15 hours)
         )
         
-        logging.info(
+        logger.info(
             f"Relaxed constraints: distance={relaxed_distance:.1f}km (was {constraints.max_distance_per_route_km}km), "
             f"duration={relaxed_duration:.1f}min (was {constraints.max_route_duration_minutes}min)"
         )
@@ -281,7 +281,7 @@ def solve_vrp(
         
         if not assignment:
             # Still infeasible even with relaxed constraints
-            logging.error(
+            logger.error(
                 f"Routing problem still infeasible for zone {zone_id} even with relaxed constraints. "
                 f"Customers: {len(customers)}, "
                 f"Max per route: {constraints.max_customers_per_route}, "
@@ -310,7 +310,7 @@ def solve_vrp(
                 }
             )
         else:
-            logging.info(f"Successfully found solution with relaxed constraints for zone {zone_id}")
+            logger.info(f"Successfully found solution with relaxed constraints for zone {zone_id}")
             # Store relaxed constraint info for metadata
             used_relaxed_constraints = True
             relaxed_distance_limit = relaxed_distance
@@ -394,8 +394,7 @@ def solve_vrp(
     
     # If solver found a solution but no routes have customers, it's still a problem
     if not plans and routes_with_customers == 0:
-        import logging
-        logging.warning(
+        logger.warning(
             f"Solver found solution but no routes contain customers. "
             f"Zone: {zone_id}, Customers: {len(customers)}, Vehicles: {total_routes}"
         )
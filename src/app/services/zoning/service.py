@@ -20,9 +20,10 @@ from ...models.domain import Customer, Depot
 from ...schemas.zoning import ZoningRequest, ZoningResponse, ZoneCount
 from .dispatcher import get_strategy
 
+logger = logging.getLogger(__name__)
+
 
 def _ensure_customers(city: str) -> Sequence[Customer]:
-    import logging
     
     try:
         customers = get_customers_for_location(city)
@@ -114,9 +115,9 @@ def _compute_customer_durations_distances(
                             "distance_km": distance_km,
                         }
             
-            logging.info(f"Computed duration/distance for {len(result)} customers using OSRM")
+            logger.info(f"Computed duration/distance for {len(result)} customers using OSRM")
         except Exception as e:
-            logging.warning(f"Failed to compute durations/distances using OSRM: {e}. Using haversine fallback.")
+            logger.warning(f"Failed to compute durations/distances using OSRM: {e}. Using haversine fallback.")
             # Fall through to haversine fallback
     
     # Fallback to haversine distance if OSRM not available or failed
@@ -132,7 +133,7 @@ def _compute_customer_durations_distances(
                     "duration_min": (distance_km / 40.0) * 60.0,  # Assume 40 km/h average speed
                     "distance_km": distance_km,
                 }
-        logging.info(f"Computed duration/distance for {len(result)} customers using haversine fallback")
+        logger.info(f"Computed duration/distance for {len(result)} customers using haversine fallback")
     
     return result
 
@@ -165,7 +166,7 @@ def process_zoning_request(payload: ZoningRequest, *, persist: bool = True) -> Z
     result = strategy.generate(**strategy_kwargs)
     
     # Compute duration and distance for all customers from depot
-    logging.info(f"Computing travel durations and distances for {len(customers)} customers...")
+    logger.info(f"Computing travel durations and distances for {len(customers)} customers...")
     customer_travel_data = _compute_customer_durations_distances(depot, customers)
     
     # Store travel data in metadata
@@ -192,7 +193,7 @@ def process_zoning_request(payload: ZoningRequest, *, persist: bool = True) -> Z
                 }
         if zone_stats:
             result.metadata["zone_travel_stats"] = zone_stats
-        logging.info(f"Computed travel data for {len(customer_travel_data)} customers and {len(zone_stats)} zones")
+        logger.info(f"Computed travel data for {len(customer_travel_data)} customers and {len(zone_stats)} zones")
 
     if payload.balance:
         balanced = balance_assignments(
@@ -273,8 +274,7 @@ def process_zoning_request(payload: ZoningRequest, *, persist: bool = True) -> Z
             )
         except Exception as exc:
             # Log error but don't fail the entire request
-            import logging
-            logging.warning(f"Failed to save zones to database: {exc}")
+            logger.warning(f"Failed to save zones to database: {exc}")
         
         # Also save to files (backup)
         storage = FileStorage()
@@ -293,8 +293,7 @@ def process_zoning_request(payload: ZoningRequest, *, persist: bool = True) -> Z
             save_easyterritory_json(easyterritory_features, run_dir / "zones.geojson")
         except Exception as exc:
             # Log error but don't fail the entire request
-            import logging
-            logging.warning(f"Failed to generate GeoJSON export: {exc}")
+            logger.warning(f"Failed to generate GeoJSON export: {exc}")
 
     return response
 
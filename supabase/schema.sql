@@ -27,6 +27,7 @@ CREATE TABLE IF NOT EXISTS customers (
 
 -- Indexes for common queries
 CREATE INDEX IF NOT EXISTS idx_customers_city ON customers(city);
+CREATE INDEX IF NOT EXISTS idx_customers_city_lower ON customers(lower(city));
 CREATE INDEX IF NOT EXISTS idx_customers_zone ON customers(zone);
 CREATE INDEX IF NOT EXISTS idx_customers_agent ON customers(agent_id);
 CREATE INDEX IF NOT EXISTS idx_customers_location ON customers USING GIST (
@@ -50,6 +51,8 @@ CREATE TABLE IF NOT EXISTS zones (
 
 CREATE INDEX IF NOT EXISTS idx_zones_geometry ON zones USING GIST(geometry);
 CREATE INDEX IF NOT EXISTS idx_zones_depot ON zones(depot_code);
+-- Finds the zone(s) holding a customer (metadata->'customer_ids' ? id / @> '["id"]')
+CREATE INDEX IF NOT EXISTS idx_zones_customer_ids ON zones USING GIN ((metadata->'customer_ids'));
 
 -- Trigger to convert WKT to geometry
 CREATE OR REPLACE FUNCTION convert_wkt_to_geometry()
@@ -68,6 +71,24 @@ CREATE TRIGGER zones_convert_wkt
     FOR EACH ROW
     EXECUTE FUNCTION convert_wkt_to_geometry();
 
+-- customer_count is derived from metadata.customer_ids so clients never send it
+CREATE OR REPLACE FUNCTION sync_zone_customer_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF jsonb_typeof(NEW.metadata->'customer_ids') = 'array' THEN
+        NEW.customer_count := jsonb_array_length(NEW.metadata->'customer_ids');
+    ELSE
+        NEW.customer_count := 0;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER zones_sync_customer_count
+    BEFORE INSERT OR UPDATE ON zones
+    FOR EACH ROW
+    EXECUTE FUNCTION sync_zone_customer_count();
+
 -- ============================================
 -- ROUTES TABLE
 -- ============================================
@@ -86,6 +107,17 @@ CREATE TABLE IF NOT EXISTS routes (
 
 CREATE INDEX IF NOT EXISTS idx_routes_zone ON routes(zone_id);
 CREATE INDEX IF NOT EXISTS idx_routes_date ON routes(route_date);
+-- Routes used to be saved with delete + insert, which could leave several rows per
+-- vehicle and zone; keep only the newest of each before building the unique index
+DELETE FROM routes AS older
+USING routes AS newer
+WHERE older.zone_id = newer.zone_id
+  AND older.vehicle_id = newer.vehicle_id
+  AND (COALESCE(older.created_at, '-infinity'), older.id)
+      < (COALESCE(newer.created_at, '-infinity'), newer.id);
+
+-- One route per vehicle and zone; save_routes_to_database upserts on this key
+CREATE UNIQUE INDEX IF NOT EXISTS routes_zone_vehicle_uniq ON routes(zone_id, vehicle_id);
 
 -- ============================================
 -- DEPOTS TABLE
@@ -152,6 +184,14 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Get customers whose city matches any of the given lowercase names
+CREATE OR REPLACE FUNCTION get_customers_in_city(p_cities TEXT[])
+RETURNS SETOF customers AS $$
+    SELECT *
+    FROM customers
+    WHERE lower(city) = ANY(p_cities);
+$$ LANGUAGE sql STABLE;
+
 -- Get customers within a zone polygon
 CREATE OR REPLACE FUNCTION get_customers_in_zone(zone_id_param UUID)
 RETURNS SETOF customers AS $$
@@ -195,6 +235,396 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Insert many zones in one statement; expects objects shaped like the zones table
+-- (name, geometry_wkt, depot_code, method, metadata)
+CREATE OR REPLACE FUNCTION insert_zones_with_geometry(zones JSONB)
+RETURNS SETOF UUID AS $$
+BEGIN
+    RETURN QUERY
+    INSERT INTO zones (name, geometry, depot_code, method, metadata)
+    SELECT
+        z.name,
+        ST_GeomFromText(z.geometry_wkt, 4326),
+        z.depot_code,
+        z.method,
+        COALESCE(z.metadata, '{}'::jsonb)
+    FROM jsonb_to_recordset(zones) AS z(
+        name TEXT,
+        geometry_wkt TEXT,
+        depot_code TEXT,
+        method TEXT,
+        metadata JSONB
+    )
+    RETURNING id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Customers (optionally of one city) that no zone lists in metadata.customer_ids;
+-- zones of every city count, and the GIN index on customer_ids serves the probe
+CREATE OR REPLACE FUNCTION get_unassigned_customers(p_city TEXT DEFAULT NULL)
+RETURNS TABLE (customer_id TEXT) AS $$
+    SELECT c.customer_id
+    FROM customers c
+    WHERE (p_city IS NULL OR c.city = p_city)
+      AND NOT EXISTS (
+          SELECT 1 FROM zones z
+          WHERE z.metadata->'customer_ids' ? c.customer_id
+      );
+$$ LANGUAGE sql STABLE;
+
+-- Replace zones by name in one transaction: every existing row whose name is in the
+-- payload is deleted (their routes cascade), then the payload rows are inserted.
+-- Takes the same objects as insert_zones_with_geometry; returns the number inserted
+CREATE OR REPLACE FUNCTION replace_zones(p_zones JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    inserted INTEGER;
+BEGIN
+    DELETE FROM zones
+    WHERE name IN (SELECT r.name FROM jsonb_to_recordset(p_zones) AS r(name TEXT));
+    
+    INSERT INTO zones (name, geometry, depot_code, method, metadata)
+    SELECT
+        z.name,
+        ST_GeomFromText(z.geometry_wkt, 4326),
+        z.depot_code,
+        z.method,
+        COALESCE(z.metadata, '{}'::jsonb)
+    FROM jsonb_to_recordset(p_zones) AS z(
+        name TEXT,
+        geometry_wkt TEXT,
+        depot_code TEXT,
+        method TEXT,
+        metadata JSONB
+    );
+    GET DIAGNOSTICS inserted = ROW_COUNT;
+    RETURN inserted;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Zones newest first with metadata.customer_travel_data (the bulk of the metadata) stripped
+CREATE OR REPLACE FUNCTION get_zones_without_travel_data(
+    p_city TEXT DEFAULT NULL,
+    p_method TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    id UUID,
+    name TEXT,
+    geometry GEOMETRY,
+    geometry_wkt TEXT,
+    depot_code TEXT,
+    customer_count INTEGER,
+    method TEXT,
+    metadata JSONB,
+    created_at TIMESTAMPTZ
+) AS $$
+    SELECT
+        z.id,
+        z.name,
+        z.geometry,
+        z.geometry_wkt,
+        z.depot_code,
+        z.customer_count,
+        z.method,
+        z.metadata - 'customer_travel_data',
+        z.created_at
+    FROM zones z
+    WHERE (p_city IS NULL OR z.metadata @> jsonb_build_object('city', p_city))
+      AND (p_method IS NULL OR z.method = p_method)
+    ORDER BY z.created_at DESC;
+$$ LANGUAGE sql STABLE;
+
+-- Replace the polygon of the most recent zone with this name and refresh the
+-- coordinate backup in its metadata; returns the saved values for verification
+CREATE OR REPLACE FUNCTION update_zone_geometry(zone_name TEXT, wkt TEXT, coords JSONB)
+RETURNS TABLE (geometry_wkt TEXT, metadata JSONB) AS $$
+    UPDATE zones z
+    SET
+        geometry_wkt = wkt,
+        metadata = CASE
+            WHEN jsonb_typeof(z.metadata) = 'object'
+                THEN z.metadata || jsonb_build_object('coordinates', coords, 'geometry_updated', true)
+            ELSE z.metadata
+        END
+    WHERE z.id = (
+        SELECT latest.id FROM zones latest
+        WHERE latest.name = zone_name
+        ORDER BY latest.created_at DESC
+        LIMIT 1
+    )
+    RETURNING z.geometry_wkt, z.metadata;
+$$ LANGUAGE sql;
+
+-- Remove one customer from the most recent zone with this name. Returns no row if the
+-- zone does not exist, otherwise whether the customer was removed and the new count
+CREATE OR REPLACE FUNCTION unassign_customer(p_name TEXT, p_cid TEXT)
+RETURNS TABLE (removed BOOLEAN, customer_count INTEGER) AS $$
+    WITH target AS (
+        SELECT
+            z.id,
+            COALESCE(z.metadata, '{}'::jsonb) AS metadata,
+            COALESCE(z.metadata->'customer_ids', '[]'::jsonb) AS customer_ids
+        FROM zones z
+        WHERE z.name = p_name
+        ORDER BY z.created_at DESC
+        LIMIT 1
+    ), updated AS (
+        UPDATE zones z
+        SET metadata = jsonb_set(t.metadata, '{customer_ids}', t.customer_ids - p_cid)
+        FROM target t
+        WHERE z.id = t.id
+          AND jsonb_typeof(t.metadata) = 'object'
+          AND jsonb_typeof(t.customer_ids) = 'array'
+          AND t.customer_ids ? p_cid
+        RETURNING z.customer_count
+    )
+    SELECT EXISTS (SELECT 1 FROM updated), (SELECT u.customer_count FROM updated u)
+    FROM target;
+$$ LANGUAGE sql;
+
+-- Batch form of unassign_customer: pairs is a JSON array of {"zone", "customer"} objects.
+-- Each named zone (its most recent row) is updated once; returns the new counts
+CREATE OR REPLACE FUNCTION unassign_customers(pairs JSONB)
+RETURNS TABLE (zone_name TEXT, customer_count INTEGER) AS $$
+    WITH requested AS (
+        SELECT p.zone, array_agg(p.customer) AS customer_ids
+        FROM jsonb_to_recordset(pairs) AS p(zone TEXT, customer TEXT)
+        GROUP BY p.zone
+    ), target AS (
+        SELECT DISTINCT ON (z.name) z.id, r.customer_ids
+        FROM zones z
+        JOIN requested r ON r.zone = z.name
+        ORDER BY z.name, z.created_at DESC
+    )
+    UPDATE zones z
+    SET metadata = jsonb_set(z.metadata, '{customer_ids}', (z.metadata->'customer_ids') - t.customer_ids)
+    FROM target t
+    WHERE z.id = t.id
+      AND jsonb_typeof(z.metadata->'customer_ids') = 'array'
+    RETURNING z.name, z.customer_count;
+$$ LANGUAGE sql;
+
+-- Move a customer into the most recent zone with this name in one transaction: it is
+-- removed from every other zone holding it, then appended to the target. Returns no row
+-- if the zone does not exist, otherwise whether it was added and the new count
+CREATE OR REPLACE FUNCTION assign_customer_to_zone(p_customer TEXT, p_zone TEXT)
+RETURNS TABLE (added BOOLEAN, customer_count INTEGER) AS $$
+DECLARE
+    target_id UUID;
+    target_metadata JSONB;
+    target_ids JSONB;
+BEGIN
+    SELECT z.id, z.metadata INTO target_id, target_metadata
+    FROM zones z
+    WHERE z.name = p_zone
+    ORDER BY z.created_at DESC
+    LIMIT 1;
+    
+    IF target_id IS NULL THEN
+        RETURN;
+    END IF;
+    
+    UPDATE zones z
+    SET metadata = jsonb_set(z.metadata, '{customer_ids}', (z.metadata->'customer_ids') - p_customer)
+    WHERE z.id <> target_id
+      AND z.metadata->'customer_ids' ? p_customer
+      AND jsonb_typeof(z.metadata->'customer_ids') = 'array';
+    
+    IF jsonb_typeof(target_metadata) IS DISTINCT FROM 'object' THEN
+        target_metadata := '{}'::jsonb;
+    END IF;
+    target_ids := target_metadata->'customer_ids';
+    IF jsonb_typeof(target_ids) IS DISTINCT FROM 'array' THEN
+        target_ids := '[]'::jsonb;
+    END IF;
+    
+    IF target_ids ? p_customer THEN
+        RETURN QUERY SELECT false, jsonb_array_length(target_ids);
+        RETURN;
+    END IF;
+    
+    RETURN QUERY
+    UPDATE zones z
+    SET metadata = jsonb_set(target_metadata, '{customer_ids}', target_ids || to_jsonb(p_customer))
+    WHERE z.id = target_id
+    RETURNING true, z.customer_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Empty customer_ids on every row with one of these names (run before deleting zones).
+-- Returns each cleared zone with the number of customers it held
+CREATE OR REPLACE FUNCTION clear_zone_customers(p_names TEXT[])
+RETURNS TABLE (zone_name TEXT, previous_count INTEGER) AS $$
+    WITH target AS (
+        SELECT z.id, jsonb_array_length(z.metadata->'customer_ids') AS previous_count
+        FROM zones z
+        WHERE z.name = ANY(p_names)
+          AND jsonb_typeof(z.metadata->'customer_ids') = 'array'
+          AND z.metadata->'customer_ids' <> '[]'::jsonb
+        FOR UPDATE
+    )
+    UPDATE zones z
+    SET metadata = jsonb_set(z.metadata, '{customer_ids}', '[]'::jsonb)
+    FROM target t
+    WHERE z.id = t.id
+    RETURNING z.name, t.previous_count;
+$$ LANGUAGE sql;
+
+-- Delete every row with one of these names in one statement, returning the customers
+-- each deleted row held so the caller can reassign them
+CREATE OR REPLACE FUNCTION delete_zones_with_customers(p_names TEXT[])
+RETURNS TABLE (deleted_name TEXT, prev_customer_ids JSONB) AS $$
+    DELETE FROM zones z
+    WHERE z.name = ANY(p_names)
+    RETURNING
+        z.name,
+        CASE WHEN jsonb_typeof(z.metadata->'customer_ids') = 'array'
+             THEN z.metadata->'customer_ids'
+             ELSE '[]'::jsonb
+        END;
+$$ LANGUAGE sql;
+
+-- Drop a customer's stops from a route (of the most recent zone with this name) in
+-- one statement. Returns false if the zone, the route or the customer is not found
+CREATE OR REPLACE FUNCTION remove_customer_from_route(p_zone_name TEXT, p_vehicle_id TEXT, p_customer_id TEXT)
+RETURNS BOOLEAN AS $$
+    WITH target AS (
+        SELECT r.id
+        FROM routes r
+        WHERE r.zone_id = (
+                SELECT z.id FROM zones z
+                WHERE z.name = p_zone_name
+                ORDER BY z.created_at DESC
+                LIMIT 1
+            )
+          AND r.vehicle_id = p_vehicle_id
+        LIMIT 1
+    ), updated AS (
+        UPDATE routes r
+        SET stops = COALESCE(
+            (SELECT jsonb_agg(e.stop ORDER BY e.ord)
+             FROM jsonb_array_elements(r.stops) WITH ORDINALITY AS e(stop, ord)
+             WHERE e.stop->>'customer_id' IS DISTINCT FROM p_customer_id),
+            '[]'::jsonb
+        )
+        FROM target t
+        WHERE r.id = t.id
+          AND r.stops @> jsonb_build_array(jsonb_build_object('customer_id', p_customer_id))
+        RETURNING r.id
+    )
+    SELECT EXISTS (SELECT 1 FROM updated);
+$$ LANGUAGE sql;
+
+-- Resolve the zone routes are saved under (most recent by name, else by city and a name
+-- substring) and store start_from_depot in its metadata when given. No row if not found
+CREATE OR REPLACE FUNCTION resolve_and_touch_zone(p_zone_name TEXT, p_city TEXT, p_start_from_depot BOOLEAN DEFAULT NULL)
+RETURNS TABLE (zone_id UUID, zone_name TEXT) AS $$
+DECLARE
+    found_id UUID;
+    found_name TEXT;
+BEGIN
+    SELECT z.id, z.name INTO found_id, found_name
+    FROM zones z
+    WHERE z.name = p_zone_name
+    ORDER BY z.created_at DESC
+    LIMIT 1;
+    
+    IF found_id IS NULL THEN
+        SELECT z.id, z.name INTO found_id, found_name
+        FROM zones z
+        WHERE z.metadata->>'city' = p_city
+          AND z.name ILIKE '%' || p_zone_name || '%'
+        ORDER BY z.created_at DESC
+        LIMIT 1;
+    END IF;
+    
+    IF found_id IS NULL THEN
+        RETURN;
+    END IF;
+    
+    IF p_start_from_depot IS NOT NULL THEN
+        UPDATE zones z
+        SET metadata = jsonb_set(
+            CASE WHEN jsonb_typeof(z.metadata) = 'object' THEN z.metadata ELSE '{}'::jsonb END,
+            '{start_from_depot}',
+            to_jsonb(p_start_from_depot)
+        )
+        WHERE z.id = found_id;
+    END IF;
+    
+    RETURN QUERY SELECT found_id, found_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Move a customer's stop from one route to the end of another route of the same zone in
+-- one transaction. Returns false if the zone, either route or the customer is not found
+CREATE OR REPLACE FUNCTION transfer_customer(p_zone_name TEXT, p_from_vehicle_id TEXT, p_to_vehicle_id TEXT, p_customer_id TEXT)
+RETURNS BOOLEAN AS $$
+DECLARE
+    target_zone UUID;
+    from_id UUID;
+    from_stops JSONB;
+    to_id UUID;
+    to_stops JSONB;
+    moved_stop JSONB;
+    next_sequence INTEGER;
+BEGIN
+    IF p_from_vehicle_id = p_to_vehicle_id THEN
+        RETURN false;
+    END IF;
+    
+    SELECT z.id INTO target_zone
+    FROM zones z
+    WHERE z.name = p_zone_name
+    ORDER BY z.created_at DESC
+    LIMIT 1;
+    
+    SELECT r.id, r.stops INTO from_id, from_stops
+    FROM routes r
+    WHERE r.zone_id = target_zone AND r.vehicle_id = p_from_vehicle_id
+    LIMIT 1
+    FOR UPDATE;
+    
+    SELECT r.id, r.stops INTO to_id, to_stops
+    FROM routes r
+    WHERE r.zone_id = target_zone AND r.vehicle_id = p_to_vehicle_id
+    LIMIT 1
+    FOR UPDATE;
+    
+    IF from_id IS NULL OR to_id IS NULL THEN
+        RETURN false;
+    END IF;
+    
+    SELECT e.stop INTO moved_stop
+    FROM jsonb_array_elements(from_stops) WITH ORDINALITY AS e(stop, ord)
+    WHERE e.stop->>'customer_id' = p_customer_id
+    ORDER BY e.ord
+    LIMIT 1;
+    
+    IF moved_stop IS NULL THEN
+        RETURN false;
+    END IF;
+    
+    SELECT COALESCE(MAX((e.stop->>'sequence')::INTEGER), 0) + 1 INTO next_sequence
+    FROM jsonb_array_elements(to_stops) AS e(stop);
+    
+    UPDATE routes
+    SET stops = COALESCE(
+        (SELECT jsonb_agg(e.stop ORDER BY e.ord)
+         FROM jsonb_array_elements(from_stops) WITH ORDINALITY AS e(stop, ord)
+         WHERE e.stop->>'customer_id' IS DISTINCT FROM p_customer_id),
+        '[]'::jsonb
+    )
+    WHERE id = from_id;
+    
+    UPDATE routes
+    SET stops = to_stops || jsonb_build_array(jsonb_set(moved_stop, '{sequence}', to_jsonb(next_sequence)))
+    WHERE id = to_id;
+    
+    RETURN true;
+END;
+$$ LANGUAGE plpgsql;
+
 -- ============================================
 -- ROW LEVEL SECURITY (Optional)
 -- ============================================
@@ -0,0 +1,156 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from src.app.data import customers_repository
+from src.app.models.domain import Depot
+
+
+CSV_HEADER = "CusId,CusName,Latitude,Longitude,City,Zone,Status\n"
+
+
+@pytest.fixture(autouse=True)
+def clear_customer_cache():
+    customers_repository.clear_customer_cache()
+    yield
+    customers_repository.clear_customer_cache()
+
+
+def _write_csv(path: Path, rows: str) -> Path:
+    path.write_text(CSV_HEADER + rows, encoding="utf-8")
+    return path
+
+
+def test_load_customers_skips_rows_without_coordinates(tmp_path: Path) -> None:
+    csv_path = _write_csv(
+        tmp_path / "customers.csv",
+        "C1,Alpha,21.5,39.2,Jeddah,Z1,ACTIVE\n"
+        "C2,Beta,,39.3,Jeddah,Z1,ACTIVE\n",
+    )
+
+    customers = customers_repository.load_customers(csv_path)
+
+    assert [customer.customer_id for customer in customers] == ["C1"]
+    assert customers[0].city == "Jeddah"
+    assert customers[0].latitude == pytest.approx(21.5)
+
+
+def test_load_customers_reuses_binary_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    csv_path = _write_csv(tmp_path / "customers.csv", "C1,Alpha,21.5,39.2,Jeddah,Z1,ACTIVE\n")
+
+    first = customers_repository.load_customers(csv_path)
+    assert customers_repository._customer_cache_path(csv_path).exists()
+
+    customers_repository.clear_customer_cache()
+    monkeypatch.setattr(customers_repository, "csv", None)  # parsing the CSV would now fail
+    second = customers_repository.load_customers(csv_path)
+
+    assert second == first
+
+
+def test_iter_customers_for_location_matches_variants_bounds_and_zone(tmp_path: Path) -> None:
+    csv_path = _write_csv(
+        tmp_path / "customers.csv",
+        "C1,Alpha,21.5,39.2,Jeddah,Z1,ACTIVE\n"
+        "C2,Beta,21.6,39.3,جدة,Z2,ACTIVE\n"
+        "C3,Gamma,24.7,46.7,Jeddah,Z1,ACTIVE\n"  # outside the Jeddah bounding box
+        "C4,Delta,24.7,46.7,Riyadh,JEDDAH,ACTIVE\n"  # zone code match only
+        "C5,Eps,24.7,46.7,Riyadh,R1,ACTIVE\n",
+    )
+
+    jeddah = [c.customer_id for c in customers_repository.iter_customers_for_location(" JEDDAH ", csv_path)]
+    zone = [c.customer_id for c in customers_repository.iter_customers_for_location("z1", csv_path)]
+
+    assert jeddah == ["C1", "C2", "C4"]
+    assert zone == ["C1", "C3"]
+
+
+def test_load_customers_keeps_finance_columns_without_raw_row(tmp_path: Path) -> None:
+    csv_path = tmp_path / "customers.csv"
+    csv_path.write_text(
+        "CusId,CusName,Latitude,Longitude,City,PaymentStatus\n"
+        "C1,Alpha,21.5,39.2,Jeddah,past_due\n",
+        encoding="utf-8",
+    )
+
+    (customer,) = customers_repository.load_customers(csv_path)
+
+    assert customer.raw is None
+    assert customer.payment_status == "past_due"
+
+
+def test_load_customers_ignores_cache_when_source_changes(tmp_path: Path) -> None:
+    csv_path = _write_csv(tmp_path / "customers.csv", "C1,Alpha,21.5,39.2,Jeddah,Z1,ACTIVE\n")
+    customers_repository.load_customers(csv_path)
+
+    _write_csv(csv_path, "C1,Alpha,21.5,39.2,Jeddah,Z1,ACTIVE\nC2,Beta,21.6,39.3,Jeddah,Z1,ACTIVE\n")
+    customers_repository.clear_customer_cache()
+
+    assert [c.customer_id for c in customers_repository.load_customers(csv_path)] == ["C1", "C2"]
+
+
+def test_load_customers_cache_can_be_disabled(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(customers_repository.settings, "customer_cache_enabled", False)
+    csv_path = _write_csv(tmp_path / "customers.csv", "C1,Alpha,21.5,39.2,Jeddah,Z1,ACTIVE\n")
+
+    customers_repository.load_customers(csv_path)
+
+    assert not customers_repository._customer_cache_path(csv_path).exists()
+
+
+def test_load_customers_reloads_changed_file_after_ttl(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    csv_path = _write_csv(tmp_path / "customers.csv", "C1,Alpha,21.5,39.2,Jeddah,Z1,ACTIVE\n")
+    first = customers_repository.load_customers(csv_path)
+    assert customers_repository.load_customers(csv_path) is first
+
+    monkeypatch.setattr(customers_repository.settings, "data_cache_ttl_seconds", 0.0)
+    assert customers_repository.load_customers(csv_path) is first  # unchanged mtime keeps the cached tuple
+
+    _write_csv(csv_path, "C1,Alpha,21.5,39.2,Jeddah,Z1,ACTIVE\nC2,Beta,21.6,39.3,Jeddah,Z1,ACTIVE\n")
+    os.utime(csv_path, ns=(0, csv_path.stat().st_mtime_ns + 1_000_000))
+
+    assert [c.customer_id for c in customers_repository.load_customers(csv_path)] == ["C1", "C2"]
+
+
+def test_resolve_depot_uses_aliases_and_refreshes_with_lookup(monkeypatch: pytest.MonkeyPatch) -> None:
+    jeddah = Depot(code="Jeddah", latitude=21.3, longitude=39.2)
+    riyadh = Depot(code="Riyadh", latitude=24.6, longitude=46.8)
+    monkeypatch.setattr(customers_repository, "get_depots", lambda: (jeddah,))
+    customers_repository.clear_dc_lookup_cache()
+
+    assert customers_repository.resolve_depot(" JEDDAH ") is jeddah
+    assert customers_repository.resolve_depot("mecca") is jeddah
+    assert customers_repository.resolve_depot("الرياض") is None
+
+    monkeypatch.setattr(customers_repository, "get_depots", lambda: (jeddah, riyadh))
+    customers_repository.clear_dc_lookup_cache()
+
+    assert customers_repository.resolve_depot("الرياض") is riyadh
+    customers_repository.clear_dc_lookup_cache()
+
+
+def test_iter_customers_for_location_memoises_until_dataset_reloads(tmp_path: Path) -> None:
+    csv_path = _write_csv(tmp_path / "customers.csv", "C1,Alpha,21.5,39.2,Jeddah,Z1,ACTIVE\n")
+
+    first = list(customers_repository.iter_customers_for_location("Jeddah", csv_path))
+    memo = customers_repository._customer_columns(csv_path).matches
+    assert set(memo) == {"jeddah"}
+    assert list(customers_repository.iter_customers_for_location(" jeddah", csv_path)) == first
+
+    _write_csv(csv_path, "C1,Alpha,21.5,39.2,Jeddah,Z1,ACTIVE\nC2,Beta,21.6,39.3,Jeddah,Z1,ACTIVE\n")
+    customers_repository.clear_customer_cache()
+
+    assert [c.customer_id for c in customers_repository.iter_customers_for_location("Jeddah", csv_path)] == ["C1", "C2"]
+
+
+def test_load_customers_survives_failed_cache_write(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    csv_path = _write_csv(tmp_path / "customers.csv", "C1,Alpha,21.5,39.2,Jeddah,Z1,ACTIVE\n")
+
+    def failing_dump(*args, **kwargs):
+        raise customers_repository.pickle.PicklingError("cannot pickle")
+
+    monkeypatch.setattr(customers_repository.pickle, "dump", failing_dump)
+
+    assert [c.customer_id for c in customers_repository.load_customers(csv_path)] == ["C1"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["customers.csv"]
@@ -0,0 +1,38 @@
+import os
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from src.app.data import dc_repository
+
+
+def _write_workbook(path: Path, rows: list[tuple]) -> Path:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(("DC", "Latitude", "Longitude"))
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+    return path
+
+
+def test_load_depots_from_file_rereads_only_when_mtime_changes(tmp_path: Path) -> None:
+    workbook_path = _write_workbook(tmp_path / "depots.xlsx", [("Jeddah", 21.3, 39.2)])
+
+    first = dc_repository._load_depots_from_file(workbook_path)
+    assert dc_repository._load_depots_from_file(workbook_path) is first
+    assert [depot.code for depot in first] == ["Jeddah"]
+
+    _write_workbook(workbook_path, [("Jeddah", 21.3, 39.2), ("Riyadh", 24.6, 46.8)])
+    os.utime(workbook_path, ns=(0, workbook_path.stat().st_mtime_ns + 1_000_000))
+
+    assert [depot.code for depot in dc_repository._load_depots_from_file(workbook_path)] == ["Jeddah", "Riyadh"]
+
+
+def test_load_depots_from_file_keeps_numeric_dc_codes_and_skips_blank_rows(tmp_path: Path) -> None:
+    workbook_path = _write_workbook(tmp_path / "depots.xlsx", [(101, 21.3, 39.2), (None, 21.4, 39.3), ("Riyadh", 24, 46.8)])
+
+    depots = dc_repository._load_depots_from_file(workbook_path)
+
+    assert [depot.code for depot in depots] == ["101", "Riyadh"]
+    assert depots[1].latitude == 24.0
@@ -37,11 +37,11 @@ class DummyOSRM:
 
 @pytest.fixture(autouse=True)
 def clear_customer_cache():
-    from src.app.data.customers_repository import load_customers
+    from src.app.data.customers_repository import clear_customer_cache
 
-    load_customers.cache_clear()
+    clear_customer_cache()
     yield
-    load_customers.cache_clear()
+    clear_customer_cache()
 
 
 @pytest.fixture
@@ -123,8 +123,6 @@ def test_customer_locations_endpoint_supports_pagination(api_client: TestClient,
     def fake_loader(source=None):
         return tuple(sample_customers)
 
-    fake_loader.cache_clear = lambda: None  # mimic lru_cache API for fixtures
-
     monkeypatch.setattr(customers_repository, "load_customers", fake_loader)
 
     from src.app.services.customers import stats as customers_stats
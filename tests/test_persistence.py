@@ -1,8 +1,77 @@
 from pathlib import Path
+from types import SimpleNamespace
 
+import httpx
+import pytest
+
+from src.app.data import customers_repository
+from src.app.persistence import database
 from src.app.persistence.filesystem import FileStorage
 
 
+def _clear_database_caches() -> None:
+    database._zone_exists_cache.clear()
+    database._zone_uuid_cache.clear()
+    database._forget_zone_customers()
+    database.clear_routes_cache()
+
+
+@pytest.fixture(autouse=True)
+def clear_database_caches():
+    _clear_database_caches()
+    yield
+    _clear_database_caches()
+
+
+def _rpc_client(data) -> SimpleNamespace:
+    """Fake client whose RPCs return ``data``, recording calls in ``rpc_calls``; table access fails."""
+    rpc_calls: list[tuple] = []
+
+    def rpc(name, params):
+        rpc_calls.append((name, params))
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=data))
+
+    return SimpleNamespace(rpc=rpc, rpc_calls=rpc_calls, table=lambda name: pytest.fail("the table API should not be used"))
+
+
+def _missing_rpc(name, params):
+    """Stand-in for ``client.rpc`` on a database without the SQL function."""
+    raise RuntimeError(f"function {name} does not exist")
+
+
+class FakeQuery:
+    """Chainable PostgREST query: records each builder call as ``(method, args)`` in ``calls``.
+    
+    ``execute`` returns ``data``, or ``data(calls)`` when it is callable.
+    """
+
+    def __init__(self, data=None, calls: list[tuple] | None = None):
+        self.data = data
+        self.calls = [] if calls is None else calls
+        self.not_ = self
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self.calls.append((name, args))
+            return self
+
+        return call
+
+    def execute(self):
+        return SimpleNamespace(data=self.data(self.calls) if callable(self.data) else self.data)
+
+
+def _table_client(data=None) -> SimpleNamespace:
+    """Fake client whose tables all return ``data``; ``calls`` records ``("table", (name,))`` and every query call."""
+    calls: list[tuple] = []
+
+    def table(name):
+        calls.append(("table", (name,)))
+        return FakeQuery(data, calls)
+
+    return SimpleNamespace(table=table, calls=calls)
+
+
 def test_file_storage_creates_run_directory(tmp_path: Path) -> None:
     storage = FileStorage(root=tmp_path)
     run_dir = storage.make_run_directory(prefix="zones_test")
@@ -24,3 +93,521 @@ def test_file_storage_writes_json_and_csv(tmp_path: Path) -> None:
 
     assert summary_path.read_text(encoding="utf-8") == '{\n  "hello": "world"\n}'
     assert assignments_path.read_text(encoding="utf-8") == "a,b\n1,2\n"
+
+
+def test_wait_for_zones_deleted_stops_polling_once_zones_are_gone(monkeypatch) -> None:
+    polls: list[list[str]] = []
+
+    def fake_check(zone_ids):
+        polls.append(list(zone_ids))
+        return {zone_id: len(polls) < 2 and zone_id == "Z1" for zone_id in zone_ids}
+
+    monkeypatch.setattr(database, "check_zone_ids_exist", fake_check)
+    monkeypatch.setattr(database.time, "sleep", lambda _delay: None)
+
+    assert database._wait_for_zones_deleted(["Z1", "Z2"]) == []
+    assert polls == [["Z1", "Z2"], ["Z1"]]
+
+
+def test_update_zone_geometry_falls_back_to_one_update(monkeypatch) -> None:
+    calls: list[tuple] = []
+
+    class FakeTable:
+        def select(self, *columns):
+            calls.append(("select", columns))
+            return FakeQuery([{"id": "uuid-1", "metadata": {"city": "Jeddah"}}])
+
+        def update(self, values, **kwargs):
+            calls.append(("update", values))
+            return FakeQuery([values])
+
+    class FakeClient:
+        rpc = staticmethod(_missing_rpc)
+
+        def table(self, name):
+            return FakeTable()
+
+    monkeypatch.setattr(database, "get_supabase_client", lambda: FakeClient())
+    coordinates = [(21.0, 39.0), (21.0, 39.1), (21.1, 39.1)]
+
+    assert database.update_zone_geometry("Z1", coordinates) is True
+    assert [kind for kind, _ in calls if kind == "update"] == ["update"]
+    update = next(values for kind, values in calls if kind == "update")
+    assert update["metadata"] == {"city": "Jeddah", "coordinates": coordinates, "geometry_updated": True}
+    assert update["geometry_wkt"].startswith("POLYGON")
+
+
+def test_update_zone_geometry_retries_only_transient_errors(monkeypatch) -> None:
+    attempts: list[str] = []
+    sleeps: list[float] = []
+
+    def flaky_write(supabase, zone_id, geometry_wkt, coordinates):
+        attempts.append(zone_id)
+        if zone_id == "bad":
+            raise ValueError("invalid input syntax")
+        if len(attempts) < 3:
+            raise httpx.ConnectError("[Errno -3] Temporary failure in name resolution")
+        return {"geometry_wkt": geometry_wkt, "metadata": {}}
+
+    monkeypatch.setattr(database, "get_supabase_client", lambda: object())
+    monkeypatch.setattr(database, "_write_zone_geometry", flaky_write)
+    monkeypatch.setattr(database.time, "sleep", sleeps.append)
+    coordinates = [(21.0, 39.0), (21.0, 39.1), (21.1, 39.1)]
+
+    assert database.update_zone_geometry("Z1", coordinates) is True
+    assert sleeps == [1, 2]
+
+    attempts.clear()
+    assert database.update_zone_geometry("bad", coordinates) is False
+    assert attempts == ["bad"]
+    assert sleeps == [1, 2]
+
+
+def test_get_zones_without_travel_data_falls_back_to_full_read(monkeypatch) -> None:
+    client = _table_client([{"name": "Z1", "metadata": {"city": "Jeddah", "customer_travel_data": {"C1": {}}}}])
+    client.rpc = _missing_rpc
+    calls = client.calls
+    monkeypatch.setattr(database, "get_supabase_client", lambda: client)
+
+    assert database.get_zones_without_travel_data(city="Jeddah") == [{"name": "Z1", "metadata": {"city": "Jeddah"}}]
+    assert ("select", ("*",)) in calls
+
+    calls.clear()
+    database.get_zones_from_database(columns="id", limit=50, offset=100)
+    assert ("select", ("id",)) in calls
+    assert ("range", (100, 149)) in calls
+    assert [args for name, args in calls if name == "order"] == [("created_at",), ("id",)]
+
+
+def test_unassign_customers_from_zones_updates_each_zone_once(monkeypatch) -> None:
+    updates: list[dict] = []
+
+    class FakeTable:
+        def select(self, *columns):
+            return FakeQuery([
+                {"id": "new", "name": "Z1", "metadata": {"customer_ids": ["C1", "C2", "C3"]}},
+                {"id": "old", "name": "Z1", "metadata": {"customer_ids": ["C1"]}},
+                {"id": "z2", "name": "Z2", "metadata": {"customer_ids": ["C4"]}},
+            ])
+
+        def update(self, values):
+            updates.append(values)
+            return FakeQuery()
+
+    class FakeClient:
+        rpc = staticmethod(_missing_rpc)
+
+        def table(self, name):
+            return FakeTable()
+
+    monkeypatch.setattr(database, "get_supabase_client", lambda: FakeClient())
+
+    counts = database.unassign_customers_from_zones([("C1", "Z1"), ("C3", "Z1"), ("C4", "Z2")])
+
+    assert counts == {"Z1": 1, "Z2": 0}
+    assert [update["metadata"]["customer_ids"] for update in updates] == [["C2"], []]
+
+
+def test_assign_customer_to_zone_fallback_writes_all_zones_in_one_upsert(monkeypatch) -> None:
+    upserts: list[list[dict]] = []
+
+    def zones(calls):
+        # The zones currently holding the customer are found with a JSON containment filter
+        if any(name == "filter" for name, _ in calls):
+            return [{"id": "old", "name": "Z1", "metadata": {"customer_ids": ["C1", "C2"]}}]
+        return [{"id": "target", "name": "Z2", "metadata": {"customer_ids": ["C3"]}}]
+
+    class FakeTable:
+        def select(self, *columns):
+            return FakeQuery(zones)
+
+        def upsert(self, rows, **kwargs):
+            upserts.append(rows)
+            return FakeQuery(None)
+
+        def update(self, values):
+            raise AssertionError("zones should be written with a single upsert")
+
+    class FakeClient:
+        rpc = staticmethod(_missing_rpc)
+
+        def table(self, name):
+            return FakeTable()
+
+    monkeypatch.setattr(database, "get_supabase_client", lambda: FakeClient())
+
+    assert database.assign_customer_to_zone("C1", "Z2") is True
+    assert upserts == [[
+        {"id": "old", "name": "Z1", "metadata": {"customer_ids": ["C2"]}},
+        {"id": "target", "name": "Z2", "metadata": {"customer_ids": ["C3", "C1"]}},
+    ]]
+
+
+def test_iter_table_pages_follows_returned_page_sizes(monkeypatch) -> None:
+    rows = [{"id": i} for i in range(5)]
+    ranges: list[tuple[int, int]] = []
+
+    class CappedPageQuery:
+        def select(self, *columns, count=None):
+            self._count = count
+            return self
+
+        def order(self, column):
+            return self
+
+        def range(self, start, end):
+            ranges.append((start, end))
+            self._page = rows[start:min(end + 1, start + 2)]  # server caps pages at 2 rows
+            return self
+
+        def execute(self):
+            return SimpleNamespace(data=self._page, count=len(rows) if self._count else None)
+
+    client = SimpleNamespace(table=lambda name: CappedPageQuery())
+
+    pages = list(database._iter_table_pages(client, "zones", "id", page_size=4))
+
+    assert [row["id"] for page in pages for row in page] == [0, 1, 2, 3, 4]
+    assert ranges == [(0, 3), (2, 5), (4, 7)]
+
+
+def test_resolve_zone_uuid_caches_until_zone_is_forgotten() -> None:
+    lookups: list[str] = []
+    client = _table_client(lambda calls: lookups.append("zones") or [{"id": f"uuid-{len(lookups)}"}])
+
+    assert database._resolve_zone_uuid(client, "Z1") == "uuid-1"
+    assert database._resolve_zone_uuid(client, "Z1") == "uuid-1"
+    assert lookups == ["zones"]
+
+    database._forget_zone_ids(["Z1"])
+    assert database._resolve_zone_uuid(client, "Z1") == "uuid-2"
+
+
+def test_delete_zones_issues_one_delete_without_verification_reads(monkeypatch) -> None:
+    calls: list[tuple] = []
+
+    class DeleteQuery:
+        def __init__(self, kind):
+            self.kind = kind
+
+        def delete(self, **kwargs):
+            calls.append(("delete", kwargs["returning"]))
+            return DeleteQuery("delete")
+
+        def select(self, *columns, **kwargs):
+            calls.append(("select", kwargs.get("head")))
+            return DeleteQuery("select")
+
+        def in_(self, column, values):
+            assert (column, values) == ("name", ["Z1", "Z2"])
+            return self
+
+        def execute(self):
+            return SimpleNamespace(data=[], count=3 if self.kind == "delete" else 0)
+
+    client = SimpleNamespace(table=lambda name: DeleteQuery("table"))
+    monkeypatch.setattr(database, "get_supabase_client", lambda: client)
+    monkeypatch.setattr(database.time, "sleep", lambda seconds: pytest.fail("delete_zones should not sleep"))
+
+    assert database.delete_zones(["Z1", "Z2"]) is True
+    assert calls == [("delete", database.ReturnMethod.minimal)]
+
+    calls.clear()
+    assert database.delete_zones(["Z1", "Z2"], verify=True) is True
+    assert calls == [("delete", database.ReturnMethod.minimal), ("select", None)]
+
+
+def test_unassign_all_customers_from_zones_clears_zones_with_one_rpc(monkeypatch) -> None:
+    client = _rpc_client([{"zone_name": "Z1", "previous_count": 2}])
+    monkeypatch.setattr(database, "get_supabase_client", lambda: client)
+
+    assert database.unassign_all_customers_from_zones(["Z1", "Z2"]) is True
+    assert client.rpc_calls == [("clear_zone_customers", {"p_names": ["Z1", "Z2"]})]
+
+
+def test_delete_zones_with_customers_returns_customers_from_one_rpc(monkeypatch) -> None:
+    rows = [
+        {"deleted_name": "Z1", "prev_customer_ids": ["C1", "C2"]},
+        {"deleted_name": "Z1", "prev_customer_ids": ["C2", "C3"]},  # older duplicate record
+        {"deleted_name": "Z2", "prev_customer_ids": []},
+    ]
+    client = _rpc_client(rows)
+    monkeypatch.setattr(database, "get_supabase_client", lambda: client)
+
+    assert database.delete_zones_with_customers(["Z1", "Z2"]) == ["C1", "C2", "C3"]
+    assert client.rpc_calls == [("delete_zones_with_customers", {"p_names": ["Z1", "Z2"]})]
+
+
+def test_upsert_zone_routes_upserts_then_drops_stale_vehicles(monkeypatch) -> None:
+    calls: list[tuple] = []
+
+    class UpsertQuery:
+        def __init__(self):
+            self.not_ = self
+
+        def upsert(self, rows, **kwargs):
+            calls.append(("upsert", [row["vehicle_id"] for row in rows], kwargs["on_conflict"]))
+            assert len({row["created_at"] for row in rows}) == 1
+            return self
+
+        def delete(self, **kwargs):
+            calls.append(("delete",))
+            return self
+
+        def eq(self, column, value):
+            calls.append(("eq", column, value))
+            return self
+
+        def in_(self, column, values):
+            calls.append(("not_in", column, values))
+            return self
+
+        def execute(self):
+            return SimpleNamespace(data=[])
+
+    client = SimpleNamespace(table=lambda name: UpsertQuery())
+    routes = [{"zone_id": "uuid-1", "vehicle_id": "R1"}, {"zone_id": "uuid-1", "vehicle_id": "R2"}]
+
+    assert database._upsert_zone_routes(client, "uuid-1", routes) is True
+    assert calls == [
+        ("upsert", ["R1", "R2"], "zone_id,vehicle_id"),
+        ("delete",),
+        ("eq", "zone_id", "uuid-1"),
+        ("not_in", "vehicle_id", ["R1", "R2"]),
+    ]
+
+
+def test_split_customer_stops_keeps_order_and_drops_every_match() -> None:
+    stops = [
+        {"customer_id": "C1", "sequence": 1},
+        {"customer_id": "C2", "sequence": 2},
+        {"customer_id": "C3", "sequence": 3},
+        {"customer_id": "C2", "sequence": 4},
+    ]
+
+    remaining, customer_stop = database._split_customer_stops(stops, "C2")
+
+    assert [stop["sequence"] for stop in remaining] == [1, 3]
+    assert customer_stop == {"customer_id": "C2", "sequence": 2}
+    assert database._split_customer_stops(stops, "C9") == (stops, None)
+
+
+def test_remove_customer_from_route_uses_one_rpc(monkeypatch) -> None:
+    client = _rpc_client(True)
+    monkeypatch.setattr(database, "get_supabase_client", lambda: client)
+
+    assert database.remove_customer_from_route("Z1", "R1", "C1") is True
+    assert client.rpc_calls == [
+        ("remove_customer_from_route", {"p_zone_name": "Z1", "p_vehicle_id": "R1", "p_customer_id": "C1"}),
+    ]
+
+
+def test_resolve_and_touch_route_zone_uses_one_rpc() -> None:
+    client = _rpc_client([{"zone_id": "uuid-1", "zone_name": "Z1"}])
+
+    assert database._resolve_and_touch_route_zone(client, "Z1", "Jeddah", False) == ("uuid-1", "Z1")
+    assert client.rpc_calls == [
+        ("resolve_and_touch_zone", {"p_zone_name": "Z1", "p_city": "Jeddah", "p_start_from_depot": False}),
+    ]
+
+
+def test_get_customers_for_zone_is_cached_until_assignments_change(monkeypatch) -> None:
+    zone_reads: list[str] = []
+    client = _table_client(lambda calls: zone_reads.append("zones") or [{"metadata": {"customer_ids": ["C1"]}}])
+    monkeypatch.setattr(database, "get_supabase_client", lambda: client)
+    monkeypatch.setattr(customers_repository, "get_customers_by_ids", lambda ids: tuple(ids))
+    monkeypatch.setattr(database, "_remove_customer_from_zone", lambda supabase, customer_id, zone_id: (True, 0))
+
+    assert database.get_customers_for_zone("Z1") == ("C1",)
+    assert database.get_customers_for_zone("Z1") == ("C1",)
+    assert zone_reads == ["zones"]
+
+    assert database.unassign_customer_from_zone("C1", "Z1") is True
+    database.get_customers_for_zone("Z1")
+    assert zone_reads == ["zones", "zones"]
+
+
+def test_update_route_customer_transfers_with_one_rpc(monkeypatch) -> None:
+    client = _rpc_client(True)
+    monkeypatch.setattr(database, "get_supabase_client", lambda: client)
+
+    assert database.update_route_customer("Z1", "R1", "R2", "C1") is True
+    assert client.rpc_calls == [
+        (
+            "transfer_customer",
+            {"p_zone_name": "Z1", "p_from_vehicle_id": "R1", "p_to_vehicle_id": "R2", "p_customer_id": "C1"},
+        ),
+    ]
+
+
+def test_get_routes_from_database_embeds_zones_in_one_request(monkeypatch) -> None:
+    zone = {"id": "uuid-1", "name": "Z1", "metadata": {}}
+    client = _table_client([{"vehicle_id": "R1", "zone_info": zone}, {"vehicle_id": "R2", "zone_info": zone}])
+    monkeypatch.setattr(database, "get_supabase_client", lambda: client)
+
+    routes = database.get_routes_from_database()
+
+    assert [route["zone_info"]["name"] for route in routes] == ["Z1", "Z1"]
+    assert [call for call in client.calls if call[0] in ("table", "select")] == [
+        ("table", ("routes",)),
+        ("select", (f"{database.ROUTE_COLUMNS},zone_info:zones(id,name,metadata)",)),
+    ]
+
+
+def test_delete_all_routes_from_database_issues_one_delete(monkeypatch) -> None:
+    calls: list[tuple] = []
+
+    class DeleteQuery:
+        def __init__(self):
+            self.not_ = self
+
+        def delete(self, **kwargs):
+            calls.append(("delete", kwargs["count"]))
+            return self
+
+        def is_(self, column, value):
+            calls.append(("not_is", column, value))
+            return self
+
+        def execute(self):
+            return SimpleNamespace(data=[], count=2500)
+
+    client = SimpleNamespace(table=lambda name: DeleteQuery())
+    monkeypatch.setattr(database, "get_supabase_client", lambda: client)
+
+    assert database.delete_all_routes_from_database() == 2500
+    assert calls == [("delete", database.CountMethod.exact), ("not_is", "id", "null")]
+
+
+def test_update_route_customer_fallback_writes_both_routes_in_one_upsert(monkeypatch) -> None:
+    routes = [
+        {"id": "r1", "vehicle_id": "R1", "route_date": "2024-01-01", "stops": [{"customer_id": "C1", "sequence": 1}]},
+        {"id": "r2", "vehicle_id": "R2", "route_date": "2024-01-01", "stops": [{"customer_id": "C2", "sequence": 4}]},
+    ]
+    writes: list[tuple] = []
+
+    class RoutesQuery(FakeQuery):
+        def upsert(self, rows, **kwargs):
+            writes.append((rows, kwargs["on_conflict"]))
+            return self
+
+    client = SimpleNamespace(rpc=_missing_rpc, table=lambda name: RoutesQuery(routes))
+    monkeypatch.setattr(database, "get_supabase_client", lambda: client)
+    monkeypatch.setattr(database, "_resolve_zone_uuid", lambda supabase, zone_id: "uuid-1")
+
+    assert database.update_route_customer("Z1", "R1", "R2", "C1") is True
+    ((rows, on_conflict),) = writes
+    assert on_conflict == "id"
+    assert [(row["id"], row["stops"]) for row in rows] == [
+        ("r1", []),
+        ("r2", [{"customer_id": "C2", "sequence": 4}, {"customer_id": "C1", "sequence": 5}]),
+    ]
+
+
+def test_iter_routes_from_database_pages_until_short_page(monkeypatch) -> None:
+    rows = [{"vehicle_id": f"R{i}"} for i in range(5)]
+
+    def page(calls):
+        start, end = next(args for name, args in reversed(calls) if name == "range")
+        return rows[start:end + 1]
+
+    client = _table_client(page)
+    monkeypatch.setattr(database, "get_supabase_client", lambda: client)
+
+    pages = list(database.iter_routes_from_database(page_size=2))
+
+    assert [[row["vehicle_id"] for row in page] for page in pages] == [["R0", "R1"], ["R2", "R3"], ["R4"]]
+    assert [args for name, args in client.calls if name == "range"] == [(0, 1), (2, 3), (4, 5)]
+    assert database.get_routes_from_database(limit=2, offset=4) == [{"vehicle_id": "R4"}]
+
+
+def test_get_routes_from_database_is_cached_until_routes_change(monkeypatch) -> None:
+    client = _table_client([{"id": "uuid-1", "vehicle_id": "R1"}])
+    monkeypatch.setattr(database, "get_supabase_client", lambda: client)
+    monkeypatch.setattr(database, "_resolve_zone_uuid", lambda supabase, zone_id: "uuid-1")
+
+    def reads():
+        # Every query built here is executed once, so the tables opened are the reads made
+        return [args[0] for name, args in client.calls if name == "table"]
+
+    first = database.get_routes_from_database(zone_id="Z1")
+    assert database.get_routes_from_database(zone_id="Z1") is first
+    database.get_routes_from_database(city="Jeddah")
+    assert reads() == ["routes", "zones", "routes"]
+
+    database.clear_routes_cache("Z2")  # city listings may hold Z2's routes
+    database.get_routes_from_database(zone_id="Z1")
+    database.get_routes_from_database(city="Jeddah")
+    assert reads() == ["routes", "zones", "routes", "zones", "routes"]
+
+    database._forget_zone_ids(["Z1"])
+    database.get_routes_from_database(zone_id="Z1")
+    assert reads()[-1] == "routes" and len(reads()) == 6
+
+
+def test_execute_with_retry_backs_off_on_transient_errors_only(monkeypatch) -> None:
+    sleeps: list[float] = []
+    monkeypatch.setattr(database.time, "sleep", sleeps.append)
+
+    class FlakyRequest:
+        def __init__(self, failures):
+            self.failures = list(failures)
+
+        def execute(self):
+            if self.failures:
+                raise self.failures.pop(0)
+            return "ok"
+
+    assert database._execute_with_retry(FlakyRequest([httpx.ConnectError("down"), httpx.ReadTimeout("slow")])) == "ok"
+    assert sleeps == [0.25, 0.5]
+
+    with pytest.raises(httpx.ConnectError):
+        database._execute_with_retry(FlakyRequest([httpx.ConnectError("down")] * 3))
+    with pytest.raises(ValueError):
+        database._execute_with_retry(FlakyRequest([ValueError("bad request")]))
+    assert sleeps == [0.25, 0.5, 0.25, 0.5]
+
+
+def test_check_zone_ids_exist_chunks_large_lists_and_caches(monkeypatch) -> None:
+    def existing(calls):
+        _column, values = next(args for name, args in reversed(calls) if name == "in_")
+        return [{"name": name} for name in values if name.endswith("0")]
+
+    client = _table_client(existing)
+    monkeypatch.setattr(database, "get_supabase_client", lambda: client)
+    monkeypatch.setattr(database, "ZONE_NAME_FILTER_CHUNK", 2)
+    zone_ids = ["A0", "A1", "A2", "A3", "B0"]
+
+    assert database.check_zone_ids_exist(zone_ids) == {"A0": True, "A1": False, "A2": False, "A3": False, "B0": True}
+    def filters():
+        return [args[1] for name, args in client.calls if name == "in_"]
+
+    assert filters() == [["A0", "A1"], ["A2", "A3"], ["B0"]]
+    assert database.check_zone_ids_exist(["A1", "B0"]) == {"A1": False, "B0": True}
+    assert len(filters()) == 3
+
+
+def test_insert_zone_batch_stores_wkt_in_metadata_when_column_is_missing() -> None:
+    inserts: list[list[dict]] = []
+
+    class InsertQuery:
+        def insert(self, rows):
+            inserts.append(rows)
+            if "geometry_wkt" in rows[0]:
+                raise RuntimeError("Could not find the 'geometry_wkt' column of 'zones' in the schema cache")
+            return self
+
+        def execute(self):
+            return SimpleNamespace(data=[])
+
+    client = SimpleNamespace(rpc=_missing_rpc, table=lambda name: InsertQuery())
+    batch = [
+        {"name": f"Z{i}", "geometry_wkt": f"POLYGON(({i} 0, 1 1, 0 1, {i} 0))", "depot_code": "D", "method": "polar", "metadata": {"city": "Jeddah"}}
+        for i in range(3)
+    ]
+
+    assert database._insert_zone_batch(client, batch) is True
+    assert len(inserts) == 2
+    assert [row["metadata"] for row in inserts[1]] == [
+        {"city": "Jeddah", "geometry_wkt": zone["geometry_wkt"]} for zone in batch
+    ]
@@ -26,11 +26,11 @@ def _customer(cid: str, lat: float, lon: float) -> Customer:
 
 @pytest.fixture(autouse=True)
 def clear_customer_cache():
-    from src.app.data.customers_repository import load_customers
+    from src.app.data.customers_repository import clear_customer_cache
 
-    load_customers.cache_clear()
+    clear_customer_cache()
     yield
-    load_customers.cache_clear()
+    clear_customer_cache()
 
 
 def test_optimize_routes_persists_outputs(monkeypatch, tmp_path: Path):
@@ -0,0 +1,29 @@
+import pytest
+
+from src.app.db import supabase as supabase_db
+
+
+@pytest.fixture(autouse=True)
+def reset_client():
+    supabase_db.close_supabase_client()
+    yield
+    supabase_db.close_supabase_client()
+
+
+def test_get_supabase_client_returns_none_for_malformed_url(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(supabase_db.settings, "supabase_url", "not a url")
+    monkeypatch.setattr(supabase_db.settings, "supabase_key", "key")
+
+    assert supabase_db.get_supabase_client() is None
+
+
+def test_get_supabase_client_does_not_hide_incompatible_client_options(monkeypatch: pytest.MonkeyPatch) -> None:
+    def old_client_options(**kwargs):
+        raise TypeError("__init__() got an unexpected keyword argument 'httpx_client'")
+
+    monkeypatch.setattr(supabase_db.settings, "supabase_url", "https://example.supabase.co")
+    monkeypatch.setattr(supabase_db.settings, "supabase_key", "key")
+    monkeypatch.setattr(supabase_db, "ClientOptions", old_client_options)
+
+    with pytest.raises(TypeError):
+        supabase_db.get_supabase_client()
@@ -33,11 +33,11 @@ def _sample_customer(customer_id: str, lat: float, lon: float) -> Customer:
 
 @pytest.fixture(autouse=True)
 def clear_customer_cache():
-    from src.app.data.customers_repository import load_customers
+    from src.app.data.customers_repository import clear_customer_cache
 
-    load_customers.cache_clear()
+    clear_customer_cache()
     yield
-    load_customers.cache_clear()
+    clear_customer_cache()
 
 
 def test_process_zoning_request_persists_outputs(tmp_path, monkeypatch):